@@ -14,6 +14,8 @@ from app.api.v1 import (
     goods_request,
     bulletins,
     dashboard,
+    menus,
+    system,
 )
 
 api_router = APIRouter()
@@ -29,3 +31,5 @@ api_router.include_router(purchase.router, prefix="/purchase-requests", tags=["P
 api_router.include_router(goods_request.router, prefix="/goods-requests", tags=["Goods Requests"])
 api_router.include_router(bulletins.router, prefix="/bulletins", tags=["Bulletins"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+api_router.include_router(menus.router, prefix="/menus", tags=["Menus"])
+api_router.include_router(system.router, prefix="/system", tags=["System"])
@@ -1,16 +1,26 @@
 """Authentication endpoints."""
 
 from datetime import datetime, timedelta
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Form, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.config import settings
-from app.core.security import create_access_token, get_current_active_user
+from app.core.hashing import HashPoolSaturated
+from app.core.permissions import permission_engine
+from app.core.security import (
+    build_token_claims,
+    create_access_token,
+    decode_token,
+    get_current_active_user,
+    oauth2_scheme,
+)
 from app.services.user_service import UserService
-from app.schemas.auth import Token, LoginRequest, LoginResponse
+from app.services.token_service import TokenService
+from app.schemas.auth import Token, LoginRequest, LoginResponse, RefreshRequest
 
 router = APIRouter()
 
@@ -18,14 +28,26 @@ router = APIRouter()
 @router.post("/login", response_model=dict)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
+    device_id: Optional[str] = Form(None),
+    user_agent: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
     """
     Login endpoint.
 
-    OAuth2 compatible token login.
+    OAuth2 compatible token login. Also issues a refresh token bound to
+    ``device_id`` (a new device id is generated when omitted).
     """
-    user = UserService.authenticate(db, form_data.username, form_data.password)
+    try:
+        user = await UserService.authenticate_async(
+            db, form_data.username, form_data.password
+        )
+    except HashPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins, please retry",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,44 +61,157 @@ async def login(
             detail="User account is locked",
         )
 
-    # Create access token
+    # Get user roles (carried in the token so requests need no user lookup)
+    roles = UserService.get_user_roles(db, user.user_id)
+
+    # Issue the device's refresh token, then the access token bound to it
+    refresh_token, refresh_row = TokenService.issue_refresh_token(
+        db, user.user_id, device_id, user_agent
+    )
+    device_id = refresh_row.device_id
+
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data=build_token_claims(user, roles, device_id), expires_delta=access_token_expires
     )
 
+    # Read the profile before the last-login commit expires the instance
+    user_info = {
+        "user_id": user.user_id,
+        "username": user.username,
+        "email": user.email,
+        "mobile": user.mobile,
+        "status": user.status,
+        "avatar": user.avatar,
+    }
+
     # Update last login time
     UserService.update_last_login(db, user.user_id)
 
-    # Get user roles
+    # Calculate expiration time
+    expire_time = datetime.utcnow() + access_token_expires
+
+    return {
+        "code": 0,
+        "msg": "success",
+        "data": {
+            "token": access_token,
+            "expire_time": expire_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "refresh_token": refresh_token,
+            "device_id": device_id,
+            "roles": roles,
+            "permissions": permission_engine.permissions_for(roles),
+            "user": user_info,
+        },
+    }
+
+
+@router.post("/refresh", response_model=dict)
+async def refresh(
+    data: RefreshRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Exchange a refresh token for a new access token.
+
+    The refresh token is rotated: the presented token is revoked and a new
+    one is returned. No password verification is involved.
+    """
+    token_row = TokenService.get_valid_refresh_token(db, data.refresh_token)
+    if not token_row:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user = token_row.user
+    device_id = token_row.device_id
     roles = UserService.get_user_roles(db, user.user_id)
 
-    # Calculate expiration time
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data=build_token_claims(user, roles, device_id), expires_delta=access_token_expires
+    )
     expire_time = datetime.utcnow() + access_token_expires
 
+    refresh_token = TokenService.rotate_refresh_token(db, token_row)
+    if refresh_token is None:
+        # Another request rotated this token first: treated as reuse
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     return {
         "code": 0,
         "msg": "success",
         "data": {
             "token": access_token,
             "expire_time": expire_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "refresh_token": refresh_token,
+            "device_id": device_id,
             "roles": roles,
-            "permissions": [],
-            "user": {
-                "user_id": user.user_id,
-                "username": user.username,
-                "email": user.email,
-                "mobile": user.mobile,
-                "status": user.status,
-                "avatar": user.avatar,
-            },
         },
     }
 
 
 @router.post("/logout")
-async def logout(current_user=Depends(get_current_active_user)):
-    """Logout endpoint."""
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    current_user=Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Logout endpoint. Revokes the access token and its device's refresh tokens."""
+    payload = decode_token(token)
+    if payload:
+        TokenService.revoke_access_token(db, payload)
+        if payload.get("did"):
+            TokenService.revoke_device(db, current_user.user_id, payload["did"])
+    return {"code": 0, "msg": "success"}
+
+
+@router.get("/sessions", response_model=dict)
+async def get_sessions(
+    token: str = Depends(oauth2_scheme),
+    current_user=Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Get the current user's active device sessions."""
+    payload = decode_token(token) or {}
+    devices = TokenService.get_active_devices(db, current_user.user_id)
+
+    return {
+        "code": 0,
+        "msg": "success",
+        "data": [
+            {
+                "device_id": d.device_id,
+                "device_name": d.device_name,
+                "current": d.device_id == payload.get("did"),
+                "last_used_time": (
+                    d.last_used_time.strftime("%Y-%m-%d %H:%M:%S")
+                    if d.last_used_time
+                    else None
+                ),
+                "expire_time": d.expire_time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            for d in devices
+        ],
+    }
+
+
+@router.delete("/sessions/{device_id}", response_model=dict)
+async def revoke_session(
+    device_id: str,
+    current_user=Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Revoke the refresh tokens of one of the current user's devices."""
+    if not TokenService.revoke_device(db, current_user.user_id, device_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+
     return {"code": 0, "msg": "success"}
 
 
@@ -86,23 +221,28 @@ async def get_current_user_info(
     db: Session = Depends(get_db),
 ):
     """Get current user information."""
-    roles = UserService.get_user_roles(db, current_user.user_id)
+    # The principal only carries token claims; profile fields live on the row
+    user = UserService.get_by_id(db, current_user.user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    roles = UserService.get_user_roles(db, user.user_id)
 
     return {
         "code": 0,
         "msg": "success",
         "data": {
-            "user_id": current_user.user_id,
-            "username": current_user.username,
-            "email": current_user.email,
-            "mobile": current_user.mobile,
-            "status": current_user.status,
-            "avatar": current_user.avatar,
-            "description": current_user.description,
+            "user_id": user.user_id,
+            "username": user.username,
+            "email": user.email,
+            "mobile": user.mobile,
+            "status": user.status,
+            "avatar": user.avatar,
+            "description": user.description,
             "roles": roles,
             "last_login_time": (
-                current_user.last_login_time.strftime("%Y-%m-%d %H:%M:%S")
-                if current_user.last_login_time
+                user.last_login_time.strftime("%Y-%m-%d %H:%M:%S")
+                if user.last_login_time
                 else None
             ),
         },
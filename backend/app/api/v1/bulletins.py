@@ -3,9 +3,8 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import DatabaseRunner, get_db_runner, get_read_db_runner
 from app.core.security import get_current_active_user
 from app.services.bulletin_service import BulletinService
 from app.schemas.bulletin import BulletinCreate, BulletinUpdate
@@ -19,12 +18,12 @@ async def get_bulletins(
     size: int = Query(10, ge=1, le=100),
     title: Optional[str] = None,
     status: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_read_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Get paginated list of bulletins."""
     skip = (page - 1) * size
-    bulletins, total = BulletinService.get_bulletins(db, skip, size, title, status)
+    bulletins, total = await db.run(BulletinService.get_bulletins, skip, size, title, status)
 
     records = [
         {
@@ -59,10 +58,10 @@ async def get_bulletins(
 @router.get("/active", response_model=dict)
 async def get_active_bulletins(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_read_db_runner),
 ):
     """Get active bulletins for display (public endpoint)."""
-    bulletins = BulletinService.get_active_bulletins(db, limit)
+    bulletins = await db.run(BulletinService.get_active_bulletins, limit)
 
     return {
         "code": 0,
@@ -87,11 +86,11 @@ async def get_active_bulletins(
 @router.get("/{bulletin_id}", response_model=dict)
 async def get_bulletin(
     bulletin_id: int,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_read_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Get bulletin by ID."""
-    bulletin = BulletinService.get_bulletin_by_id(db, bulletin_id)
+    bulletin = await db.run(BulletinService.get_bulletin_by_id, bulletin_id)
     if not bulletin:
         raise HTTPException(status_code=404, detail="Bulletin not found")
 
@@ -121,7 +120,7 @@ async def get_bulletin(
 @router.post("", response_model=dict)
 async def create_bulletin(
     data: BulletinCreate,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Create a new bulletin."""
@@ -129,7 +128,7 @@ async def create_bulletin(
     if not data.author:
         data.author = current_user.username
 
-    bulletin = BulletinService.create_bulletin(db, data)
+    bulletin = await db.run(BulletinService.create_bulletin, data)
     return {"code": 0, "msg": "success", "data": {"id": bulletin.id}}
 
 
@@ -137,11 +136,11 @@ async def create_bulletin(
 async def update_bulletin(
     bulletin_id: int,
     data: BulletinUpdate,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Update a bulletin."""
-    bulletin = BulletinService.update_bulletin(db, bulletin_id, data)
+    bulletin = await db.run(BulletinService.update_bulletin, bulletin_id, data)
     if not bulletin:
         raise HTTPException(status_code=404, detail="Bulletin not found")
 
@@ -151,11 +150,11 @@ async def update_bulletin(
 @router.delete("/{bulletin_id}", response_model=dict)
 async def delete_bulletin(
     bulletin_id: int,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Delete a bulletin."""
-    if not BulletinService.delete_bulletin(db, bulletin_id):
+    if not await db.run(BulletinService.delete_bulletin, bulletin_id):
         raise HTTPException(status_code=404, detail="Bulletin not found")
 
     return {"code": 0, "msg": "success"}
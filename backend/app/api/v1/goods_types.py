@@ -2,10 +2,10 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
-from app.database import get_db
+from app.database import DatabaseRunner, get_db_runner, get_read_db_runner
+from app.core.reference_cache import CONSUMABLE_TYPES, reference_list_response
 from app.core.security import get_current_active_user
 from app.services.warehouse_service import WarehouseService
 from app.schemas.warehouse import ConsumableTypeCreate, ConsumableTypeUpdate
@@ -18,12 +18,12 @@ async def get_consumable_types(
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
     name: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_read_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Get paginated list of consumable types."""
     skip = (page - 1) * size
-    types, total = WarehouseService.get_consumable_types(db, skip, size, name)
+    types, total = await db.run(WarehouseService.get_consumable_types, skip, size, name)
 
     records = [
         {
@@ -53,27 +53,25 @@ async def get_consumable_types(
 
 @router.get("/list", response_model=dict)
 async def get_consumable_type_list(
-    db: Session = Depends(get_db),
+    request: Request,
+    since_version: Optional[int] = Query(None, ge=0),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
-    """Get all consumable types (for dropdowns)."""
-    types = WarehouseService.get_all_consumable_types(db)
-
-    return {
-        "code": 0,
-        "msg": "success",
-        "data": [{"id": t.id, "name": t.name, "code": t.code} for t in types],
-    }
+    """Get all consumable types (for dropdowns), from the reference-data cache."""
+    return await reference_list_response(
+        request, db, CONSUMABLE_TYPES, WarehouseService.get_consumable_type_options, since_version
+    )
 
 
 @router.get("/{type_id}", response_model=dict)
 async def get_consumable_type(
     type_id: int,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_read_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Get consumable type by ID."""
-    ctype = WarehouseService.get_consumable_type_by_id(db, type_id)
+    ctype = await db.run(WarehouseService.get_consumable_type_by_id, type_id)
     if not ctype:
         raise HTTPException(status_code=404, detail="Consumable type not found")
 
@@ -97,11 +95,11 @@ async def get_consumable_type(
 @router.post("", response_model=dict)
 async def create_consumable_type(
     data: ConsumableTypeCreate,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Create a new consumable type."""
-    ctype = WarehouseService.create_consumable_type(db, data)
+    ctype = await db.run(WarehouseService.create_consumable_type, data)
     return {"code": 0, "msg": "success", "data": {"id": ctype.id}}
 
 
@@ -109,11 +107,11 @@ async def create_consumable_type(
 async def update_consumable_type(
     type_id: int,
     data: ConsumableTypeUpdate,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Update a consumable type."""
-    ctype = WarehouseService.update_consumable_type(db, type_id, data)
+    ctype = await db.run(WarehouseService.update_consumable_type, type_id, data)
     if not ctype:
         raise HTTPException(status_code=404, detail="Consumable type not found")
 
@@ -123,11 +121,11 @@ async def update_consumable_type(
 @router.delete("/{type_id}", response_model=dict)
 async def delete_consumable_type(
     type_id: int,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Delete a consumable type."""
-    if not WarehouseService.delete_consumable_type(db, type_id):
+    if not await db.run(WarehouseService.delete_consumable_type, type_id):
         raise HTTPException(status_code=404, detail="Consumable type not found")
 
     return {"code": 0, "msg": "success"}
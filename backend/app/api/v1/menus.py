@@ -0,0 +1,79 @@
+"""Menu and permission endpoints."""
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.database import DatabaseRunner, get_db_runner, get_read_db_runner
+from app.core.security import get_current_active_user
+from app.core.permissions import get_principal_roles, permission_engine, require_perm
+from app.services.menu_service import MenuService
+from app.schemas.user import RoleMenuUpdate
+
+router = APIRouter()
+
+
+@router.get("/tree", response_model=dict)
+async def get_menu_tree(current_user=Depends(get_current_active_user)):
+    """Get the current user's menu tree and permissions (served from the permission cache)."""
+    roles = get_principal_roles(current_user)
+
+    return {
+        "code": 0,
+        "msg": "success",
+        "data": {
+            "version": permission_engine.version,
+            "menus": permission_engine.menu_tree_for(roles),
+            "permissions": permission_engine.permissions_for(roles),
+        },
+    }
+
+
+@router.get("", response_model=dict)
+async def get_menus(
+    db: DatabaseRunner = Depends(get_read_db_runner),
+    current_user=Depends(require_perm("role:write")),
+):
+    """Get all menus (flat list) for role assignment."""
+    menus = await db.run(MenuService.get_all_menus)
+
+    return {
+        "code": 0,
+        "msg": "success",
+        "data": [
+            {
+                "menu_id": m.menu_id,
+                "parent_id": m.parent_id,
+                "menu_name": m.menu_name,
+                "path": m.path,
+                "perms": m.perms,
+                "icon": m.icon,
+                "type": m.type,
+                "order_num": m.order_num,
+            }
+            for m in menus
+        ],
+    }
+
+
+@router.get("/roles/{role_id}", response_model=dict)
+async def get_role_menus(
+    role_id: int,
+    db: DatabaseRunner = Depends(get_read_db_runner),
+    current_user=Depends(require_perm("role:write")),
+):
+    """Get the menu IDs assigned to a role."""
+    menu_ids = await db.run(MenuService.get_role_menu_ids, role_id)
+    return {"code": 0, "msg": "success", "data": menu_ids}
+
+
+@router.put("/roles/{role_id}", response_model=dict)
+async def set_role_menus(
+    role_id: int,
+    data: RoleMenuUpdate,
+    db: DatabaseRunner = Depends(get_db_runner),
+    current_user=Depends(require_perm("role:write")),
+):
+    """Replace the menus assigned to a role."""
+    if not await db.run(MenuService.set_role_menus, role_id, data.menu_ids):
+        raise HTTPException(status_code=404, detail="Role not found")
+
+    return {"code": 0, "msg": "success", "data": {"version": permission_engine.version}}
@@ -0,0 +1,156 @@
+"""System monitoring endpoints (administrators only)."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.database import replica_router
+from app.core.hashing import password_hasher
+from app.core.loop_monitor import loop_monitor
+from app.core.permissions import require_perm
+from app.core.profiling import continuous_profiler, profile_store, to_collapsed, to_speedscope
+from app.core.query_stats import query_stats_registry
+from app.core.slow_queries import slow_query_log
+from app.core.tracing import trace_store
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_model=dict)
+async def get_runtime_metrics(current_user=Depends(require_perm("system:monitor"))):
+    """Get event-loop lag, hashing pool and replica routing metrics for this worker."""
+    return {
+        "code": 0,
+        "msg": "success",
+        "data": {
+            "event_loop": loop_monitor.stats(),
+            "password_hashing": password_hasher.stats(),
+            "replicas": replica_router.stats(),
+        },
+    }
+
+
+@router.get("/blocking-events", response_model=dict)
+async def get_blocking_events(
+    limit: int = Query(20, ge=1, le=100),
+    current_user=Depends(require_perm("system:monitor")),
+):
+    """Get recent event-loop stalls with the route and stack that caused them."""
+    return {"code": 0, "msg": "success", "data": loop_monitor.events(limit)}
+
+
+@router.get("/queries", response_model=dict)
+async def get_query_stats(current_user=Depends(require_perm("system:monitor"))):
+    """Get per-route query counts and DB time, and repeated-statement (N+1) findings."""
+    return {
+        "code": 0,
+        "msg": "success",
+        "data": {
+            "routes": query_stats_registry.routes(),
+            "n_plus_one": query_stats_registry.findings(),
+        },
+    }
+
+
+@router.get("/slow-queries", response_model=dict)
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=500),
+    current_user=Depends(require_perm("system:monitor")),
+):
+    """Get recent slow statements with route, caller and captured query plan."""
+    return {
+        "code": 0,
+        "msg": "success",
+        "data": {
+            "threshold_ms": slow_query_log.threshold * 1000,
+            "entries": slow_query_log.entries(limit),
+        },
+    }
+
+
+@router.delete("/slow-queries", response_model=dict)
+async def clear_slow_queries(current_user=Depends(require_perm("system:monitor"))):
+    """Clear the slow-query log and its captured plans."""
+    slow_query_log.clear()
+    return {"code": 0, "msg": "success", "data": None}
+
+
+@router.get("/traces", response_model=dict)
+async def get_traces(
+    limit: int = Query(50, ge=1, le=500),
+    min_duration_ms: float = Query(0, ge=0),
+    current_user=Depends(require_perm("system:monitor")),
+):
+    """Get summaries of recently recorded request traces, newest first."""
+    return {"code": 0, "msg": "success", "data": trace_store.list(limit, min_duration_ms)}
+
+
+@router.get("/traces/{trace_id}", response_model=dict)
+async def get_trace(trace_id: str, current_user=Depends(require_perm("system:monitor"))):
+    """Get the span tree of a recorded trace."""
+    trace = trace_store.get(trace_id)
+    if not trace:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return {"code": 0, "msg": "success", "data": trace}
+
+
+@router.get("/profiles", response_model=dict)
+async def get_profiles(current_user=Depends(require_perm("system:monitor"))):
+    """Get summaries of recently captured request profiles, newest first."""
+    return {"code": 0, "msg": "success", "data": profile_store.list()}
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+    current_user=Depends(require_perm("system:monitor")),
+):
+    """
+    Download a request profile.
+
+    ``speedscope`` returns a file for https://www.speedscope.app;
+    ``collapsed`` returns folded stacks for flamegraph.pl or inferno.
+    """
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    disposition = {"Content-Disposition": f'attachment; filename="{profile_id}.{format}"'}
+    if format == "collapsed":
+        return PlainTextResponse(to_collapsed(profile["stacks"]), headers=disposition)
+    return JSONResponse(
+        to_speedscope(profile["stacks"], profile["route"], profile["interval_ms"]),
+        headers=disposition,
+    )
+
+
+@router.get("/continuous-profile", response_model=dict)
+async def get_continuous_profile_windows(current_user=Depends(require_perm("system:monitor"))):
+    """Get the one-minute windows recorded by the continuous profiler, newest first."""
+    return {
+        "code": 0,
+        "msg": "success",
+        "data": {
+            "hz": continuous_profiler.hz,
+            "overhead": round(continuous_profiler.overhead(), 5),
+            "windows": continuous_profiler.windows(),
+        },
+    }
+
+
+@router.get("/continuous-profile/{window_start}")
+async def get_continuous_profile(
+    window_start: int,
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+    current_user=Depends(require_perm("system:monitor")),
+):
+    """Download the flamegraph of one window, merged across workers."""
+    stacks = continuous_profiler.window(window_start)
+    if stacks is None:
+        raise HTTPException(status_code=404, detail="Profile window not found")
+    disposition = {"Content-Disposition": f'attachment; filename="window-{window_start}.{format}"'}
+    if format == "collapsed":
+        return PlainTextResponse(to_collapsed(stacks), headers=disposition)
+    return JSONResponse(
+        to_speedscope(stacks, f"window {window_start}", 1000 / continuous_profiler.hz),
+        headers=disposition,
+    )
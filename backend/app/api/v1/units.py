@@ -2,10 +2,10 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
-from app.database import get_db
+from app.database import DatabaseRunner, get_db_runner, get_read_db_runner
+from app.core.reference_cache import UNITS, reference_list_response
 from app.core.security import get_current_active_user
 from app.services.warehouse_service import WarehouseService
 from app.schemas.warehouse import UnitCreate, UnitUpdate
@@ -18,12 +18,12 @@ async def get_units(
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
     name: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_read_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Get paginated list of units."""
     skip = (page - 1) * size
-    units, total = WarehouseService.get_units(db, skip, size, name)
+    units, total = await db.run(WarehouseService.get_units, skip, size, name)
 
     records = [
         {
@@ -52,27 +52,25 @@ async def get_units(
 
 @router.get("/list", response_model=dict)
 async def get_unit_list(
-    db: Session = Depends(get_db),
+    request: Request,
+    since_version: Optional[int] = Query(None, ge=0),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
-    """Get all units (for dropdowns)."""
-    units = WarehouseService.get_all_units(db)
-
-    return {
-        "code": 0,
-        "msg": "success",
-        "data": [{"id": u.id, "name": u.name} for u in units],
-    }
+    """Get all units (for dropdowns), from the reference-data cache."""
+    return await reference_list_response(
+        request, db, UNITS, WarehouseService.get_unit_options, since_version
+    )
 
 
 @router.get("/{unit_id}", response_model=dict)
 async def get_unit(
     unit_id: int,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_read_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Get unit by ID."""
-    unit = WarehouseService.get_unit_by_id(db, unit_id)
+    unit = await db.run(WarehouseService.get_unit_by_id, unit_id)
     if not unit:
         raise HTTPException(status_code=404, detail="Unit not found")
 
@@ -95,11 +93,11 @@ async def get_unit(
 @router.post("", response_model=dict)
 async def create_unit(
     data: UnitCreate,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Create a new unit."""
-    unit = WarehouseService.create_unit(db, data)
+    unit = await db.run(WarehouseService.create_unit, data)
     return {"code": 0, "msg": "success", "data": {"id": unit.id}}
 
 
@@ -107,11 +105,11 @@ async def create_unit(
 async def update_unit(
     unit_id: int,
     data: UnitUpdate,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Update a unit."""
-    unit = WarehouseService.update_unit(db, unit_id, data)
+    unit = await db.run(WarehouseService.update_unit, unit_id, data)
     if not unit:
         raise HTTPException(status_code=404, detail="Unit not found")
 
@@ -121,11 +119,11 @@ async def update_unit(
 @router.delete("/{unit_id}", response_model=dict)
 async def delete_unit(
     unit_id: int,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Delete a unit."""
-    if not WarehouseService.delete_unit(db, unit_id):
+    if not await db.run(WarehouseService.delete_unit, unit_id):
         raise HTTPException(status_code=404, detail="Unit not found")
 
     return {"code": 0, "msg": "success"}
@@ -5,8 +5,10 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import DatabaseRunner, get_db, get_db_runner, get_read_db_runner
+from app.core.hashing import HashPoolSaturated, password_hasher
 from app.core.security import get_current_active_user
+from app.core.serialization import paginated, success
 from app.services.user_service import UserService
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, ChangePassword
 
@@ -19,16 +21,16 @@ async def get_users(
     size: int = Query(10, ge=1, le=100),
     username: Optional[str] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_read_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Get paginated list of users."""
     skip = (page - 1) * size
-    users, total = UserService.get_users(db, skip, size, username, status)
+    users, total = await db.run(UserService.get_users, skip, size, username, status)
 
     records = []
     for user in users:
-        roles = UserService.get_user_roles(db, user.user_id)
+        roles = await db.run(UserService.get_user_roles, user.user_id)
         records.append({
             "user_id": user.user_id,
             "username": user.username,
@@ -37,104 +39,90 @@ async def get_users(
             "status": user.status,
             "ssex": user.ssex,
             "avatar": user.avatar,
-            "create_time": (
-                user.create_time.strftime("%Y-%m-%d %H:%M:%S")
-                if user.create_time
-                else None
-            ),
+            "create_time": user.create_time,
             "roles": roles,
         })
 
-    return {
-        "code": 0,
-        "msg": "success",
-        "data": {
-            "records": records,
-            "total": total,
-            "size": size,
-            "current": page,
-            "pages": (total + size - 1) // size,
-        },
-    }
+    return success(paginated(records, total, page, size))
 
 
 @router.get("/{user_id}", response_model=dict)
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_read_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Get user by ID."""
-    user = UserService.get_by_id(db, user_id)
+    user = await db.run(UserService.get_by_id, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    roles = UserService.get_user_roles(db, user.user_id)
+    roles = await db.run(UserService.get_user_roles, user.user_id)
 
-    return {
-        "code": 0,
-        "msg": "success",
-        "data": {
-            "user_id": user.user_id,
-            "username": user.username,
-            "email": user.email,
-            "mobile": user.mobile,
-            "status": user.status,
-            "ssex": user.ssex,
-            "avatar": user.avatar,
-            "description": user.description,
-            "create_time": (
-                user.create_time.strftime("%Y-%m-%d %H:%M:%S")
-                if user.create_time
-                else None
-            ),
-            "roles": roles,
-        },
-    }
+    return success({
+        "user_id": user.user_id,
+        "username": user.username,
+        "email": user.email,
+        "mobile": user.mobile,
+        "status": user.status,
+        "ssex": user.ssex,
+        "avatar": user.avatar,
+        "description": user.description,
+        "create_time": user.create_time,
+        "roles": roles,
+    })
 
 
 @router.post("", response_model=dict)
 async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Create a new user."""
     # Check if username already exists
-    existing_user = UserService.get_by_username(db, user_data.username)
+    existing_user = await db.run(UserService.get_by_username, user_data.username)
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already exists")
 
-    user = UserService.create(db, user_data)
-    return {"code": 0, "msg": "success", "data": {"user_id": user.user_id}}
+    try:
+        password_hash = await password_hasher.hash(user_data.password)
+    except HashPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password service busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    user = await db.run(UserService.create, user_data, password_hash)
+    return success({"user_id": user.user_id})
 
 
 @router.put("/{user_id}", response_model=dict)
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Update a user."""
-    user = UserService.update(db, user_id, user_data)
+    user = await db.run(UserService.update, user_id, user_data)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return {"code": 0, "msg": "success"}
+    return success()
 
 
 @router.delete("/{user_id}", response_model=dict)
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Delete a user."""
-    if not UserService.delete(db, user_id):
+    if not await db.run(UserService.delete, user_id):
         raise HTTPException(status_code=404, detail="User not found")
 
-    return {"code": 0, "msg": "success"}
+    return success()
 
 
 @router.put("/{user_id}/password", response_model=dict)
@@ -144,7 +132,12 @@ async def change_password(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_active_user),
 ):
-    """Change user's password."""
+    """
+    Change user's password.
+
+    Uses a regular session: the service awaits the hashing pool between
+    statements, which a runner call cannot do.
+    """
     # Users can only change their own password unless they're admin
     if current_user.user_id != user_id:
         raise HTTPException(
@@ -152,13 +145,20 @@ async def change_password(
             detail="You can only change your own password",
         )
 
-    success = UserService.change_password(
-        db, user_id, password_data.old_password, password_data.new_password
-    )
-    if not success:
+    try:
+        changed = await UserService.change_password_async(
+            db, user_id, password_data.old_password, password_data.new_password
+        )
+    except HashPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password service busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    if not changed:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid old password or user not found",
         )
 
-    return {"code": 0, "msg": "Password changed successfully"}
+    return success(msg="Password changed successfully")
@@ -2,10 +2,10 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
-from app.database import get_db
+from app.database import DatabaseRunner, get_db_runner, get_read_db_runner
+from app.core.reference_cache import WAREHOUSES, reference_list_response
 from app.core.security import get_current_active_user
 from app.services.warehouse_service import WarehouseService
 from app.schemas.warehouse import StorehouseCreate, StorehouseUpdate
@@ -18,12 +18,12 @@ async def get_warehouses(
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
     name: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_read_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Get paginated list of warehouses."""
     skip = (page - 1) * size
-    warehouses, total = WarehouseService.get_storehouses(db, skip, size, name)
+    warehouses, total = await db.run(WarehouseService.get_storehouses, skip, size, name)
 
     records = [
         {
@@ -56,30 +56,30 @@ async def get_warehouses(
 
 @router.get("/list", response_model=dict)
 async def get_warehouse_list(
-    db: Session = Depends(get_db),
+    request: Request,
+    since_version: Optional[int] = Query(None, ge=0),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
-    """Get all warehouses (for dropdowns)."""
-    warehouses = WarehouseService.get_all_storehouses(db)
+    """
+    Get all warehouses (for dropdowns).
 
-    return {
-        "code": 0,
-        "msg": "success",
-        "data": [
-            {"id": w.id, "code": w.code, "name": w.name}
-            for w in warehouses
-        ],
-    }
+    Served from the reference-data cache (ETag/304, ``since_version`` deltas).
+    Reloads read the primary, so a cached list is never behind a replica.
+    """
+    return await reference_list_response(
+        request, db, WAREHOUSES, WarehouseService.get_storehouse_options, since_version
+    )
 
 
 @router.get("/{warehouse_id}", response_model=dict)
 async def get_warehouse(
     warehouse_id: int,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_read_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Get warehouse by ID."""
-    warehouse = WarehouseService.get_storehouse_by_id(db, warehouse_id)
+    warehouse = await db.run(WarehouseService.get_storehouse_by_id, warehouse_id)
     if not warehouse:
         raise HTTPException(status_code=404, detail="Warehouse not found")
 
@@ -106,11 +106,11 @@ async def get_warehouse(
 @router.post("", response_model=dict)
 async def create_warehouse(
     data: StorehouseCreate,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Create a new warehouse."""
-    warehouse = WarehouseService.create_storehouse(db, data)
+    warehouse = await db.run(WarehouseService.create_storehouse, data)
     return {"code": 0, "msg": "success", "data": {"id": warehouse.id}}
 
 
@@ -118,11 +118,11 @@ async def create_warehouse(
 async def update_warehouse(
     warehouse_id: int,
     data: StorehouseUpdate,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Update a warehouse."""
-    warehouse = WarehouseService.update_storehouse(db, warehouse_id, data)
+    warehouse = await db.run(WarehouseService.update_storehouse, warehouse_id, data)
     if not warehouse:
         raise HTTPException(status_code=404, detail="Warehouse not found")
 
@@ -132,11 +132,11 @@ async def update_warehouse(
 @router.delete("/{warehouse_id}", response_model=dict)
 async def delete_warehouse(
     warehouse_id: int,
-    db: Session = Depends(get_db),
+    db: DatabaseRunner = Depends(get_db_runner),
     current_user=Depends(get_current_active_user),
 ):
     """Delete a warehouse."""
-    if not WarehouseService.delete_storehouse(db, warehouse_id):
+    if not await db.run(WarehouseService.delete_storehouse, warehouse_id):
         raise HTTPException(status_code=404, detail="Warehouse not found")
 
     return {"code": 0, "msg": "success"}
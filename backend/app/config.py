@@ -35,6 +35,27 @@ class Settings(BaseSettings):
 
     # Database (SQLite for local dev, PostgreSQL for production)
     DATABASE_URL: str = "sqlite:///./inbound_management.db"
+    # Serve API handlers through an async engine (aiosqlite / asyncpg)
+    DATABASE_ASYNC: bool = False
+    # Create missing tables at startup. Turn off in production, where Alembic
+    # manages the schema and startup only checks the migration revision.
+    DATABASE_AUTO_CREATE: bool = True
+
+    # Read replicas for read-only (GET) scopes; writes always go to DATABASE_URL
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_HEALTH_CHECK_SECONDS: int = 15
+    # Reads of a user who just wrote stay on the primary for this long
+    REPLICA_STICKY_SECONDS: int = 5
+
+    # SQLite connection profile (WAL etc., applied on connect; ignored for PostgreSQL)
+    SQLITE_TUNED: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_FOREIGN_KEYS: bool = True
+    # Run PRAGMA optimize this often (0 disables the periodic run)
+    SQLITE_OPTIMIZE_INTERVAL_MINUTES: int = 60
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -43,6 +64,77 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-super-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    # Build the request principal from token claims instead of loading the user row
+    AUTH_STATELESS: bool = True
+    # Roles that are granted every permission and menu
+    RBAC_SUPERUSER_ROLES: list[str] = ["ADMIN"]
+
+    # Password hashing (bcrypt cost; existing hashes are upgraded on login)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # Per-request query stats (Server-Timing header, N+1 detection, budgets)
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5
+    # Max queries per request by route label, e.g. {"GET /api/v1/stock": 5}
+    QUERY_BUDGETS: dict[str, int] = {}
+    QUERY_BUDGET_DEFAULT: int = 50
+    # Log over-budget requests as errors rather than warnings (for tests)
+    QUERY_BUDGET_ENFORCE: bool = False
+
+    # Slow-query log: statements slower than this are kept with their plan (0 disables)
+    SLOW_QUERY_MS: int = 200
+    SLOW_QUERY_LOG_SIZE: int = 200
+    SLOW_QUERY_EXPLAIN: bool = True
+
+    # Request tracing: share of requests recorded as span trees (X-Trace-Sample: 1 forces)
+    TRACING_ENABLED: bool = True
+    TRACE_SAMPLE_RATE: float = 0.01
+    TRACE_BUFFER_SIZE: int = 200
+    TRACE_MAX_SPANS: int = 5000
+    # Also append finished traces to this JSONL file
+    TRACE_JSONL_PATH: str = ""
+
+    # Per-request profiling: admins send X-Profile: 1; PROFILE_SAMPLE_RATE profiles a share of all requests
+    PROFILING_ENABLED: bool = True
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: float = 1.0
+    PROFILE_BUFFER_SIZE: int = 20
+    # Also write each profile to this directory (.collapsed and .speedscope.json)
+    PROFILE_DIR: str = ""
+
+    # Continuous profiling: every thread sampled at CONTINUOUS_PROFILE_HZ into 1-minute windows
+    # (off by default in desktop mode)
+    CONTINUOUS_PROFILING_ENABLED: bool = True
+    CONTINUOUS_PROFILE_HZ: int = 100
+    CONTINUOUS_PROFILE_WINDOWS: int = 30
+    # Directory shared by all workers so any worker can serve merged windows
+    CONTINUOUS_PROFILE_DIR: str = ""
+
+    # Prometheus /metrics endpoint (set PROMETHEUS_MULTIPROC_DIR for multi-worker)
+    METRICS_ENABLED: bool = True
+
+    # Event-loop monitoring (the blocking detector is always on when DEBUG is set)
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_MS: int = 100
+    LOOP_BLOCK_THRESHOLD_MS: int = 100
+    LOOP_BLOCK_DETECTOR: bool = False
+
+    # Compress responses above COMPRESSION_MIN_SIZE bytes (brotli when installed, else gzip;
+    # off by default in desktop mode). Built assets are served from their .br/.gz files.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Invalidation bus keeping in-process caches consistent across workers and nodes:
+    # auto (first available of redis, postgres, local) | redis | postgres | local | none
+    # (none by default in desktop mode)
+    INVALIDATION_BUS: str = "auto"
+    # Socket directory of the local bus (default: one per DATABASE_URL in the temp directory)
+    INVALIDATION_BUS_DIR: str = ""
 
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:5173", "http://localhost:3000"]
@@ -63,6 +155,32 @@ class Settings(BaseSettings):
             self.DATABASE_URL = f"sqlite:///{db_path}"
             # Same-origin access in desktop mode, no need for specific CORS origins
             self.CORS_ORIGINS = ["*"]
+            # A single local user: no always-on sampler unless asked for
+            if "CONTINUOUS_PROFILING_ENABLED" not in self.model_fields_set:
+                self.CONTINUOUS_PROFILING_ENABLED = False
+            # Responses never leave the machine: compressing them only costs CPU
+            if "COMPRESSION_ENABLED" not in self.model_fields_set:
+                self.COMPRESSION_ENABLED = False
+            # One process: no other workers to keep in sync
+            if "INVALIDATION_BUS" not in self.model_fields_set:
+                self.INVALIDATION_BUS = "none"
+
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """DATABASE_URL rewritten for the async driver of its dialect."""
+        return to_async_url(self.DATABASE_URL)
+
+
+def to_async_url(url: str) -> str:
+    """Rewrite a database URL for the async driver of its dialect."""
+    for sync_prefix, async_prefix in (
+        ("sqlite://", "sqlite+aiosqlite://"),
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
 
 
 @lru_cache()
@@ -1,6 +1,7 @@
 """Core module initialization."""
 
 from app.core.security import (
+    Principal,
     create_access_token,
     verify_password,
     get_password_hash,
@@ -9,6 +10,7 @@ from app.core.security import (
 )
 
 __all__ = [
+    "Principal",
     "create_access_token",
     "verify_password",
     "get_password_hash",
@@ -0,0 +1,146 @@
+"""Password hashing off the event loop.
+
+bcrypt deliberately takes hundreds of milliseconds per call. Running it
+inline in an ``async def`` handler freezes the event loop for every other
+request on the worker, so hashing and verification are dispatched to a
+small bounded thread pool instead (bcrypt releases the GIL while hashing).
+
+The pool applies back-pressure: once ``PASSWORD_HASH_MAX_PENDING`` jobs are
+queued or running, new jobs are rejected with ``HashPoolSaturated`` rather
+than piling up behind a login burst.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from app.config import settings
+from app.core.metrics import PASSWORD_HASH_PENDING, PASSWORD_HASH_REJECTED
+from app.core.security import get_pwd_context
+
+T = TypeVar("T")
+
+
+class HashPoolSaturated(Exception):
+    """Raised when too many password hashing jobs are already pending."""
+
+
+class PasswordHasherPool:
+    """Bounded executor for password hashing with queue-time metrics."""
+
+    def __init__(self, max_workers: int, max_pending: int, sample_size: int = 1024):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._rehashed = 0
+        self._queue_wait_ms: deque = deque(maxlen=sample_size)
+        self._run_ms: deque = deque(maxlen=sample_size)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="pwd-hash"
+                    )
+        return self._executor
+
+    async def _submit(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                PASSWORD_HASH_REJECTED.inc()
+                raise HashPoolSaturated()
+            self._pending += 1
+        PASSWORD_HASH_PENDING.inc()
+
+        submitted = time.perf_counter()
+
+        def run() -> T:
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self._queue_wait_ms.append((started - submitted) * 1000)
+                    self._run_ms.append((finished - started) * 1000)
+
+        def release(_future) -> None:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+            PASSWORD_HASH_PENDING.dec()
+
+        # Released when the job finishes, not when the caller stops waiting:
+        # a cancelled request leaves its hash running on a worker thread
+        future = self._get_executor().submit(run)
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password at the configured cost."""
+        return await self._submit(get_pwd_context().hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Verify a password against a hash."""
+        return await self._submit(get_pwd_context().verify, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and rehash it if the stored cost is outdated.
+
+        Returns:
+            (valid, new_hash) where new_hash is None unless the stored hash
+            should be replaced
+        """
+        valid, new_hash = await self._submit(get_pwd_context().verify_and_update, password, hashed)
+        if new_hash:
+            with self._lock:
+                self._rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> dict:
+        """Get pool counters and queue-time/run-time percentiles (ms)."""
+        with self._lock:
+            waits = sorted(self._queue_wait_ms)
+            runs = sorted(self._run_ms)
+            stats = {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "rehashed": self._rehashed,
+            }
+
+        def pct(values, p):
+            return round(values[min(len(values) - 1, int(len(values) * p))], 2) if values else 0.0
+
+        stats.update({
+            "queue_wait_p50_ms": pct(waits, 0.50),
+            "queue_wait_p99_ms": pct(waits, 0.99),
+            "queue_wait_max_ms": round(waits[-1], 2) if waits else 0.0,
+            "run_p50_ms": pct(runs, 0.50),
+            "run_p99_ms": pct(runs, 0.99),
+        })
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasherPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,364 @@
+"""Cross-process cache invalidation.
+
+The in-process caches (token versions and the logout denylist, compiled
+permissions, reference data and its name dictionaries, replica
+stickiness) are only correct as long as every write goes through the same
+process. With several workers (``gunicorn.conf.py``) or nodes, each cache
+applies its own writes immediately and publishes them on
+``invalidation_bus``; every other process applies them when they arrive.
+
+Transports, chosen by ``INVALIDATION_BUS`` (``auto`` takes the first that
+works, in this order):
+
+- ``redis``: pub/sub on ``REDIS_URL`` (multi-node)
+- ``postgres``: ``LISTEN``/``NOTIFY`` on a PostgreSQL ``DATABASE_URL``
+  (multi-node)
+- ``local``: Unix datagram sockets in a directory shared by the workers of
+  one host
+- ``none``: a single process (the default in desktop mode)
+
+Delivery is best-effort. Messages published while a process is starting
+or reconnecting are lost to it, so subscribers also register a resync
+handler, called after a reconnect, that drops whatever may have gone stale.
+"""
+
+import abc
+import hashlib
+import logging
+import os
+import queue
+import select
+import socket
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import orjson
+
+from app.config import settings
+from app.core.metrics import record_invalidation
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "inbound_invalidation"
+
+Handler = Callable[[dict], None]
+
+
+class _NullTransport:
+    """Single process: nothing to tell."""
+
+    name = "none"
+
+    def start(self, deliver: Callable[[bytes], None], resync: Callable[[], None]) -> None:
+        pass
+
+    def publish(self, message: bytes) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class _ListenerTransport(_NullTransport, abc.ABC):
+    """Base of the transports that receive on a background thread."""
+
+    def __init__(self):
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, deliver: Callable[[bytes], None], resync: Callable[[], None]) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._listen, args=(deliver, resync), name=f"invalidation-{self.name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    @abc.abstractmethod
+    def _listen(self, deliver: Callable[[bytes], None], resync: Callable[[], None]) -> None:
+        """Receive messages until stopped, calling ``resync`` after a reconnect."""
+
+
+class _RedisTransport(_ListenerTransport):
+    name = "redis"
+
+    def __init__(self, url: str):
+        super().__init__()
+        import redis
+
+        self._errors = redis.RedisError
+        self._client = redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=5)
+        self._client.ping()
+
+    def publish(self, message: bytes) -> None:
+        self._client.publish(CHANNEL, message)
+
+    def _listen(self, deliver: Callable[[bytes], None], resync: Callable[[], None]) -> None:
+        connected_before = False
+        while not self._stopping.is_set():
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+                if connected_before:
+                    resync()
+                connected_before = True
+                while not self._stopping.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        deliver(message["data"])
+                pubsub.close()
+            except self._errors as exc:
+                logger.warning("Invalidation bus: Redis connection lost (%s), reconnecting", exc)
+                self._stopping.wait(1.0)
+
+
+class _PostgresTransport(_ListenerTransport):
+    name = "postgres"
+
+    def __init__(self, url: str):
+        super().__init__()
+        import psycopg2
+        from sqlalchemy.engine import make_url
+
+        url = make_url(url)
+        if url.get_backend_name() != "postgresql":
+            raise ValueError("DATABASE_URL is not a PostgreSQL database")
+        self._psycopg2 = psycopg2
+        self._dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self._lock = threading.Lock()
+        self._publisher = self._connect()
+
+    def _connect(self):
+        conn = self._psycopg2.connect(self._dsn, connect_timeout=2)
+        conn.autocommit = True
+        return conn
+
+    def publish(self, message: bytes) -> None:
+        with self._lock:
+            for attempt in (1, 2):
+                try:
+                    with self._publisher.cursor() as cursor:
+                        cursor.execute("SELECT pg_notify(%s, %s)", (CHANNEL, message.decode()))
+                    return
+                except self._psycopg2.OperationalError:
+                    if attempt == 2:
+                        raise
+                    self._publisher = self._connect()
+
+    def _listen(self, deliver: Callable[[bytes], None], resync: Callable[[], None]) -> None:
+        connected_before = False
+        while not self._stopping.is_set():
+            try:
+                conn = self._connect()
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                if connected_before:
+                    resync()
+                connected_before = True
+                while not self._stopping.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        deliver(conn.notifies.pop(0).payload.encode())
+                conn.close()
+            except self._psycopg2.Error as exc:
+                logger.warning("Invalidation bus: PostgreSQL connection lost (%s), reconnecting", exc)
+                self._stopping.wait(1.0)
+
+    def stop(self) -> None:
+        super().stop()
+        self._publisher.close()
+
+
+class _LocalTransport(_ListenerTransport):
+    """One datagram socket per process in a shared directory; publishing sends to all."""
+
+    name = "local"
+
+    def __init__(self, directory: Path):
+        super().__init__()
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not available")
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.path = directory / f"{os.getpid()}.sock"
+        # A leftover of a crashed process with the same pid
+        self.path.unlink(missing_ok=True)
+        self._receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._receiver.bind(str(self.path))
+        self._receiver.settimeout(1.0)
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setblocking(False)
+
+    def publish(self, message: bytes) -> None:
+        for peer in self.directory.glob("*.sock"):
+            if peer == self.path:
+                continue
+            try:
+                self._sender.sendto(message, str(peer))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Nobody reads it any more: the process exited without cleaning up
+                peer.unlink(missing_ok=True)
+            except BlockingIOError:
+                logger.warning("Invalidation bus: %s is not keeping up, message dropped", peer.name)
+
+    def _listen(self, deliver: Callable[[bytes], None], resync: Callable[[], None]) -> None:
+        while not self._stopping.is_set():
+            try:
+                message = self._receiver.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            deliver(message)
+
+    def stop(self) -> None:
+        super().stop()
+        self._receiver.close()
+        self._sender.close()
+        self.path.unlink(missing_ok=True)
+
+
+def _local_directory() -> Path:
+    if settings.INVALIDATION_BUS_DIR:
+        return Path(settings.INVALIDATION_BUS_DIR)
+    # Workers sharing a database share a bus
+    digest = hashlib.sha1(settings.DATABASE_URL.encode(), usedforsecurity=False).hexdigest()
+    return Path(tempfile.gettempdir()) / f"inbound-bus-{digest[:12]}"
+
+
+_TRANSPORTS = {
+    "redis": lambda: _RedisTransport(settings.REDIS_URL),
+    "postgres": lambda: _PostgresTransport(settings.DATABASE_URL),
+    "local": lambda: _LocalTransport(_local_directory()),
+    "none": _NullTransport,
+}
+
+
+def create_transport(kind: str):
+    """Create the transport named ``kind``, or the first one that works for ``auto``."""
+    if kind != "auto":
+        if kind not in _TRANSPORTS:
+            raise ValueError(f"Unknown INVALIDATION_BUS: {kind!r}")
+        return _TRANSPORTS[kind]()
+    for name in ("redis", "postgres", "local"):
+        try:
+            return _TRANSPORTS[name]()
+        except Exception as exc:
+            logger.info("Invalidation bus: %s not available (%s)", name, exc)
+    return _NullTransport()
+
+
+class InvalidationBus:
+    """Topic-based publish/subscribe between the processes serving the app."""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._resync_handlers: List[Callable[[], None]] = []
+        self._transport = _NullTransport()
+        self._origin = ""
+        self._outbox: "queue.SimpleQueue[Optional[bytes]]" = queue.SimpleQueue()
+        self._sender: Optional[threading.Thread] = None
+
+    @property
+    def transport(self) -> str:
+        """Name of the transport in use."""
+        return self._transport.name
+
+    def subscribe(
+        self, topic: str, handler: Handler, resync: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Call ``handler(data)`` for every message on ``topic`` from another process.
+
+        Args:
+            resync: Called after a reconnect, when messages may have been missed
+        """
+        handlers = self._handlers.setdefault(topic, [])
+        if handler not in handlers:
+            handlers.append(handler)
+        if resync is not None and resync not in self._resync_handlers:
+            self._resync_handlers.append(resync)
+
+    def publish(self, topic: str, **data) -> None:
+        """Tell the other processes about a write (never blocks; no-op until started)."""
+        if self._sender is None:
+            return
+        message = orjson.dumps({"o": self._origin, "t": topic, "d": data})
+        self._outbox.put(message)
+        record_invalidation(topic, "sent")
+
+    def start(self, kind: Optional[str] = None) -> str:
+        """
+        Connect the transport and start listening (once per process, at startup).
+
+        Returns:
+            The transport name
+        """
+        if self._sender is not None:
+            return self.transport
+        # Per process, not per import: forked workers must not share an origin
+        self._origin = uuid.uuid4().hex
+        self._transport = create_transport(kind or settings.INVALIDATION_BUS)
+        if self._transport.name == "none":
+            return self.transport
+        self._transport.start(self._deliver, self._resync)
+        self._sender = threading.Thread(target=self._send, name="invalidation-send", daemon=True)
+        self._sender.start()
+        logger.info("Invalidation bus: %s", self.transport)
+        return self.transport
+
+    def stop(self) -> None:
+        """Send what is queued, then disconnect."""
+        if self._sender is not None:
+            self._outbox.put(None)
+            self._sender.join(timeout=5)
+            self._sender = None
+        self._transport.stop()
+        self._transport = _NullTransport()
+
+    def _send(self) -> None:
+        while True:
+            message = self._outbox.get()
+            if message is None:
+                return
+            try:
+                self._transport.publish(message)
+            except Exception as exc:
+                logger.warning("Invalidation bus: publish failed (%s)", exc)
+
+    def _deliver(self, raw: bytes) -> None:
+        try:
+            message = orjson.loads(raw)
+            origin, topic, data = message["o"], message["t"], message["d"]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            logger.warning("Invalidation bus: malformed message %r", raw[:200])
+            return
+        if origin == self._origin:
+            return
+        record_invalidation(topic, "received")
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(data)
+            except Exception:
+                logger.exception("Invalidation bus: handler for %s failed", topic)
+
+    def _resync(self) -> None:
+        for handler in self._resync_handlers:
+            try:
+                handler()
+            except Exception:
+                logger.exception("Invalidation bus: resync failed")
+
+
+invalidation_bus = InvalidationBus()
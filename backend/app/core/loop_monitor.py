@@ -0,0 +1,244 @@
+"""Event-loop lag monitoring and blocking-call detection.
+
+Handlers are ``async def`` but still do synchronous work (ORM queries,
+Excel parsing), and every millisecond they spend doing it is a
+millisecond no other request on the worker makes progress.
+
+``LoopMonitor`` measures this in two ways:
+
+* a lag sampler task that sleeps for a fixed interval and records how late
+  it wakes up (cheap, always on);
+* an optional watchdog thread (the blocking detector) that notices when the
+  sampler has not run for longer than ``LOOP_BLOCK_THRESHOLD_MS`` and
+  captures the stack of the loop thread and the route of the task that is
+  currently running, while it is still blocking.
+
+``LoopMonitorMiddleware`` maps request tasks to their ASGI scope so the
+watchdog can name the route.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.core.metrics import EVENT_LOOP_LAG
+from app.core.request_context import route_label
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """Event-loop lag sampler with an optional blocking-call watchdog."""
+
+    def __init__(
+        self,
+        interval_ms: float,
+        threshold_ms: float,
+        sample_size: int = 2048,
+        max_events: int = 100,
+    ):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self._lag_ms: deque = deque(maxlen=sample_size)
+        self._events: deque = deque(maxlen=max_events)
+        self._route_stats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._last_beat = 0.0
+        # (event, last beat before the stall) captured by the watchdog
+        self._pending_event: Optional[Tuple[dict, float]] = None
+        self._request_scopes: Dict[asyncio.Task, Scope] = {}
+        self._max_lag_ms = 0.0
+        self._stalls = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, detect_blocking: bool = False) -> None:
+        """Start sampling on the running loop (and the watchdog if requested)."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stopping.clear()
+        self._task = self._loop.create_task(self._sample())
+        if detect_blocking:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the sampler and the watchdog."""
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    def reset(self) -> None:
+        """Discard collected samples and events."""
+        with self._lock:
+            self._lag_ms.clear()
+            self._events.clear()
+            self._route_stats.clear()
+            self._max_lag_ms = 0.0
+            self._stalls = 0
+
+    def track(self, task: asyncio.Task, scope: Scope) -> None:
+        """Associate a request task with its scope (see ``LoopMonitorMiddleware``)."""
+        self._request_scopes[task] = scope
+
+    def untrack(self, task: asyncio.Task) -> None:
+        self._request_scopes.pop(task, None)
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._last_beat = now
+            lag_ms = max(0.0, (now - expected) * 1000)
+            EVENT_LOOP_LAG.observe(lag_ms / 1000)
+            with self._lock:
+                self._lag_ms.append(lag_ms)
+                self._max_lag_ms = max(self._max_lag_ms, lag_ms)
+                pending, self._pending_event = self._pending_event, None
+                if lag_ms >= self.threshold * 1000:
+                    self._stalls += 1
+            if pending is not None:
+                event, beat = pending
+                # A stall that began before this sleep (right after start())
+                # is longer than the wake-up delay
+                self._finish_event(event, max(lag_ms, (now - beat - self.interval) * 1000))
+
+    def _watch(self) -> None:
+        # Poll at a fraction of the threshold so a stall is caught while the
+        # offending code is still on the stack
+        poll = max(self.threshold / 4, 0.005)
+        reported_beat = None
+        while not self._stopping.wait(poll):
+            beat = self._last_beat
+            if beat == reported_beat:
+                continue
+            if time.perf_counter() - beat < self.interval + self.threshold:
+                continue
+            reported_beat = beat
+            event = self._capture()
+            with self._lock:
+                self._pending_event = (event, beat)
+
+    def _capture(self) -> dict:
+        task = None
+        if self._loop is not None:
+            try:
+                task = asyncio.current_task(self._loop)
+            except RuntimeError:
+                task = None
+        scope = self._request_scopes.get(task) if task is not None else None
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        return {
+            "time": time.time(),
+            "route": route_label(scope) if scope is not None else None,
+            "task": task.get_name() if task is not None else None,
+            "stack": [line.rstrip() for line in stack[-30:]],
+        }
+
+    def _finish_event(self, event: dict, blocked_ms: float) -> None:
+        # A lower bound on how long the step ran
+        event["blocked_ms"] = round(blocked_ms, 2)
+        route = event["route"] or "<no request>"
+        with self._lock:
+            self._events.append(event)
+            stats = self._route_stats.setdefault(route, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += event["blocked_ms"]
+            stats["max_ms"] = max(stats["max_ms"], event["blocked_ms"])
+        last_frame = event["stack"][-1].strip().splitlines()[0] if event["stack"] else "?"
+        logger.warning(
+            "Event loop blocked for at least %.1f ms in %s (%s)", event["blocked_ms"], route, last_frame
+        )
+
+    def stats(self) -> dict:
+        """Get lag percentiles (ms), stall counts and per-route blocking totals."""
+        with self._lock:
+            lags = sorted(self._lag_ms)
+            stats = {
+                "running": self.running,
+                "detector": self._watchdog is not None,
+                "interval_ms": self.interval * 1000,
+                "threshold_ms": self.threshold * 1000,
+                "samples": len(lags),
+                "stalls": self._stalls,
+                "max_lag_ms": round(self._max_lag_ms, 2),
+                "routes": {
+                    route: {
+                        "count": s["count"],
+                        "total_ms": round(s["total_ms"], 2),
+                        "max_ms": round(s["max_ms"], 2),
+                    }
+                    for route, s in sorted(
+                        self._route_stats.items(), key=lambda item: -item[1]["total_ms"]
+                    )
+                },
+            }
+
+        def pct(p):
+            return round(lags[min(len(lags) - 1, int(len(lags) * p))], 2) if lags else 0.0
+
+        stats.update({
+            "lag_p50_ms": pct(0.50),
+            "lag_p99_ms": pct(0.99),
+        })
+        return stats
+
+    def events(self, limit: int = 20) -> List[dict]:
+        """Get the most recent blocking events, newest first."""
+        with self._lock:
+            return list(self._events)[-limit:][::-1]
+
+
+class LoopMonitorMiddleware:
+    """ASGI middleware that lets the blocking detector attribute stalls to routes."""
+
+    def __init__(self, app: ASGIApp, monitor: "LoopMonitor"):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        task = asyncio.current_task()
+        self.monitor.track(task, scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.untrack(task)
+
+
+loop_monitor = LoopMonitor(
+    interval_ms=settings.LOOP_MONITOR_INTERVAL_MS,
+    threshold_ms=settings.LOOP_BLOCK_THRESHOLD_MS,
+)
@@ -0,0 +1,200 @@
+"""Prometheus metrics.
+
+Metrics are plain ``prometheus_client`` objects updated inline (a lock and an
+add per observation). With several worker processes, start the server with
+``PROMETHEUS_MULTIPROC_DIR`` pointing at an empty shared directory: every
+worker then writes its values to memory-mapped files there and ``/metrics``
+aggregates all workers, whichever one serves the scrape. Gauges declare how
+they are combined across workers (``livesum`` drops workers that exited).
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import REGISTRY, multiprocess
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.request_context import route_label
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# HTTP
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being served",
+    multiprocess_mode="livesum",
+)
+
+# Database connection pools
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_acquire_seconds",
+    "Time to obtain a connection from the pool (waiting or connecting)",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+# Caches
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "In-process cache lookups",
+    ["cache", "result"],
+)
+INVALIDATION_MESSAGES = Counter(
+    "cache_invalidation_messages_total",
+    "Invalidation bus messages sent to and received from other processes",
+    ["topic", "direction"],
+)
+
+# Background jobs
+PASSWORD_HASH_PENDING = Gauge(
+    "password_hash_jobs_pending",
+    "Password hashing jobs queued or running",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_jobs_rejected_total",
+    "Password hashing jobs rejected because the pool was saturated",
+)
+
+# Event loop
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Event-loop wake-up delay measured by the lag sampler",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+# Business
+INBOUND_LINES = Counter(
+    "inbound_lines_total",
+    "Inbound item lines recorded",
+)
+IMPORT_ROWS = Counter(
+    "import_rows_total",
+    "Rows imported from Excel files",
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache hit or miss (hit ratio = hits / all lookups)."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_invalidation(topic: str, direction: str) -> None:
+    """Count an invalidation bus message ("sent" or "received")."""
+    INVALIDATION_MESSAGES.labels(topic, direction).inc()
+
+
+def instrument_engine(engine, name: str) -> None:
+    """Track checkouts, overflow and acquire time of an engine's connection pool."""
+    from sqlalchemy import event
+
+    pool = engine.pool
+    if not hasattr(pool, "overflow") or getattr(pool, "_metrics_name", None):
+        # Not a QueuePool (e.g. in-memory SQLite), or already instrumented
+        return
+    pool._metrics_name = name
+
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    overflow = DB_POOL_OVERFLOW.labels(name)
+    wait = DB_POOL_WAIT.labels(name)
+
+    def on_checkout(*args) -> None:
+        checked_out.set(pool.checkedout())
+        overflow.set(max(0, pool.overflow()))
+
+    def on_checkin(*args) -> None:
+        # Fires before the connection is back in the queue
+        checked_out.set(max(0, pool.checkedout() - 1))
+
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
+
+    # QueuePool has no event before a checkout starts, so time _do_get itself
+    do_get = pool._do_get
+
+    def timed_do_get():
+        started = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            wait.observe(time.perf_counter() - started)
+
+    pool._do_get = timed_do_get
+
+
+def render_metrics() -> tuple:
+    """
+    Render the exposition text for all workers (or this process).
+
+    Returns:
+        (body, content type)
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency and in-flight requests."""
+
+    def __init__(self, app: ASGIApp, exclude_paths: tuple = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            method, _, route = route_label(scope).partition(" ")
+            if scope.get("route") is None:
+                # Unmatched paths (scanners, SPA fallback misses) share one label
+                route = "<unmatched>"
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(
+                time.perf_counter() - started
+            )
@@ -0,0 +1,292 @@
+"""Compiled role-based permissions.
+
+Role → menu assignments (``roles``/``role_menus``/``menus``) are compiled
+into an immutable snapshot at startup: every distinct permission string
+gets a bit, and every role gets an integer bitmask of its permissions.
+Permission checks then need no database access: OR the masks of the
+principal's roles (memoized per role combination) and test one bit.
+The memoized masks and menu trees live on the snapshot they were computed
+from, so swapping in a new snapshot discards them with it.
+
+Writes that change role assignments call ``permission_engine.reload(db)``,
+which builds a new snapshot and swaps it in. Other worker processes hear
+of it on the invalidation bus and rebuild theirs. Versions are millisecond
+timestamps taken before the data is read (and at least the version on the
+bus), so workers roughly agree on them, and a reload that started earlier
+never replaces the snapshot of one that started later. No lock is held
+while querying, since the query may yield to the event loop in async mode.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.metrics import record_cache_lookup
+from app.core.revocation import token_registry
+from app.core.security import decode_token, get_current_active_user
+
+
+@dataclass(frozen=True)
+class PermissionSnapshot:
+    """Immutable compiled view of roles, menus and permissions."""
+
+    version: int = 0
+    perm_bits: Dict[str, int] = field(default_factory=dict)
+    role_masks: Dict[str, int] = field(default_factory=dict)
+    role_menus: Dict[str, FrozenSet[int]] = field(default_factory=dict)
+    menus: Tuple[dict, ...] = ()
+    all_mask: int = 0
+    # Per role combination, derived from this snapshot only
+    mask_cache: Dict[Tuple[str, ...], int] = field(default_factory=dict, compare=False, repr=False)
+    tree_cache: Dict[Tuple[str, ...], List[dict]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+
+class PermissionEngine:
+    """Permission checks and menu trees served from a compiled snapshot."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = PermissionSnapshot()
+        # Highest version handed to a reload so far
+        self._issued = 0
+
+    @property
+    def version(self) -> int:
+        """Version of the compiled snapshot (a millisecond timestamp; increases on every reload)."""
+        return self._snapshot.version
+
+    def reload(self, db: Session, broadcast: bool = True) -> int:
+        """
+        Compile role → menu/permission data from the database.
+
+        Args:
+            broadcast: Also make the other worker processes reload
+
+        Returns:
+            The version of the current snapshot
+        """
+        version = self._next_version()
+        current = self._compile(db, version)
+        if broadcast:
+            invalidation_bus.publish("permissions.reload", version=version)
+        return current
+
+    def reload_from_primary(self, version: int = 0) -> int:
+        """
+        Reload with a session of its own (for reloads requested by other processes).
+
+        Args:
+            version: The requesting process's version; the new one is at least this
+        """
+        from app.database import SessionLocal
+
+        version = self._next_version(version)
+        with SessionLocal() as db:
+            return self._compile(db, version)
+
+    def _next_version(self, at_least: int = 0) -> int:
+        with self._lock:
+            self._issued = max(self._issued + 1, time.time_ns() // 1_000_000, at_least)
+            return self._issued
+
+    def _compile(self, db: Session, version: int) -> int:
+        # Import here to avoid circular imports
+        from app.models.user import Menu, Role, RoleMenu
+
+        menus = db.query(Menu).order_by(Menu.parent_id, Menu.order_num, Menu.menu_id).all()
+        pairs = (
+            db.query(Role.role_name, RoleMenu.menu_id)
+            .join(RoleMenu, RoleMenu.role_id == Role.role_id)
+            .all()
+        )
+        role_names = [name for (name,) in db.query(Role.role_name).all()]
+
+        menu_rows = tuple(
+            {
+                "menu_id": m.menu_id,
+                "parent_id": m.parent_id or 0,
+                "menu_name": m.menu_name,
+                "path": m.path,
+                "component": m.component,
+                "perms": m.perms,
+                "icon": m.icon,
+                "type": m.type,
+                "order_num": m.order_num or 0,
+            }
+            for m in menus
+        )
+
+        perm_bits: Dict[str, int] = {}
+        menu_mask: Dict[int, int] = {}
+        for menu in menu_rows:
+            mask = 0
+            for perm in _split_perms(menu["perms"]):
+                if perm not in perm_bits:
+                    perm_bits[perm] = 1 << len(perm_bits)
+                mask |= perm_bits[perm]
+            menu_mask[menu["menu_id"]] = mask
+
+        role_masks: Dict[str, int] = {name: 0 for name in role_names}
+        role_menus: Dict[str, set] = {name: set() for name in role_names}
+        for role_name, menu_id in pairs:
+            role_masks[role_name] = role_masks.get(role_name, 0) | menu_mask.get(menu_id, 0)
+            role_menus.setdefault(role_name, set()).add(menu_id)
+
+        snapshot = PermissionSnapshot(
+            version=version,
+            perm_bits=perm_bits,
+            role_masks=role_masks,
+            role_menus={name: frozenset(ids) for name, ids in role_menus.items()},
+            menus=menu_rows,
+            all_mask=(1 << len(perm_bits)) - 1,
+        )
+        with self._lock:
+            # An overlapping reload that started later read newer data
+            if version > self._snapshot.version:
+                self._snapshot = snapshot
+            return self._snapshot.version
+
+    def mask_for(self, roles: Iterable[str]) -> int:
+        """Get the combined permission bitmask of a set of roles."""
+        return _mask(self._snapshot, roles)
+
+    def has_perm(self, roles: Iterable[str], perm: str) -> bool:
+        """Check whether any of the roles grants a permission."""
+        roles = tuple(roles)
+        if _is_superuser(roles):
+            return True
+        snapshot = self._snapshot
+        bit = snapshot.perm_bits.get(perm)
+        if bit is None:
+            return False
+        return bool(_mask(snapshot, roles) & bit)
+
+    def permissions_for(self, roles: Iterable[str]) -> List[str]:
+        """Get the permission strings granted by a set of roles."""
+        snapshot = self._snapshot
+        mask = _mask(snapshot, roles)
+        return sorted(perm for perm, bit in snapshot.perm_bits.items() if mask & bit)
+
+    def menu_tree_for(self, roles: Iterable[str]) -> List[dict]:
+        """Get the navigation menu tree (type 0 entries) visible to a set of roles."""
+        snapshot = self._snapshot
+        key = tuple(sorted(roles))
+        tree = snapshot.tree_cache.get(key)
+        record_cache_lookup("menu_tree", tree is not None)
+        if tree is None:
+            if _is_superuser(key):
+                visible = None
+            else:
+                visible = set()
+                for role in key:
+                    visible |= snapshot.role_menus.get(role, frozenset())
+            tree = _build_tree(
+                m for m in snapshot.menus
+                if m["type"] == "0" and (visible is None or m["menu_id"] in visible)
+            )
+            snapshot.tree_cache[key] = tree
+        return tree
+
+
+def _mask(snapshot: PermissionSnapshot, roles: Iterable[str]) -> int:
+    key = tuple(sorted(roles))
+    mask = snapshot.mask_cache.get(key)
+    record_cache_lookup("permission_mask", mask is not None)
+    if mask is None:
+        if _is_superuser(key):
+            mask = snapshot.all_mask
+        else:
+            mask = 0
+            for role in key:
+                mask |= snapshot.role_masks.get(role, 0)
+        snapshot.mask_cache[key] = mask
+    return mask
+
+
+def _split_perms(perms) -> List[str]:
+    if not perms:
+        return []
+    return [p.strip() for p in perms.split(",") if p.strip()]
+
+
+def _is_superuser(roles: Iterable[str]) -> bool:
+    return any(role in settings.RBAC_SUPERUSER_ROLES for role in roles)
+
+
+def _build_tree(menus: Iterable[dict]) -> List[dict]:
+    nodes = {m["menu_id"]: {**m, "children": []} for m in menus}
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node["parent_id"])
+        if parent is not None:
+            parent["children"].append(node)
+        else:
+            roots.append(node)
+    return roots
+
+
+permission_engine = PermissionEngine()
+invalidation_bus.subscribe(
+    "permissions.reload",
+    lambda data: permission_engine.reload_from_primary(data.get("version", 0)),
+    resync=permission_engine.reload_from_primary,
+)
+
+
+def get_principal_roles(current_user) -> Tuple[str, ...]:
+    """
+    Get the role names of an authenticated user.
+
+    Stateless principals carry their roles. ``User`` rows (legacy tokens or
+    ``AUTH_STATELESS`` disabled) fall back to their loaded role assignments.
+    """
+    roles = getattr(current_user, "roles", None)
+    if roles is not None:
+        return tuple(roles)
+    return tuple(ur.role.role_name for ur in current_user.user_roles if ur.role)
+
+
+def require_perm(perm: str):
+    """
+    Build a dependency that requires a permission, e.g. ``require_perm("stock:write")``.
+
+    The check uses the compiled snapshot only, so it adds no queries.
+    """
+
+    async def checker(current_user=Depends(get_current_active_user)):
+        if not permission_engine.has_perm(get_principal_roles(current_user), perm):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Missing permission: {perm}",
+            )
+        return current_user
+
+    return checker
+
+
+def bearer_has_perm(headers: dict, perm: str) -> bool:
+    """
+    Check that the raw ASGI headers carry a valid bearer token granting ``perm``.
+
+    For middlewares, which run before dependencies. Tokens of users this
+    process has not checked yet are refused rather than looked up.
+    """
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    payload = decode_token(token)
+    if payload is None or token_registry.is_denied(payload.get("jti", "")):
+        return False
+    user_id = payload.get("uid")
+    if user_id is not None and not token_registry.is_valid_version(user_id, payload.get("ver", 0)):
+        return False
+    return permission_engine.has_perm(payload.get("roles", ()), perm)
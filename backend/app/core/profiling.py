@@ -0,0 +1,477 @@
+"""Opt-in per-request profiling with a stack sampler.
+
+A request is profiled when an administrator (``system:monitor``) sends
+``X-Profile: 1``, or when it falls into ``PROFILE_SAMPLE_RATE``. While it
+runs, a sampler thread reads the event-loop thread's stack every
+``PROFILE_INTERVAL_MS`` and keeps the samples taken while the request's own
+task is the one running, so concurrent requests on the same loop do not
+leak into the profile (``cProfile`` would record everything the thread
+runs). Samples therefore show on-loop time: handlers, services, ORM and
+serialization; time spent awaiting I/O or in worker threads is absent.
+
+Profiles are kept in memory (and in ``PROFILE_DIR`` when set) and can be
+downloaded as collapsed stacks (flamegraph.pl, speedscope, inferno) or as a
+speedscope JSON file. The response carries ``X-Profile-Id``.
+
+``ContinuousProfiler`` is the always-on counterpart: it samples every thread
+of the process at ``CONTINUOUS_PROFILE_HZ`` and folds the stacks into
+one-minute windows. With ``CONTINUOUS_PROFILE_DIR`` shared by all workers,
+each worker writes its finished windows there and any worker can serve the
+merged flamegraph of a window.
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import signal
+import sys
+import sysconfig
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.request_context import route_label
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+Stack = Tuple[str, ...]
+
+_STDLIB_PREFIX = sysconfig.get_paths()["stdlib"].rstrip("/") + "/"
+
+
+# Keyed by id(): hashing a code object rehashes its contents on every lookup.
+# The code object is kept in the value so its id cannot be reused.
+_labels: Dict[int, Tuple[CodeType, str]] = {}
+
+
+def frame_label(frame: FrameType) -> str:
+    """Label a frame as ``qualname (file:line)`` with the file relative to its package."""
+    code = frame.f_code
+    cached = _labels.get(id(code))
+    if cached is None:
+        cached = _labels[id(code)] = (code, _code_label(code))
+    return cached[1]
+
+
+def _code_label(code: CodeType) -> str:
+    filename = code.co_filename
+    for marker in ("/site-packages/", "/backend/"):
+        index = filename.rfind(marker)
+        if index >= 0:
+            filename = filename[index + len(marker):]
+            break
+    else:
+        if filename.startswith(_STDLIB_PREFIX):
+            filename = filename[len(_STDLIB_PREFIX):]
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+def frame_stack(frame: Optional[FrameType], limit: int = 200) -> Stack:
+    """Get a frame's stack as labels, root first."""
+    labels = []
+    cache = _labels
+    while frame is not None and limit:
+        code = frame.f_code
+        cached = cache.get(id(code))
+        if cached is None:
+            cached = cache[id(code)] = (code, _code_label(code))
+        labels.append(cached[1])
+        frame = frame.f_back
+        limit -= 1
+    labels.reverse()
+    return tuple(labels)
+
+
+def parse_collapsed(text: str) -> Counter:
+    """Parse collapsed stacks back into stack counts."""
+    stacks: Counter = Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack and count.isdigit():
+            stacks[tuple(stack.split(";"))] += int(count)
+    return stacks
+
+
+def to_collapsed(stacks: Counter) -> str:
+    """Render stack counts in collapsed ("folded") format: ``a;b;c count``."""
+    return "".join(
+        f"{';'.join(label.replace(';', ':') for label in stack)} {count}\n"
+        for stack, count in stacks.most_common()
+    )
+
+
+def to_speedscope(stacks: Counter, name: str, interval_ms: float) -> dict:
+    """Render stack counts as a speedscope sampled profile (weights in ms)."""
+    frame_index: Dict[str, int] = {}
+    frames: List[dict] = []
+    samples: List[List[int]] = []
+    weights: List[float] = []
+    for stack, count in stacks.items():
+        indexes = []
+        for label in stack:
+            if label not in frame_index:
+                frame_index[label] = len(frames)
+                func, _, location = label.partition(" (")
+                file, _, line = location.rstrip(")").rpartition(":")
+                frames.append({"name": func, "file": file, "line": int(line) if line.isdigit() else None})
+            indexes.append(frame_index[label])
+        samples.append(indexes)
+        weights.append(count * interval_ms)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+        "name": name,
+        "exporter": settings.APP_NAME,
+    }
+
+
+class TaskSampler:
+    """Samples the loop thread's stack while a given task is running."""
+
+    def __init__(self, task: asyncio.Task, interval: float):
+        self.task = task
+        self.interval = interval
+        self.loop = task.get_loop()
+        self.thread_id = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.ticks = 0
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stopping.set()
+        self._thread.join(timeout=1)
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            self.ticks += 1
+            if asyncio.current_task(self.loop) is not self.task:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[frame_stack(frame)] += 1
+
+
+class ProfileStore:
+    """Recent request profiles in memory, optionally written to a directory."""
+
+    def __init__(self, size: int, directory: str = ""):
+        self.size = size
+        self.directory = Path(directory) if directory else None
+        self._profiles: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: dict) -> None:
+        with self._lock:
+            self._profiles[profile["id"]] = profile
+            while len(self._profiles) > self.size:
+                self._profiles.popitem(last=False)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            base = self.directory / profile["id"]
+            base.with_suffix(".collapsed").write_text(to_collapsed(profile["stacks"]), encoding="utf-8")
+            base.with_suffix(".speedscope.json").write_text(
+                json.dumps(to_speedscope(profile["stacks"], profile["route"], profile["interval_ms"])),
+                encoding="utf-8",
+            )
+
+    def list(self) -> List[dict]:
+        """Get profile summaries, newest first."""
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return [
+            {key: value for key, value in p.items() if key != "stacks"}
+            for p in reversed(profiles)
+        ]
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+
+profile_store = ProfileStore(settings.PROFILE_BUFFER_SIZE, settings.PROFILE_DIR)
+
+
+# Leaf frames of threads that are parked (loop waiting for I/O, idle pool workers)
+_IDLE_LEAVES = {
+    "select": "selectors.py",
+    "wait": "threading.py",
+    "_worker": "concurrent/futures/thread.py",
+}
+_THREAD_NUMBER = re.compile(r"\d+")
+
+
+def _is_idle(frame: FrameType) -> bool:
+    code = frame.f_code
+    filename = _IDLE_LEAVES.get(code.co_name)
+    return filename is not None and code.co_filename.endswith(filename)
+
+
+class ContinuousProfiler:
+    """
+    Always-on sampler folding the stacks of all threads into fixed windows.
+
+    On Unix, when started from the main thread (where uvicorn runs the event
+    loop), samples are taken by a ``SIGPROF`` interval timer counting CPU
+    time: the handler runs between two bytecodes of the main thread, so there
+    is no thread switch per sample and an idle worker takes no samples at
+    all. Elsewhere a sampler thread wakes up ``hz`` times per second.
+    """
+
+    def __init__(self, hz: int, windows: int, directory: str = "", window_seconds: int = 60):
+        self.hz = hz
+        self.window_seconds = window_seconds
+        self.directory = Path(directory) if directory else None
+        self.mode: Optional[str] = None
+        self._windows: deque = deque(maxlen=windows)
+        self._current: Optional[dict] = None
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._previous_handler = None
+        self._started = 0.0
+        self._run_seconds = 0.0
+        self.busy_seconds = 0.0
+
+    def start(self) -> None:
+        if self.mode is not None:
+            return
+        self._started = time.perf_counter()
+        if (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+            and signal.getsignal(signal.SIGPROF) in (signal.SIG_DFL, None)
+        ):
+            self.mode = "signal"
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, 1 / self.hz, 1 / self.hz)
+            return
+        self.mode = "thread"
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="continuous-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self.mode is None:
+            return
+        if self.mode == "signal":
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        else:
+            self._stopping.set()
+            self._thread.join(timeout=1)
+            self._thread = None
+        self.mode = None
+        self._run_seconds += time.perf_counter() - self._started
+        with self._lock:
+            self._finish_window()
+
+    def _on_signal(self, signum: int, frame: Optional[FrameType]) -> None:
+        started = time.thread_time()
+        frames = sys._current_frames()
+        # The main thread's entry is this handler; use the interrupted frame
+        frames[threading.get_ident()] = frame
+        self.sample(frames)
+        self.busy_seconds += time.thread_time() - started
+
+    def _run(self) -> None:
+        interval = 1 / self.hz
+        own = threading.get_ident()
+        while not self._stopping.wait(interval):
+            started = time.thread_time()
+            frames = sys._current_frames()
+            del frames[own]
+            self.sample(frames)
+            self.busy_seconds += time.thread_time() - started
+
+    def sample(self, frames: Dict[int, Optional[FrameType]]) -> None:
+        """Record the stacks of the busy threads among ``frames`` (thread id → frame)."""
+        # Never wait: in signal mode the interrupted code may hold the lock
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            window_start = int(time.time() // self.window_seconds * self.window_seconds)
+            if self._current is None or self._current["start"] != window_start:
+                self._finish_window()
+                if self._windows and self._windows[-1]["start"] == window_start:
+                    # Restarted within the same window: keep adding to it
+                    self._current = self._windows.pop()
+                else:
+                    self._current = {"start": window_start, "samples": 0, "stacks": Counter()}
+            self._current["samples"] += 1
+            stacks = self._current["stacks"]
+            for ident, frame in frames.items():
+                if frame is None or _is_idle(frame):
+                    continue
+                stacks[(self._thread_name(ident),) + frame_stack(frame)] += 1
+        finally:
+            self._lock.release()
+
+    def _thread_name(self, ident: int) -> str:
+        name = self._thread_names.get(ident)
+        if name is None:
+            self._thread_names = {
+                thread.ident: "thread:" + _THREAD_NUMBER.sub("N", thread.name)
+                for thread in threading.enumerate()
+            }
+            name = self._thread_names.get(ident, "thread:?")
+        return name
+
+    def _finish_window(self) -> None:
+        window = self._current
+        self._current = None
+        if window is None or not window["stacks"]:
+            return
+        self._windows.append(window)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{window['start']}-{os.getpid()}.collapsed"
+            path.write_text(to_collapsed(window["stacks"]), encoding="utf-8")
+            self._prune_files()
+
+    def _prune_files(self) -> None:
+        oldest = time.time() - self._windows.maxlen * self.window_seconds
+        for path in self.directory.glob("*.collapsed"):
+            start = path.stem.partition("-")[0]
+            if start.isdigit() and int(start) < oldest:
+                path.unlink(missing_ok=True)
+
+    def overhead(self) -> float:
+        """Get the share of run time spent taking samples (CPU time)."""
+        elapsed = self._run_seconds
+        if self.mode is not None:
+            elapsed += time.perf_counter() - self._started
+        return self.busy_seconds / elapsed if elapsed else 0.0
+
+    def _collect(self) -> Dict[int, Dict[str, Counter]]:
+        """Get stack counts per window start and worker (current window included)."""
+        collected: Dict[int, Dict[str, Counter]] = {}
+        pid = str(os.getpid())
+        if self.directory is not None and self.directory.is_dir():
+            for path in self.directory.glob("*.collapsed"):
+                start, _, worker = path.stem.partition("-")
+                if start.isdigit():
+                    try:
+                        text = path.read_text(encoding="utf-8")
+                    except OSError:
+                        continue
+                    collected.setdefault(int(start), {})[worker] = parse_collapsed(text)
+        with self._lock:
+            windows = list(self._windows)
+            if self._current is not None:
+                windows.append({**self._current, "stacks": Counter(self._current["stacks"])})
+        for window in windows:
+            collected.setdefault(window["start"], {}).setdefault(pid, window["stacks"])
+        return collected
+
+    def windows(self) -> List[dict]:
+        """Get summaries of the recorded windows, newest first."""
+        current = self._current["start"] if self._current is not None else None
+        return [
+            {
+                "start": start,
+                "end": start + self.window_seconds,
+                "workers": sorted(workers),
+                "samples": sum(sum(stacks.values()) for stacks in workers.values()),
+                "complete": start != current,
+            }
+            for start, workers in sorted(self._collect().items(), reverse=True)
+        ]
+
+    def window(self, start: int) -> Optional[Counter]:
+        """Get the stack counts of a window merged across workers."""
+        workers = self._collect().get(start)
+        if workers is None:
+            return None
+        merged: Counter = Counter()
+        for stacks in workers.values():
+            merged.update(stacks)
+        return merged
+
+
+continuous_profiler = ContinuousProfiler(
+    settings.CONTINUOUS_PROFILE_HZ,
+    settings.CONTINUOUS_PROFILE_WINDOWS,
+    settings.CONTINUOUS_PROFILE_DIR,
+)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles requests on demand or by sampling."""
+
+    def __init__(self, app: ASGIApp, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:16]
+        interval_ms = settings.PROFILE_INTERVAL_MS
+        status_code = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        sampler = TaskSampler(asyncio.current_task(), interval_ms / 1000)
+        started_at = time.time()
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            stacks = sampler.stop()
+            self.store.add({
+                "id": profile_id,
+                "route": route_label(scope),
+                "status": status_code,
+                "time": started_at,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "interval_ms": interval_ms,
+                "samples": sum(stacks.values()),
+                "ticks": sampler.ticks,
+                "pid": os.getpid(),
+                "stacks": stacks,
+            })
+
+    @staticmethod
+    def _should_profile(scope: Scope) -> bool:
+        headers = dict(scope["headers"])
+        if headers.get(PROFILE_HEADER.lower().encode()) == b"1":
+            from app.core.permissions import bearer_has_perm
+
+            return bearer_has_perm(headers, "system:monitor")
+        return settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
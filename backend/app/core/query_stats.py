@@ -0,0 +1,253 @@
+"""Per-request SQL query instrumentation.
+
+SQLAlchemy cursor events time every statement of every engine (primary,
+replicas and the sync side of async engines) and add it to the stats of the
+request that is running, found through a context variable set by
+``QueryStatsMiddleware``. At the end of the request the middleware:
+
+* adds a ``Server-Timing`` header (``db`` time and query count, ``app`` total);
+* flags statements repeated at least ``QUERY_N_PLUS_ONE_THRESHOLD`` times
+  with the same fingerprint, the signature of an N+1 loop;
+* checks the query count against the route's budget (``QUERY_BUDGETS`` or
+  ``QUERY_BUDGET_DEFAULT``) and logs a warning, or an error when
+  ``QUERY_BUDGET_ENFORCE`` is set (the response is already sent by then,
+  so there is nothing left to fail);
+* folds the numbers into per-route totals for ``/system/queries``.
+
+Requests that matched no route (static files, SPA paths, scanner probes)
+share one ``<unmatched>`` entry, so arbitrary URLs cannot grow the table.
+
+Tests pin the query count of a code path with ``assert_max_queries``.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.request_context import route_label
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\([^)]+\)s|\$\d+)(?:\s*,\s*(?:\?|%\([^)]+\)s|\$\d+))+\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+# Route label of requests that matched no API route
+UNMATCHED = "<unmatched>"
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement so repeated executions of the same query match.
+
+    Bound parameters are already placeholders; expanded ``IN`` lists and
+    inline numbers are collapsed as well.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _IN_LIST.sub("(?)", normalized)
+    return _NUMBER.sub("N", normalized)
+
+
+class RequestQueryStats:
+    """Queries executed while serving one request."""
+
+    __slots__ = ("count", "db_seconds", "fingerprints", "started")
+
+    def __init__(self):
+        self.count = 0
+        self.db_seconds = 0.0
+        self.fingerprints: Counter = Counter()
+        self.started = time.perf_counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.db_seconds += seconds
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        """Get (fingerprint, count) pairs executed at least ``threshold`` times."""
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    """Get the query stats of the request being served, if any."""
+    return _current_stats.get()
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[RequestQueryStats]:
+    """
+    Fail with ``AssertionError`` when the block runs more than ``limit`` queries.
+
+    Only counts queries of the calling thread or task (not of requests a
+    test client serves on its own thread); the error lists the statements
+    by how often they ran, which points at N+1 loops.
+    """
+    stats = RequestQueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+    if stats.count > limit:
+        statements = "\n".join(f"  {n} x {fp[:200]}" for fp, n in stats.fingerprints.most_common())
+        raise AssertionError(f"{stats.count} queries, expected at most {limit}:\n{statements}")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = conn.info.get("query_started")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+class QueryStatsRegistry:
+    """Per-route query totals and recent N+1 findings for this worker."""
+
+    def __init__(self, max_findings: int = 200):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, dict] = {}
+        self._findings: Dict[tuple, dict] = {}
+        self.max_findings = max_findings
+
+    def budget_for(self, route: str) -> int:
+        """Get a route's query budget (0 means unlimited)."""
+        return settings.QUERY_BUDGETS.get(route, settings.QUERY_BUDGET_DEFAULT)
+
+    def record(self, route: str, stats: RequestQueryStats, repeated: List[tuple], over_budget: bool) -> None:
+        with self._lock:
+            totals = self._routes.setdefault(route, {
+                "requests": 0, "queries": 0, "db_ms": 0.0, "max_queries": 0,
+                "n_plus_one": 0, "over_budget": 0,
+            })
+            totals["requests"] += 1
+            totals["queries"] += stats.count
+            totals["db_ms"] += stats.db_seconds * 1000
+            totals["max_queries"] = max(totals["max_queries"], stats.count)
+            totals["n_plus_one"] += 1 if repeated else 0
+            totals["over_budget"] += 1 if over_budget else 0
+            for fp, count in repeated:
+                finding = self._findings.get((route, fp))
+                if finding is None:
+                    if len(self._findings) >= self.max_findings:
+                        continue
+                    finding = self._findings[(route, fp)] = {
+                        "route": route, "statement": fp, "requests": 0, "max_repeats": 0,
+                    }
+                finding["requests"] += 1
+                finding["max_repeats"] = max(finding["max_repeats"], count)
+
+    def routes(self) -> List[dict]:
+        """Get per-route totals, most queries per request first."""
+        with self._lock:
+            rows = [
+                {
+                    "route": route,
+                    "requests": t["requests"],
+                    "avg_queries": round(t["queries"] / t["requests"], 2),
+                    "max_queries": t["max_queries"],
+                    "avg_db_ms": round(t["db_ms"] / t["requests"], 2),
+                    "budget": self.budget_for(route),
+                    "n_plus_one_requests": t["n_plus_one"],
+                    "over_budget_requests": t["over_budget"],
+                }
+                for route, t in self._routes.items()
+            ]
+        return sorted(rows, key=lambda row: -row["avg_queries"])
+
+    def findings(self) -> List[dict]:
+        """Get repeated-statement (N+1) findings, worst first."""
+        with self._lock:
+            return sorted(
+                (dict(f) for f in self._findings.values()), key=lambda f: -f["max_repeats"]
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._findings.clear()
+
+
+query_stats_registry = QueryStatsRegistry()
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware that collects query stats per request."""
+
+    def __init__(self, app: ASGIApp, registry: QueryStatsRegistry = query_stats_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                app_ms = (time.perf_counter() - stats.started) * 1000
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.count} queries", '
+                    f"app;dur={app_ms:.1f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+
+        self._finish(scope, stats)
+
+    def _finish(self, scope: Scope, stats: RequestQueryStats) -> None:
+        route = route_label(scope) if scope.get("route") is not None else UNMATCHED
+        repeated = stats.repeated(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+        for fp, count in repeated:
+            logger.warning("Possible N+1 in %s: %d executions of %s", route, count, fp[:200])
+
+        budget = self.registry.budget_for(route)
+        over_budget = bool(budget) and stats.count > budget
+        self.registry.record(route, stats, repeated, over_budget)
+        if over_budget:
+            logger.log(
+                logging.ERROR if settings.QUERY_BUDGET_ENFORCE else logging.WARNING,
+                "Query budget exceeded: %s ran %d queries (budget %d)",
+                route, stats.count, budget,
+            )
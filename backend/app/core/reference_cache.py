@@ -0,0 +1,320 @@
+"""Versioned cache of reference data (warehouses, units, consumable types).
+
+The dropdown lists are fetched by every form but change rarely. Each table
+has a version that increases on every write (``WarehouseService`` calls
+``reference_cache.invalidate`` after committing). The list is loaded once
+per version into an immutable snapshot holding the rows and the rendered
+response, so list requests are served from memory:
+
+- ``If-None-Match`` with the current ETag gets a 304 without any query
+- ``?since_version=N`` returns only the rows written (or ids deleted) since
+  version N, or the full list when the change log no longer reaches back
+  that far
+
+With several workers, writes are published on the invalidation bus and
+applied by every process. Versions are millisecond timestamps (at least
+the previous version + 1), so a ``since_version`` from one worker means
+the same moment on another; deltas repeat the changes of the last
+``VERSION_SKEW_MS`` before it to cover the workers' slightly different
+numbering of the same write. ETags are content hashes and need no such care.
+
+``reference_names`` keeps id -> name dictionaries of the same tables (and
+of users) for services that enrich rows with names. The dictionaries are
+copy-on-write: readers use the current dict without locking, and a write
+to a table makes the next reader build a patched copy (only the changed
+rows are queried) that replaces it. Copies are built without holding the
+lock (the query may yield to the event loop in async mode) and always read
+the primary, so a lagging replica cannot tag old names with a new version.
+"""
+
+import hashlib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Callable, Deque, Dict, List, Mapping, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import invalidation_bus
+from app.core.metrics import record_cache_lookup
+from app.core.serialization import dumps, success
+from app.models.user import User
+from app.models.warehouse import ConsumableType, Storehouse
+
+WAREHOUSES = "warehouses"
+UNITS = "units"
+CONSUMABLE_TYPES = "consumable_types"
+# Only versioned for reference_names (there is no cached user list)
+USERS = "users"
+
+# Changed row ids remembered per table for ?since_version= deltas
+CHANGE_LOG_SIZE = 256
+# Deltas also repeat the changes this much older than since_version
+VERSION_SKEW_MS = 5000
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """Rows of a reference table as of one version, with the rendered list response."""
+
+    version: int
+    rows: Tuple[dict, ...]
+    by_id: Dict[int, dict]
+    etag: str
+    body: bytes = field(repr=False)
+
+
+class ReferenceDataCache:
+    """Per-table versions, snapshots and change logs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Writes before this process started are unknown: older versions get full lists
+        self._started = _now_ms()
+        self._versions: Dict[str, int] = {}
+        self._snapshots: Dict[str, ReferenceSnapshot] = {}
+        # (version, row id) of recent writes, and the oldest version they cover
+        self._changes: Dict[str, Deque[Tuple[int, int]]] = {}
+        self._log_floor: Dict[str, int] = {}
+
+    def version(self, table: str) -> int:
+        """Current version of a table."""
+        return self._versions.get(table, self._started)
+
+    def invalidate(self, table: str, *row_ids: int) -> int:
+        """
+        Record a write to a table and drop its snapshot.
+
+        Args:
+            table: Table name (``WAREHOUSES``, ``UNITS``, ``CONSUMABLE_TYPES``)
+            row_ids: Ids of the rows written or deleted; without ids, clients
+                holding an older version get the full list
+
+        Returns:
+            The new version
+        """
+        version = self.apply(table, row_ids)
+        invalidation_bus.publish("reference", table=table, ids=list(row_ids), version=version)
+        return version
+
+    def apply(self, table: str, row_ids, version: int = 0) -> int:
+        """Record a write without publishing it (``version``: the writer's, if remote)."""
+        with self._lock:
+            current = self._versions.get(table, self._started)
+            version = max(current + 1, version or _now_ms())
+            self._versions[table] = version
+            self._snapshots.pop(table, None)
+            log = self._changes.setdefault(table, deque(maxlen=CHANGE_LOG_SIZE))
+            if not row_ids:
+                log.clear()
+                self._log_floor[table] = version
+                return version
+            for row_id in row_ids:
+                if len(log) == log.maxlen:
+                    # The oldest entry falls out: deltas from before it are incomplete
+                    self._log_floor[table] = log[0][0]
+                log.append((version, row_id))
+            return version
+
+    def snapshot(self, table: str) -> Optional[ReferenceSnapshot]:
+        """The snapshot of the current version, or None when it must be (re)loaded."""
+        snapshot = self._snapshots.get(table)
+        hit = snapshot is not None and snapshot.version == self.version(table)
+        record_cache_lookup(f"reference_{table}", hit)
+        return snapshot if hit else None
+
+    def load(
+        self, db: Session, table: str, loader: Callable[[Session], List[dict]]
+    ) -> ReferenceSnapshot:
+        """Load a table's rows with ``loader`` and store them as the current snapshot."""
+        # Tagged with the version seen before reading: a write committed
+        # meanwhile bumps the version, and this snapshot is reloaded on next use
+        version = self.version(table)
+        rows = tuple(loader(db))
+        body = dumps({"code": 0, "msg": "success", "data": rows})
+        snapshot = ReferenceSnapshot(
+            version=version,
+            rows=rows,
+            by_id={row["id"]: row for row in rows},
+            etag=f'"{hashlib.sha1(body, usedforsecurity=False).hexdigest()[:20]}"',
+            body=body,
+        )
+        with self._lock:
+            current = self._snapshots.get(table)
+            if current is None or current.version <= version:
+                self._snapshots[table] = snapshot
+        return snapshot
+
+    def changes_since(self, table: str, since: int) -> Optional[Tuple[List[int], int]]:
+        """
+        Ids written after version ``since``.
+
+        Returns:
+            (row ids, current version), or None when the change log does not
+            cover ``since`` (the client needs the full list)
+        """
+        with self._lock:
+            current = self._versions.get(table, self._started)
+            if since < self._log_floor.get(table, self._started):
+                return None
+            # A version from another worker may be ahead of this one's; that
+            # worker's writes not received yet cannot be served from here anyway
+            since -= VERSION_SKEW_MS
+            log = self._changes.get(table, ())
+            return list(dict.fromkeys(row_id for v, row_id in log if v > since)), current
+
+    def resync(self) -> None:
+        """Drop every snapshot and change log (after missed invalidations)."""
+        for table in (WAREHOUSES, UNITS, CONSUMABLE_TYPES, USERS):
+            self.apply(table, ())
+
+
+reference_cache = ReferenceDataCache()
+invalidation_bus.subscribe(
+    "reference",
+    lambda data: reference_cache.apply(data["table"], data["ids"], data["version"]),
+    resync=reference_cache.resync,
+)
+
+
+# table -> (id column, name column) of the id -> name dictionaries
+_NAME_COLUMNS = {
+    WAREHOUSES: (Storehouse.id, Storehouse.name),
+    CONSUMABLE_TYPES: (ConsumableType.id, ConsumableType.name),
+    USERS: (User.user_id, User.username),
+}
+
+
+class ReferenceNames:
+    """Copy-on-write id -> name dictionaries, kept current by ``reference_cache`` versions."""
+
+    def __init__(self, cache: ReferenceDataCache):
+        self._cache = cache
+        self._lock = threading.Lock()
+        # table -> (version, read-only dict)
+        self._maps: Dict[str, Tuple[int, Mapping[int, str]]] = {}
+
+    def load(self, db: Session) -> None:
+        """Load every dictionary (at startup, so requests find them ready)."""
+        for table in _NAME_COLUMNS:
+            self._swap(table, self._build(db, table, None))
+
+    def names(self, db: Session, table: str) -> Mapping[int, str]:
+        """
+        The id -> name dictionary of a table.
+
+        Queries the database only when the table was written since the
+        dictionary was built; the returned mapping never changes.
+        """
+        entry = self._maps.get(table)
+        hit = entry is not None and entry[0] == self._cache.version(table)
+        record_cache_lookup(f"names_{table}", hit)
+        if hit:
+            return entry[1]
+        # Concurrent readers may build the same copy; the newest one is kept
+        built = self._build(db, table, entry)
+        self._swap(table, built)
+        return built[1]
+
+    def name(self, db: Session, table: str, row_id: Optional[int]) -> Optional[str]:
+        """Name of one row (None for a missing id or row)."""
+        if row_id is None:
+            return None
+        return self.names(db, table).get(row_id)
+
+    def _swap(self, table: str, built: Tuple[int, Mapping[int, str]]) -> None:
+        with self._lock:
+            current = self._maps.get(table)
+            if current is None or current[0] < built[0]:
+                self._maps[table] = built
+
+    def _build(
+        self, db: Session, table: str, previous: Optional[Tuple[int, Mapping[int, str]]]
+    ) -> Tuple[int, Mapping[int, str]]:
+        id_column, name_column = _NAME_COLUMNS[table]
+        version = self._cache.version(table)
+        changes = None
+        if previous is not None:
+            changes = self._cache.changes_since(table, previous[0])
+        query = select(id_column, name_column)
+        primary = {"primary": True}
+        if changes is None:
+            mapping = dict(db.execute(query, bind_arguments=primary).all())
+        else:
+            # Copy and patch only the rows written since the previous build
+            ids = changes[0]
+            mapping = dict(previous[1])
+            for row_id in ids:
+                mapping.pop(row_id, None)
+            if ids:
+                rows = db.execute(query.where(id_column.in_(ids)), bind_arguments=primary)
+                mapping.update(rows.all())
+        return version, MappingProxyType(mapping)
+
+
+reference_names = ReferenceNames(reference_cache)
+
+
+def _if_none_match(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags or "*" in tags
+
+
+async def reference_list_response(
+    request: Request,
+    db,
+    table: str,
+    loader: Callable[[Session], List[dict]],
+    since_version: Optional[int] = None,
+) -> Response:
+    """
+    Serve a reference list from the cache.
+
+    The database is only queried when the table's snapshot is stale.
+    """
+    snapshot = reference_cache.snapshot(table)
+    if snapshot is None:
+        snapshot = await db.run(reference_cache.load, table, loader)
+    headers = {
+        "etag": snapshot.etag,
+        # Revalidate on every use; revalidation is a 304 served from memory
+        "cache-control": "private, no-cache",
+        "x-data-version": str(snapshot.version),
+    }
+
+    if since_version is None:
+        if _if_none_match(request, snapshot.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(snapshot.body, media_type="application/json", headers=headers)
+
+    changes = reference_cache.changes_since(table, since_version)
+    if changes is None or changes[1] != snapshot.version:
+        delta = {
+            "version": snapshot.version,
+            "full": True,
+            "upserts": list(snapshot.rows),
+            "deletes": [],
+        }
+    else:
+        ids, version = changes
+        delta = {
+            "version": version,
+            "full": False,
+            "upserts": [snapshot.by_id[i] for i in ids if i in snapshot.by_id],
+            "deletes": [i for i in ids if i not in snapshot.by_id],
+        }
+    response = success(delta)
+    response.headers["cache-control"] = "private, no-cache"
+    response.headers["x-data-version"] = str(delta["version"])
+    return response
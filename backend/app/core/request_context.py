@@ -0,0 +1,48 @@
+"""Request context helpers: route labels and the scope of the request being served."""
+
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+def route_label(scope: Scope) -> str:
+    """
+    Get a low-cardinality label for a request, e.g. ``GET /api/v1/stock/{stock_id}``.
+
+    Uses the matched route template once routing has run, so path
+    parameters do not produce one label per id. Falls back to the raw path
+    before routing (or for unmatched requests).
+    """
+    method = scope.get("method", scope.get("type", ""))
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        return f"{method} {scope.get('path', '')}"
+    return f"{method} {scope.get('root_path', '')}{path}"
+
+
+_current_scope: ContextVar[Optional[Scope]] = ContextVar("request_scope", default=None)
+
+
+def current_route() -> Optional[str]:
+    """Get the route label of the request being served (None outside requests)."""
+    scope = _current_scope.get()
+    return route_label(scope) if scope is not None else None
+
+
+class RequestContextMiddleware:
+    """ASGI middleware that makes the request scope available to lower layers."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
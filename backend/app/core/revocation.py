@@ -0,0 +1,163 @@
+"""Token revocation for stateless authentication.
+
+Stateless access tokens are validated without touching the database, so
+revocation is handled here instead:
+
+- Every token carries the user's token version (``ver`` claim). Bumping the
+  version (lock-out, password change, role change, deletion) invalidates all
+  tokens issued before the bump.
+- Individual tokens (``jti`` claim) can be denylisted until they expire, which
+  is what logout uses.
+
+Versions are millisecond timestamps rather than counters, so workers agree
+on them without coordination: bumps and denials are published on the
+invalidation bus, and a token issued by a worker that never saw a user's
+bump still carries a version later than the bump.
+
+The database stays the source of truth, so revocations survive restarts
+and reach workers started later: bumps are saved in ``User.token_version``
+and denials in ``revoked_tokens``. A process checks a user's saved version
+the first time it sees one of their tokens (a missing user has no valid
+tokens), and loads the denylist at startup and after missed messages.
+"""
+
+import calendar
+import threading
+import time
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import invalidation_bus
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+class TokenRevocationRegistry:
+    """Thread-safe per-user token versions and a small jti denylist."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[int, int] = {}
+        self._denied: Dict[str, float] = {}
+
+    def current_version(self, user_id: int) -> int:
+        """Get the minimum token version accepted for a user."""
+        return self._versions.get(user_id, 0)
+
+    def issue_version(self, user_id: int) -> int:
+        """Get the version to put in a new token of a user."""
+        return max(self._versions.get(user_id, 0), _now_ms())
+
+    def bump(self, user_id: int) -> int:
+        """Invalidate all existing tokens of a user and return the new version."""
+        with self._lock:
+            version = max(self._versions.get(user_id, 0), _now_ms()) + 1
+            self._versions[user_id] = version
+        invalidation_bus.publish("tokens.version", user_id=user_id, version=version)
+        return version
+
+    def apply_version(self, user_id: int, version: int) -> None:
+        """Apply a bump made by another process."""
+        with self._lock:
+            if version > self._versions.get(user_id, 0):
+                self._versions[user_id] = version
+
+    def is_known(self, user_id: int) -> bool:
+        """Check whether a user's version was loaded (or bumped) in this process."""
+        return user_id in self._versions
+
+    def load_version(self, db: Session, user_id: int) -> bool:
+        """
+        Load a user's saved token version.
+
+        Returns:
+            False when the user does not exist (their tokens are invalid)
+        """
+        from app.models.user import User
+
+        version = db.execute(
+            select(User.token_version).where(User.user_id == user_id)
+        ).scalar_one_or_none()
+        if version is None:
+            return False
+        self.remember(user_id, version)
+        return True
+
+    def remember(self, user_id: int, version: int) -> None:
+        """Record a user's saved token version (read from their row)."""
+        with self._lock:
+            self._versions[user_id] = max(self._versions.get(user_id, 0), version)
+
+    def is_valid_version(self, user_id: int, version: int) -> bool:
+        """
+        Check whether a token version is still accepted for a user.
+
+        Tokens of users whose version is not loaded yet are not accepted.
+        """
+        current = self._versions.get(user_id)
+        return current is not None and version >= current
+
+    def deny(self, jti: str, expires_at: float) -> None:
+        """Denylist a single token until its expiry (unix timestamp)."""
+        self.apply_deny(jti, expires_at)
+        invalidation_bus.publish("tokens.deny", jti=jti, expires_at=expires_at)
+
+    def apply_deny(self, jti: str, expires_at: float) -> None:
+        """Apply a denylisting made by another process."""
+        with self._lock:
+            self._purge_expired()
+            self._denied[jti] = expires_at
+
+    def is_denied(self, jti: str) -> bool:
+        """Check whether a token id has been denylisted."""
+        return jti in self._denied
+
+    def load_denylist(self, db: Session) -> None:
+        """Load the saved denials of tokens that have not expired yet."""
+        from app.models.user import RevokedToken
+
+        rows = db.execute(
+            select(RevokedToken.jti, RevokedToken.expire_time).where(
+                RevokedToken.expire_time > datetime.utcnow()
+            )
+        ).all()
+        with self._lock:
+            for jti, expire_time in rows:
+                self._denied[jti] = float(calendar.timegm(expire_time.timetuple()))
+
+    def clear(self) -> None:
+        """Drop all revocation state."""
+        with self._lock:
+            self._versions.clear()
+            self._denied.clear()
+
+    def resync(self) -> None:
+        """Reload from the database after missed messages (versions lazily)."""
+        from app.database import SessionLocal
+
+        with self._lock:
+            self._versions.clear()
+        with SessionLocal() as db:
+            self.load_denylist(db)
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        expired = [jti for jti, exp in self._denied.items() if exp <= now]
+        for jti in expired:
+            del self._denied[jti]
+
+
+token_registry = TokenRevocationRegistry()
+invalidation_bus.subscribe(
+    "tokens.version",
+    lambda data: token_registry.apply_version(data["user_id"], data["version"]),
+    resync=token_registry.resync,
+)
+invalidation_bus.subscribe(
+    "tokens.deny", lambda data: token_registry.apply_deny(data["jti"], data["expires_at"])
+)
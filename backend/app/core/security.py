@@ -1,32 +1,52 @@
 """Security utilities for authentication and authorization."""
 
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import get_db
+from app.database import current_user_id, get_db
+from app.core.revocation import token_registry
+
+
+@lru_cache()
+def get_pwd_context():
+    """Get the password hashing context (passlib is imported on first use)."""
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+    )
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/login")
 
 
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user built from access token claims (no database row)."""
+
+    user_id: int
+    username: str
+    status: str
+    roles: Tuple[str, ...] = ()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -40,6 +60,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         Encoded JWT token
     """
+    # jose (and its crypto backend) is imported on first use, not at startup
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -52,6 +75,35 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def build_token_claims(user, roles: List[str], device_id: Optional[str] = None) -> dict:
+    """
+    Build the access token claims for a user.
+
+    The claims carry everything needed to build a ``Principal`` so that
+    authenticated requests don't have to load the user row.
+
+    Args:
+        user: User model instance
+        roles: User's role names
+        device_id: Device session the token belongs to, if any
+
+    Returns:
+        Claims to pass to ``create_access_token``
+    """
+    token_registry.remember(user.user_id, user.token_version or 0)
+    claims = {
+        "sub": user.username,
+        "uid": user.user_id,
+        "st": user.status,
+        "roles": list(roles),
+        "ver": token_registry.issue_version(user.user_id),
+        "jti": uuid.uuid4().hex,
+    }
+    if device_id:
+        claims["did"] = device_id
+    return claims
+
+
 def decode_token(token: str) -> Optional[dict]:
     """
     Decode and validate a JWT token.
@@ -62,6 +114,8 @@ def decode_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token payload or None if invalid
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
@@ -76,12 +130,16 @@ async def get_current_user(
     """
     Get the current authenticated user from the JWT token.
 
+    With ``AUTH_STATELESS`` enabled, tokens issued with ``build_token_claims``
+    resolve to a ``Principal`` without querying the database. Other tokens fall
+    back to loading the ``User`` row by username.
+
     Args:
         token: JWT token from the Authorization header
         db: Database session
 
     Returns:
-        User object
+        Principal or User object
 
     Raises:
         HTTPException: If authentication fails
@@ -95,6 +153,25 @@ async def get_current_user(
     if payload is None:
         raise credentials_exception
 
+    jti = payload.get("jti")
+    if jti and token_registry.is_denied(jti):
+        raise credentials_exception
+
+    user_id = payload.get("uid")
+    if user_id is not None:
+        if not token_registry.is_known(user_id) and not token_registry.load_version(db, user_id):
+            raise credentials_exception
+        if not token_registry.is_valid_version(user_id, payload.get("ver", 0)):
+            raise credentials_exception
+        current_user_id.set(user_id)
+        if settings.AUTH_STATELESS:
+            return Principal(
+                user_id=user_id,
+                username=payload.get("sub"),
+                status=payload.get("st", "1"),
+                roles=tuple(payload.get("roles", ())),
+            )
+
     username: str = payload.get("sub")
     if username is None:
         raise credentials_exception
@@ -105,6 +182,7 @@ async def get_current_user(
     user = db.query(User).filter(User.username == username).first()
     if user is None:
         raise credentials_exception
+    current_user_id.set(user.user_id)
     return user
 
 
@@ -0,0 +1,62 @@
+"""JSON serialization for API responses.
+
+Responses are rendered with orjson. Routers pass ``datetime`` and ``Decimal``
+values through unchanged: the serializer writes datetimes in the API's
+``YYYY-MM-DD HH:MM:SS`` format and Decimals as numbers. Endpoints returning
+``success(...)`` get a ready response object, which also skips FastAPI's
+response_model validation and ``jsonable_encoder`` pass.
+"""
+
+import datetime
+from decimal import Decimal
+from typing import Any, List
+
+import orjson
+from fastapi.responses import JSONResponse
+
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+_UNSET: Any = object()
+
+
+def _default(value: Any) -> Any:
+    """Convert the types orjson is told to pass through (or cannot handle)."""
+    if isinstance(value, datetime.datetime):
+        # Same text as strftime("%Y-%m-%d %H:%M:%S"), several times faster
+        return value.replace(tzinfo=None).isoformat(" ", "seconds")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` to JSON bytes."""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (the app's default response class)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def success(data: Any = _UNSET, msg: str = "success") -> FastJSONResponse:
+    """Build the standard ``{"code": 0, "msg": ..., "data": ...}`` response."""
+    content = {"code": 0, "msg": msg}
+    if data is not _UNSET:
+        content["data"] = data
+    return FastJSONResponse(content)
+
+
+def paginated(records: List[Any], total: int, current: int, size: int) -> dict:
+    """Build the ``data`` payload of a paginated list."""
+    return {
+        "records": records,
+        "total": total,
+        "size": size,
+        "current": current,
+        "pages": (total + size - 1) // size,
+    }
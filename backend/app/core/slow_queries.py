@@ -0,0 +1,175 @@
+"""Slow-query log with automatic EXPLAIN capture.
+
+Every statement slower than ``SLOW_QUERY_MS`` is recorded in a ring buffer
+with its SQL, the shape of its bound parameters (types, not values), the
+route being served and the service method that issued it. The first time a
+fingerprint is seen its plan is captured in the background with
+``EXPLAIN QUERY PLAN`` (SQLite) or ``EXPLAIN`` (PostgreSQL, without
+ANALYZE, so the statement is not executed again).
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.core.query_stats import fingerprint
+from app.core.request_context import current_route
+
+logger = logging.getLogger(__name__)
+
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Describe bound parameters by type only (values may be personal data)."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameter_shape(parameters[0]) if parameters else None
+        return {"rows": len(parameters), "row": first}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def find_caller(skip_modules: tuple = ("app.services.",)) -> Optional[str]:
+    """Get ``Class.method`` of the innermost service frame on the current stack."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(skip_modules):
+            return f"{module.rsplit('.', 1)[-1]}:{frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    """Ring buffer of slow statements plus one captured plan per fingerprint."""
+
+    def __init__(self, threshold_ms: float, size: int, explain: bool = True):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self._entries: deque = deque(maxlen=size)
+        self._plans: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def record(self, conn, statement: str, parameters: Any, executemany: bool, seconds: float) -> None:
+        """Add a slow statement to the log and schedule its EXPLAIN if new."""
+        fp = fingerprint(statement)
+        entry = {
+            "time": time.time(),
+            "duration_ms": round(seconds * 1000, 2),
+            "statement": statement,
+            "fingerprint": fp,
+            "parameters": parameter_shape(parameters, executemany),
+            "route": current_route(),
+            "caller": find_caller(),
+            "database": conn.engine.url.render_as_string(hide_password=True),
+        }
+        with self._lock:
+            self._entries.append(entry)
+            new_plan = fp not in self._plans
+            if new_plan:
+                self._plans[fp] = {"status": "pending", "plan": None}
+        logger.warning(
+            "Slow query (%.1f ms) in %s from %s: %s",
+            entry["duration_ms"], entry["route"], entry["caller"], statement[:300],
+        )
+        if new_plan:
+            if self.explain and statement.lstrip().upper().startswith(_EXPLAINABLE):
+                self._get_executor().submit(self._explain, conn.engine, fp, statement, parameters)
+            else:
+                self._plans[fp] = {"status": "skipped", "plan": None}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="slow-query-explain"
+                    )
+        return self._executor
+
+    def _explain(self, engine: Engine, fp: str, statement: str, parameters: Any) -> None:
+        # Plans are captured on a separate connection so the request's
+        # connection and transaction are never touched
+        if engine.dialect.is_async:
+            from app.database import engine as sync_engine
+
+            if sync_engine.dialect.paramstyle != engine.dialect.paramstyle:
+                self._plans[fp] = {"status": "skipped", "plan": None}
+                return
+            engine = sync_engine
+
+        if engine.dialect.name == "sqlite":
+            sql = f"EXPLAIN QUERY PLAN {statement}"
+        else:
+            sql = f"EXPLAIN {statement}"
+
+        self._local.explaining = True
+        try:
+            with engine.connect() as conn:
+                rows = conn.exec_driver_sql(sql, parameters or ()).all()
+                conn.rollback()
+            plan = [" | ".join(str(col) for col in row) for row in rows]
+            self._plans[fp] = {"status": "done", "plan": plan}
+        except Exception as exc:
+            self._plans[fp] = {"status": "failed", "plan": None, "error": str(exc)[:300]}
+        finally:
+            self._local.explaining = False
+
+    def is_explaining(self) -> bool:
+        return getattr(self._local, "explaining", False)
+
+    def entries(self, limit: int = 50) -> List[dict]:
+        """Get the most recent slow statements (newest first) with their plans."""
+        with self._lock:
+            entries = list(self._entries)[-limit:][::-1]
+        return [{**entry, "explain": self._plans.get(entry["fingerprint"])} for entry in entries]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_MS,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and slow_query_log.enabled:
+        context._slow_query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_slow_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    if elapsed >= slow_query_log.threshold and not slow_query_log.is_explaining():
+        slow_query_log.record(conn, statement, parameters, executemany, elapsed)
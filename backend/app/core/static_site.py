@@ -0,0 +1,164 @@
+"""Serving the built frontend (``frontend/dist``).
+
+``StaticSite`` indexes the dist directory once at startup: every file gets a
+manifest entry with its headers precomputed, small files (``index.html``,
+icons, most chunks) are kept in memory, and the ``.br``/``.gz`` variants
+written by the frontend build are attached to the file they compress.
+Requests are answered from the manifest alone: no path resolution or
+``stat`` per request, and since only indexed paths are served, no path
+can escape the directory. Unknown paths get ``index.html`` for client-side
+routing, except under ``assets/`` where a missing file is a real 404.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.compression import HASHED_ASSET, IMMUTABLE, negotiate
+
+_VARIANT_SUFFIXES = {".br": "br", ".gz": "gzip"}
+
+
+@dataclass(frozen=True)
+class StaticFile:
+    """A manifest entry: one file (or precompressed variant) and its headers."""
+
+    path: str
+    media_type: str
+    etag: str
+    stat: os.stat_result
+    headers: Dict[str, str]
+    # Contents, for files small enough to keep in memory
+    body: Optional[bytes] = None
+    # encoding -> precompressed variant of this file
+    variants: Dict[str, "StaticFile"] = field(default_factory=dict)
+
+
+def _load(path: Path, media_type: str, cache_control: str, memory_max_size: int) -> StaticFile:
+    stat = path.stat()
+    body = None
+    if stat.st_size <= memory_max_size:
+        body = path.read_bytes()
+        etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+    else:
+        etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat.st_mtime, usegmt=True),
+        "cache-control": cache_control,
+    }
+    return StaticFile(str(path), media_type, etag, stat, headers, body)
+
+
+def build_manifest(directory: Path, memory_max_size: int = 256 * 1024) -> Dict[str, StaticFile]:
+    """Index ``directory``: URL path (relative, '/'-separated) -> StaticFile."""
+    directory = directory.resolve()
+    files = {}
+    variants = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = Path(root) / name
+            url = path.relative_to(directory).as_posix()
+            base, suffix = os.path.splitext(url)
+            if suffix in _VARIANT_SUFFIXES and (Path(root) / os.path.basename(base)).is_file():
+                variants.append((base, _VARIANT_SUFFIXES[suffix], path))
+                continue
+            if HASHED_ASSET.search(name):
+                cache_control = IMMUTABLE
+            else:
+                # Revalidate (cheap: ETag/304) so a new build shows up at once
+                cache_control = "no-cache"
+            media_type = guess_type(name)[0] or "application/octet-stream"
+            files[url] = _load(path, media_type, cache_control, memory_max_size)
+
+    # brotli first: negotiate() prefers earlier encodings on equal q-values
+    for url, encoding, path in sorted(variants, key=lambda v: v[1] != "br"):
+        original = files[url]
+        variant = _load(path, original.media_type, original.headers["cache-control"],
+                        memory_max_size)
+        variant.headers.update({"content-encoding": encoding, "vary": "Accept-Encoding"})
+        original.variants[encoding] = variant
+        original.headers["vary"] = "Accept-Encoding"
+    return files
+
+
+def _is_not_modified(entry: StaticFile, request_headers: Headers) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return entry.etag in tags or "*" in tags
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+            return int(entry.stat.st_mtime) <= since
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class StaticSite:
+    """ASGI app serving a single-page application's build from its manifest."""
+
+    def __init__(self, directory: Path, memory_max_size: int = 256 * 1024):
+        self.directory = Path(directory)
+        self.files = build_manifest(self.directory, memory_max_size)
+        self.index = self.files["index.html"]
+
+    def lookup(self, path: str) -> Optional[StaticFile]:
+        """Manifest entry for a request path (index.html for client-side routes)."""
+        path = path.lstrip("/")
+        entry = self.files.get(path)
+        if entry is None and not path.startswith("assets/"):
+            entry = self.index
+        return entry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse(
+                "Method Not Allowed", status_code=405, headers={"allow": "GET, HEAD"}
+            )
+            await response(scope, receive, send)
+            return
+
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        entry = self.lookup(path)
+        if entry is None:
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        if entry.variants:
+            accept = request_headers.get("accept-encoding", "")
+            encoding = negotiate(accept, tuple(entry.variants)) if accept else None
+            if encoding is not None:
+                entry = entry.variants[encoding]
+
+        if _is_not_modified(entry, request_headers):
+            response = Response(status_code=304, headers={
+                name: value for name, value in entry.headers.items()
+                if name in ("etag", "cache-control", "vary", "last-modified")
+            })
+        elif entry.body is not None:
+            response = Response(entry.body, headers=entry.headers, media_type=entry.media_type)
+        else:
+            # Streamed in chunks; the stored stat spares a stat() per request
+            response = FileResponse(
+                entry.path,
+                headers=entry.headers,
+                media_type=entry.media_type,
+                stat_result=entry.stat,
+            )
+            response.headers["etag"] = entry.etag
+        await response(scope, receive, send)
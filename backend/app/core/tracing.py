@@ -0,0 +1,294 @@
+"""Lightweight request tracing (route → service method → SQL).
+
+``TracingMiddleware`` gives every request a trace ID (taken from the
+``X-Trace-Id`` request header when present) and returns it in the same
+response header. A fraction of requests (``TRACE_SAMPLE_RATE``, or any
+request sent with ``X-Trace-Sample: 1`` by a user with ``system:monitor``)
+is recorded as a tree of spans:
+
+* the route itself;
+* every service call made through ``DatabaseRunner.run`` and functions
+  decorated with ``@traced``;
+* blocks wrapped in ``with span("..."):``;
+* every SQL statement, with its duration.
+
+Finished traces are kept in memory for ``/system/traces`` and, when
+``TRACE_JSONL_PATH`` is set, appended to that file as one JSON object per
+line by a background thread (never on the event loop). Unsampled requests
+only pay for a context variable lookup per hook.
+"""
+
+import functools
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.request_context import route_label
+
+logger = logging.getLogger(__name__)
+
+TRACE_ID_HEADER = "X-Trace-Id"
+TRACE_SAMPLE_HEADER = "X-Trace-Sample"
+_VALID_TRACE_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class Trace:
+    """Spans recorded for one request."""
+
+    def __init__(self, trace_id: str, max_spans: int):
+        self.trace_id = trace_id
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.max_spans = max_spans
+        self.spans: List[dict] = []
+        self.dropped = 0
+
+    def start_span(self, name: str, kind: str, parent: Optional[int], attrs: dict) -> Optional[dict]:
+        if len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return None
+        span = {
+            "id": len(self.spans),
+            "parent": parent,
+            "name": name,
+            "kind": kind,
+            "start_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "duration_ms": None,
+            "attrs": attrs,
+            "_t0": time.perf_counter(),
+        }
+        self.spans.append(span)
+        return span
+
+    @staticmethod
+    def end_span(span: dict) -> None:
+        span["duration_ms"] = round((time.perf_counter() - span.pop("_t0")) * 1000, 3)
+
+    def to_dict(self) -> dict:
+        root = self.spans[0] if self.spans else {}
+        return {
+            "trace_id": self.trace_id,
+            "time": self.started_at,
+            "name": root.get("name"),
+            "duration_ms": root.get("duration_ms"),
+            "status": root.get("attrs", {}).get("status"),
+            "span_count": len(self.spans),
+            "dropped_spans": self.dropped,
+            "spans": self.spans,
+        }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("trace_span", default=None)
+
+
+def current_trace_id() -> Optional[str]:
+    """Get the trace ID of the request being traced, if it is sampled."""
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attrs: Any) -> Iterator[Optional[dict]]:
+    """Record a block as a span of the current trace (no-op when not sampled)."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    current = trace.start_span(name, kind, _current_span.get(), attrs)
+    if current is None:
+        yield None
+        return
+    token = _current_span.set(current["id"])
+    try:
+        yield current
+    except Exception as exc:
+        current["attrs"]["error"] = repr(exc)[:200]
+        raise
+    finally:
+        _current_span.reset(token)
+        trace.end_span(current)
+
+
+def traced(fn: Optional[Callable] = None, *, name: Optional[str] = None, kind: str = "service"):
+    """Decorator recording each call of a function as a span."""
+
+    def decorate(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate(fn) if fn is not None else decorate
+
+
+class TraceStore:
+    """Recent finished traces in memory, optionally mirrored to a JSONL file."""
+
+    def __init__(self, size: int, jsonl_path: str = ""):
+        self.size = size
+        self.jsonl_path = jsonl_path
+        self._traces: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._outbox: "queue.SimpleQueue[Optional[dict]]" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+
+    def add(self, trace: Trace) -> None:
+        data = trace.to_dict()
+        with self._lock:
+            self._traces[trace.trace_id] = data
+            while len(self._traces) > self.size:
+                self._traces.popitem(last=False)
+            if self.jsonl_path and self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write, name="trace-writer", daemon=True
+                )
+                self._writer.start()
+        if self.jsonl_path:
+            self._outbox.put(data)
+
+    def stop(self) -> None:
+        """Write the queued traces and stop the writer thread."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._outbox.put(None)
+            writer.join(timeout=5)
+
+    def _write(self) -> None:
+        while True:
+            batch = [self._outbox.get()]
+            while batch[-1] is not None:
+                try:
+                    batch.append(self._outbox.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [
+                json.dumps(data, default=str, ensure_ascii=False) + "\n"
+                for data in batch if data is not None
+            ]
+            try:
+                with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+            except OSError as exc:
+                logger.warning("Trace file %s not writable (%s)", self.jsonl_path, exc)
+            if batch[-1] is None:
+                return
+
+    def list(self, limit: int = 50, min_duration_ms: float = 0) -> List[dict]:
+        """Get trace summaries, newest first."""
+        with self._lock:
+            traces = list(self._traces.values())
+        summaries = [
+            {key: value for key, value in t.items() if key != "spans"}
+            for t in reversed(traces)
+            if (t["duration_ms"] or 0) >= min_duration_ms
+        ]
+        return summaries[:limit]
+
+    def get(self, trace_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._traces.get(trace_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+
+trace_store = TraceStore(settings.TRACE_BUFFER_SIZE, settings.TRACE_JSONL_PATH)
+
+
+class TracingMiddleware:
+    """ASGI middleware that assigns trace IDs and records sampled requests."""
+
+    def __init__(self, app: ASGIApp, store: TraceStore = trace_store):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        trace_id = headers.get(TRACE_ID_HEADER.lower().encode(), b"").decode("latin-1")
+        if not _VALID_TRACE_ID.match(trace_id):
+            trace_id = uuid.uuid4().hex
+        sampled = random.random() < settings.TRACE_SAMPLE_RATE
+        if not sampled and headers.get(TRACE_SAMPLE_HEADER.lower().encode()) == b"1":
+            from app.core.permissions import bearer_has_perm
+
+            # Only monitors may force traces: anyone else could fill the buffer
+            sampled = bearer_has_perm(headers, "system:monitor")
+
+        async def send_with_trace_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(TRACE_ID_HEADER, trace_id)
+                if root is not None:
+                    root["attrs"]["status"] = message["status"]
+            await send(message)
+
+        if not sampled:
+            root = None
+            await self.app(scope, receive, send_with_trace_id)
+            return
+
+        trace = Trace(trace_id, settings.TRACE_MAX_SPANS)
+        trace_token = _current_trace.set(trace)
+        root = trace.start_span(scope["path"], "route", None, {"method": scope["method"]})
+        span_token = _current_span.set(root["id"])
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            root["name"] = route_label(scope)
+            trace.end_span(root)
+            self.store.add(trace)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _current_trace.get()
+    if trace is not None and context is not None:
+        context._trace_span = trace.start_span(
+            "sql", "db", _current_span.get(), {"statement": statement[:500]}
+        )
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    current = getattr(context, "_trace_span", None)
+    if current is not None:
+        Trace.end_span(current)
+        context._trace_span = None
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    current = getattr(exception_context.execution_context, "_trace_span", None)
+    if current is not None:
+        current["attrs"]["error"] = repr(exception_context.original_exception)[:200]
+        Trace.end_span(current)
+        exception_context.execution_context._trace_span = None
@@ -1,28 +1,297 @@
 """Database configuration and session management."""
 
-from typing import Generator
+import abc
+import ast
+import asyncio
+import itertools
+import re
+import threading
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, List, Optional, TypeVar
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
-from app.config import settings
+from app.config import settings, to_async_url
 
-# Create database engine with proper settings for SQLite vs PostgreSQL
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args={"check_same_thread": False},
+T = TypeVar("T")
+
+
+def is_sqlite() -> bool:
+    """Whether the configured database is SQLite."""
+    return settings.DATABASE_URL.startswith("sqlite")
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply the SQLite connection profile to a new DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        # WAL lets readers run alongside the single writer; NORMAL sync is
+        # durable across application crashes in WAL mode (only an OS crash
+        # can lose the last transactions)
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute(f"PRAGMA foreign_keys={'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}")
+    finally:
+        cursor.close()
+
+
+def _create_sync_engine(url: str) -> Engine:
+    """Create an engine with proper settings for SQLite vs PostgreSQL."""
+    if url.startswith("sqlite"):
+        sync_engine = create_engine(url, connect_args={"check_same_thread": False})
+        if settings.SQLITE_TUNED:
+            event.listen(sync_engine, "connect", _apply_sqlite_pragmas)
+        return sync_engine
+    return create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
     )
-else:
-    engine = create_engine(
-        settings.DATABASE_URL,
+
+
+def _create_async_engine(url: str):
+    """
+    Create an async engine for a (sync) database URL.
+
+    Requires ``aiosqlite`` for SQLite or ``asyncpg`` for PostgreSQL.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    if url.startswith("sqlite"):
+        async_engine = create_async_engine(to_async_url(url))
+        if settings.SQLITE_TUNED:
+            event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        return async_engine
+    return create_async_engine(
+        to_async_url(url),
         pool_pre_ping=True,
         pool_size=10,
         max_overflow=20,
     )
 
+
+# Create the primary database engine
+engine = _create_sync_engine(settings.DATABASE_URL)
+
+# User ID of the authenticated request (set by get_current_user), used for
+# read-your-writes routing
+current_user_id: ContextVar[Optional[int]] = ContextVar("current_user_id", default=None)
+
+
+class ReplicaRouter:
+    """
+    Round-robin selection of healthy read replicas.
+
+    Replicas are marked unhealthy on connection errors and by a periodic
+    ``SELECT 1`` check, and come back once the check passes again. A user
+    who committed a write reads from the primary for
+    ``REPLICA_STICKY_SECONDS`` so they see their own changes despite
+    replication lag.
+    """
+
+    def __init__(self, urls: List[str], sticky_seconds: float, check_interval: float):
+        self.urls = list(urls)
+        self.engines = [_create_sync_engine(url) for url in self.urls]
+        self.sticky_seconds = sticky_seconds
+        self.check_interval = check_interval
+        self._async_engines: Dict[int, Any] = {}
+        self._healthy = [True] * len(self.engines)
+        self._reads = [0] * len(self.engines)
+        self._primary_reads = 0
+        self._sticky: Dict[int, float] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._checker: Optional[threading.Thread] = None
+        for index, replica in enumerate(self.engines):
+            event.listen(replica, "handle_error", self._error_listener(index))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def _error_listener(self, index: int):
+        def on_error(context) -> None:
+            if context.is_disconnect or context.connection is None:
+                self._healthy[index] = False
+        return on_error
+
+    def mark_write(self, user_id: Optional[int]) -> None:
+        """Keep a user's reads on the primary for the stickiness window (in every worker)."""
+        if self.enabled and user_id is not None:
+            from app.core.invalidation import invalidation_bus
+
+            self.apply_write(user_id)
+            invalidation_bus.publish("replica.sticky", user_id=user_id)
+
+    def apply_write(self, user_id: int) -> None:
+        """Start a user's stickiness window without publishing it."""
+        self._sticky[user_id] = time.monotonic() + self.sticky_seconds
+
+    def _apply_remote_write(self, data: dict) -> None:
+        self.apply_write(data["user_id"])
+
+    def is_sticky(self, user_id: Optional[int]) -> bool:
+        if user_id is None:
+            return False
+        until = self._sticky.get(user_id)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._sticky.pop(user_id, None)
+            return False
+        return True
+
+    def bind_for_read(self, user_id: Optional[int], use_async: bool = False) -> Optional[Engine]:
+        """
+        Choose the engine for a read-only session.
+
+        Returns:
+            A replica engine (the sync side of its async engine when
+            ``use_async``), or None to read from the primary
+        """
+        index = None
+        if self.enabled and not self.is_sticky(user_id):
+            healthy = [i for i, ok in enumerate(self._healthy) if ok]
+            if healthy:
+                index = healthy[next(self._counter) % len(healthy)]
+        with self._lock:
+            if index is None:
+                self._primary_reads += 1
+                return None
+            self._reads[index] += 1
+        if use_async:
+            return self._get_async_engine(index).sync_engine
+        return self.engines[index]
+
+    def _get_async_engine(self, index: int):
+        with self._lock:
+            if index not in self._async_engines:
+                async_engine = _create_async_engine(self.urls[index])
+                event.listen(async_engine.sync_engine, "handle_error", self._error_listener(index))
+                self._async_engines[index] = async_engine
+            return self._async_engines[index]
+
+    def check_health(self) -> List[bool]:
+        """Ping every replica and update its health."""
+        for index, replica in enumerate(self.engines):
+            try:
+                with replica.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                self._healthy[index] = True
+            except Exception:
+                self._healthy[index] = False
+        return list(self._healthy)
+
+    def start(self) -> None:
+        """Start the background health checks and follow other workers' stickiness."""
+        if not self.enabled or self._checker is not None:
+            return
+        from app.core.invalidation import invalidation_bus
+
+        invalidation_bus.subscribe("replica.sticky", self._apply_remote_write)
+        self._stopping.clear()
+        self.check_health()
+
+        def run() -> None:
+            while not self._stopping.wait(self.check_interval):
+                self.check_health()
+
+        self._checker = threading.Thread(target=run, name="replica-health", daemon=True)
+        self._checker.start()
+
+    def stop(self) -> None:
+        """Stop the health checks and close replica connections."""
+        self._stopping.set()
+        if self._checker is not None:
+            self._checker.join(timeout=1)
+            self._checker = None
+        for replica in self.engines:
+            replica.dispose()
+
+    def stats(self) -> dict:
+        """Get replica health and read routing counters."""
+        with self._lock:
+            return {
+                "replicas": [
+                    {
+                        "url": replica.url.render_as_string(hide_password=True),
+                        "healthy": self._healthy[index],
+                        "reads": self._reads[index],
+                    }
+                    for index, replica in enumerate(self.engines)
+                ],
+                "primary_reads": self._primary_reads,
+                "sticky_users": sum(1 for until in self._sticky.values() if until > time.monotonic()),
+            }
+
+
+replica_router = ReplicaRouter(
+    settings.DATABASE_REPLICA_URLS,
+    sticky_seconds=settings.REPLICA_STICKY_SECONDS,
+    check_interval=settings.REPLICA_HEALTH_CHECK_SECONDS,
+)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends read-only scopes to a replica.
+
+    Sessions opened with ``info={"read_only": True}`` pick a replica on their
+    first query and keep it for their lifetime. Flushes, DML statements and
+    statements executed with ``bind_arguments={"primary": True}`` always go
+    to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, primary=False, **kw):
+        if (
+            self.info.get("read_only")
+            and not primary
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+        ):
+            if "replica" not in self.info:
+                self.info["replica"] = replica_router.bind_for_read(
+                    current_user_id.get(), self.info.get("async", False)
+                )
+            if self.info["replica"] is not None:
+                return self.info["replica"]
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _record_flush(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _record_bulk_write(orm_execute_state) -> None:
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_commit(session) -> None:
+    if session.info.pop("wrote", False):
+        replica_router.mark_write(current_user_id.get())
+
+
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, class_=RoutingSession
+)
 
 # Create declarative base for models
 Base = declarative_base()
@@ -40,3 +309,188 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+@lru_cache()
+def get_async_engine():
+    """Get the async engine for ``DATABASE_URL`` (created on first use)."""
+    return _create_async_engine(settings.DATABASE_URL)
+
+
+@lru_cache()
+def get_async_sessionmaker():
+    """Get the async session factory bound to the async engine."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    # Handlers read attributes after commit outside the greenlet bridge, so
+    # instances must not be expired (an expired attribute would need IO)
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+    )
+
+
+def optimize_sqlite(analyze: bool = False) -> None:
+    """
+    Refresh SQLite query planner statistics.
+
+    Args:
+        analyze: Run a full ``ANALYZE`` instead of ``PRAGMA optimize``, which
+            only re-analyzes tables whose statistics look stale
+    """
+    if not is_sqlite():
+        return
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE" if analyze else "PRAGMA optimize"))
+        conn.commit()
+
+
+def sqlite_has_statistics() -> bool:
+    """Whether ``ANALYZE`` has ever been run on the SQLite database."""
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        ).first() is not None
+
+
+async def run_sqlite_maintenance() -> None:
+    """Run ``PRAGMA optimize`` every ``SQLITE_OPTIMIZE_INTERVAL_MINUTES`` (until cancelled)."""
+    interval = settings.SQLITE_OPTIMIZE_INTERVAL_MINUTES * 60
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(optimize_sqlite)
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+_REVISION_ASSIGNMENT = re.compile(r"^(revision|down_revision)\b[^=\n]*=\s*(.+)$", re.MULTILINE)
+
+
+class SchemaOutOfDate(RuntimeError):
+    """Raised at startup when the database is not at the latest migration."""
+
+
+def migration_heads(versions_dir: Path = MIGRATIONS_DIR) -> set:
+    """
+    Get the head revisions of the Alembic migration scripts.
+
+    Reads the ``revision``/``down_revision`` assignments from the files
+    instead of importing Alembic and loading every script.
+    """
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        values = dict(_REVISION_ASSIGNMENT.findall(path.read_text(encoding="utf-8")))
+        if "revision" not in values:
+            continue
+        revisions.add(ast.literal_eval(values["revision"]))
+        down_revision = ast.literal_eval(values.get("down_revision", "None"))
+        if isinstance(down_revision, str):
+            parents.add(down_revision)
+        elif down_revision:
+            parents.update(down_revision)
+    return revisions - parents
+
+
+def check_schema_revision() -> None:
+    """
+    Check that the database has been migrated to the latest revision.
+
+    Raises:
+        SchemaOutOfDate: If ``alembic_version`` is missing or not at the head
+    """
+    heads = migration_heads()
+    try:
+        with engine.connect() as conn:
+            current = {row[0] for row in conn.execute(text("SELECT version_num FROM alembic_version"))}
+    except DBAPIError:
+        current = set()
+    if current != heads:
+        raise SchemaOutOfDate(
+            f"Database is at revision {', '.join(sorted(current)) or '(none)'}, "
+            f"expected {', '.join(sorted(heads))}: run `alembic upgrade head`"
+        )
+
+
+class DatabaseRunner(abc.ABC):
+    """
+    Runs service methods against the configured database backend.
+
+    Service methods are written against a synchronous ``Session`` and take it
+    as their first argument. ``await db.run(StockService.get_stocks, skip, size)``
+    calls them directly on a sync session, or, with ``DATABASE_ASYNC``
+    enabled, through ``AsyncSession.run_sync`` so every statement is awaited
+    on the async driver and the event loop is free during DB waits.
+
+    There are no separate ``async def`` service methods: one implementation
+    serves both backends.
+    """
+
+    @abc.abstractmethod
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call ``fn(session, *args, **kwargs)`` and return its result."""
+
+
+class SyncDatabaseRunner(DatabaseRunner):
+    """Runner over a synchronous session (statements block the caller)."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        # Imported here to avoid a circular import (app.core imports this module)
+        from app.core.tracing import span
+
+        with span(fn.__qualname__, "service"):
+            return fn(self.session, *args, **kwargs)
+
+
+class AsyncDatabaseRunner(DatabaseRunner):
+    """Runner over an ``AsyncSession`` (statements are awaited)."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        from app.core.tracing import span
+
+        with span(fn.__qualname__, "service"):
+            return await self.session.run_sync(
+                lambda sync_session: fn(sync_session, *args, **kwargs)
+            )
+
+
+async def get_db_runner() -> AsyncGenerator[DatabaseRunner, None]:
+    """
+    Get a database runner for the configured backend.
+
+    Yields:
+        DatabaseRunner: Async runner when ``DATABASE_ASYNC`` is enabled,
+        otherwise a runner over a regular session
+    """
+    async for runner in _open_runner(read_only=False):
+        yield runner
+
+
+async def get_read_db_runner() -> AsyncGenerator[DatabaseRunner, None]:
+    """
+    Get a database runner for read-only endpoints.
+
+    Queries go to a read replica when ``DATABASE_REPLICA_URLS`` is set
+    (see ``ReplicaRouter``), otherwise to the primary like ``get_db_runner``.
+    """
+    async for runner in _open_runner(read_only=True):
+        yield runner
+
+
+async def _open_runner(read_only: bool) -> AsyncGenerator[DatabaseRunner, None]:
+    if settings.DATABASE_ASYNC:
+        info = {"read_only": read_only, "async": True}
+        async with get_async_sessionmaker()(info=info) as session:
+            yield AsyncDatabaseRunner(session)
+    else:
+        db = SessionLocal(info={"read_only": read_only})
+        try:
+            yield SyncDatabaseRunner(db)
+        finally:
+            db.close()
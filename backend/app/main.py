@@ -1,5 +1,6 @@
 """FastAPI main application entry point."""
 
+import asyncio
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -7,11 +8,37 @@ from typing import Optional
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.exc import IntegrityError
 
 from app.config import settings
-from app.database import engine, Base
+from app.database import (
+    engine,
+    Base,
+    SessionLocal,
+    check_schema_revision,
+    get_async_engine,
+    is_sqlite,
+    optimize_sqlite,
+    replica_router,
+    run_sqlite_maintenance,
+    sqlite_has_statistics,
+)
+from app.core.compression import CompressionMiddleware
+from app.core.hashing import password_hasher
+from app.core.invalidation import invalidation_bus
+from app.core.metrics import MetricsMiddleware, instrument_engine, render_metrics
+from app.core.loop_monitor import LoopMonitorMiddleware, loop_monitor
+from app.core.profiling import ProfilingMiddleware, continuous_profiler
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.reference_cache import reference_names
+from app.core.revocation import token_registry
+from app.core.serialization import FastJSONResponse
+from app.core.request_context import RequestContextMiddleware
+from app.core.slow_queries import slow_query_log
+from app.core.static_site import StaticSite
+from app.core.tracing import TracingMiddleware, trace_store
+from app.core.permissions import permission_engine
 from app.api.v1 import api_router
 
 
@@ -24,7 +51,7 @@ def _get_frontend_dist() -> Optional[Path]:
         # Development: relative to backend/
         base = Path(__file__).resolve().parent.parent.parent
     dist = base / "frontend" / "dist"
-    if dist.is_dir():
+    if (dist / "index.html").is_file():
         return dist
     return None
 
@@ -32,10 +59,54 @@ def _get_frontend_dist() -> Optional[Path]:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    # Startup: Create database tables if they don't exist
-    Base.metadata.create_all(bind=engine)
+    if settings.DATABASE_AUTO_CREATE:
+        # Startup: Create database tables if they don't exist
+        Base.metadata.create_all(bind=engine)
+    else:
+        # Schema managed by Alembic: refuse to serve an unmigrated database
+        check_schema_revision()
+    maintenance = None
+    if is_sqlite():
+        # Give the query planner statistics on first start, then keep them fresh
+        if not sqlite_has_statistics():
+            optimize_sqlite(analyze=True)
+        if settings.SQLITE_OPTIMIZE_INTERVAL_MINUTES > 0:
+            maintenance = asyncio.create_task(run_sqlite_maintenance())
+    # Listen for other workers' writes before loading what they would invalidate
+    invalidation_bus.start()
+    # Compile role/menu permissions so checks need no database access, load
+    # the id -> name dictionaries used to enrich list rows and the tokens
+    # denylisted by logouts
+    with SessionLocal() as db:
+        permission_engine.reload(db, broadcast=False)
+        reference_names.load(db)
+        token_registry.load_denylist(db)
+    replica_router.start()
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine, "primary")
+        for index, replica in enumerate(replica_router.engines):
+            instrument_engine(replica, f"replica-{index}")
+        if settings.DATABASE_ASYNC:
+            instrument_engine(get_async_engine().sync_engine, "primary-async")
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start(detect_blocking=settings.DEBUG or settings.LOOP_BLOCK_DETECTOR)
+    if settings.CONTINUOUS_PROFILING_ENABLED:
+        continuous_profiler.start()
     yield
-    # Shutdown: Clean up resources if needed
+    # Shutdown: Clean up resources
+    continuous_profiler.stop()
+    await loop_monitor.stop()
+    if maintenance is not None:
+        maintenance.cancel()
+    if is_sqlite():
+        optimize_sqlite()
+    password_hasher.shutdown()
+    slow_query_log.shutdown()
+    replica_router.stop()
+    invalidation_bus.stop()
+    trace_store.stop()
+    if settings.DATABASE_ASYNC:
+        await get_async_engine().dispose()
 
 
 app = FastAPI(
@@ -46,6 +117,7 @@ app = FastAPI(
     docs_url=f"{settings.API_V1_PREFIX}/docs",
     redoc_url=f"{settings.API_V1_PREFIX}/redoc",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS
@@ -57,31 +129,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for responses the client accepts compressed
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# On-demand stack profiles of single requests (X-Profile: 1 from an administrator)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Request latency histograms and in-flight gauge for /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Count and time SQL queries per request
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
+# Expose the request scope to lower layers (route names in DB diagnostics)
+app.add_middleware(RequestContextMiddleware)
+
+# Attribute event-loop stalls to the route that caused them
+app.add_middleware(LoopMonitorMiddleware, monitor=loop_monitor)
+
+# Trace IDs for every request, span trees for sampled ones (outermost)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
+@app.exception_handler(IntegrityError)
+async def integrity_error_handler(request: Request, exc: IntegrityError):
+    """A write the constraints reject (e.g. deleting a row still referenced) is a conflict."""
+    return JSONResponse(
+        status_code=409,
+        content={"detail": "The record is still referenced by other data or conflicts with it"},
+    )
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "version": settings.APP_VERSION}
 
 
-# Mount frontend static files and SPA fallback
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics (aggregated across workers in multiprocess mode)."""
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+
+# Serve the frontend build (index.html for client-side routes) after all API routes
 _frontend_dist = _get_frontend_dist()
 if _frontend_dist:
-    # Serve static assets (js, css, images, etc.)
-    app.mount("/assets", StaticFiles(directory=_frontend_dist / "assets"), name="static-assets")
-
-    @app.get("/{full_path:path}")
-    async def spa_fallback(request: Request, full_path: str):
-        """Serve frontend SPA — return index.html for all non-API routes."""
-        # Try to serve the exact file first (e.g. favicon.ico, manifest.json)
-        file_path = (_frontend_dist / full_path).resolve()
-        if full_path and file_path.is_file() and str(file_path).startswith(str(_frontend_dist)):
-            return FileResponse(file_path)
-        # Otherwise return index.html for SPA client-side routing
-        return FileResponse(_frontend_dist / "index.html")
+    app.mount("/", StaticSite(_frontend_dist), name="frontend")
 else:
     @app.get("/")
     async def root():
@@ -1,6 +1,6 @@
 """Database models initialization."""
 
-from app.models.user import User, Role, UserRole, Menu, RoleMenu
+from app.models.user import User, Role, UserRole, Menu, RoleMenu, RefreshToken, RevokedToken
 from app.models.warehouse import Storehouse, ConsumableType, Unit
 from app.models.stock import StockInfo, StockPut, StockOut, GoodsBelong
 from app.models.request import GoodsRequest, PurchaseRequest
@@ -13,6 +13,8 @@ __all__ = [
     "UserRole",
     "Menu",
     "RoleMenu",
+    "RefreshToken",
+    "RevokedToken",
     # Warehouse models
     "Storehouse",
     "ConsumableType",
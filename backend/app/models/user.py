@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -27,6 +27,8 @@ class User(Base):
     create_time = Column(DateTime, default=datetime.utcnow)
     modify_time = Column(DateTime)
     last_login_time = Column(DateTime)
+    # Minimum access token version accepted (see app.core.revocation)
+    token_version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     # Relationships
     user_roles = relationship("UserRole", back_populates="user", cascade="all, delete-orphan")
@@ -104,3 +106,44 @@ class RoleMenu(Base):
     # Relationships
     role = relationship("Role", back_populates="role_menus")
     menu = relationship("Menu", back_populates="role_menus")
+
+
+class RefreshToken(Base):
+    """
+    Opaque refresh token, stored as a hash.
+
+    Tokens rotate on every use: the presented token is revoked and replaced.
+    Presenting an already rotated token revokes the whole device session.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    token_hash = Column(String(64), unique=True, nullable=False, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    device_id = Column(String(64), nullable=False)
+    device_name = Column(String(255))
+    create_time = Column(DateTime, default=datetime.utcnow)
+    expire_time = Column(DateTime, nullable=False)
+    last_used_time = Column(DateTime)
+    revoked_time = Column(DateTime)
+
+    # Relationships
+    user = relationship("User")
+
+    def __repr__(self):
+        return f"<RefreshToken {self.user_id}:{self.device_id}>"
+
+
+class RevokedToken(Base):
+    """Access token denylisted by logout, kept until it would have expired."""
+
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(32), primary_key=True)
+    expire_time = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken {self.jti}>"
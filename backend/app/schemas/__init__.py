@@ -1,6 +1,6 @@
 """Pydantic schemas initialization."""
 
-from app.schemas.auth import Token, TokenData, LoginRequest
+from app.schemas.auth import Token, TokenData, LoginRequest, RefreshRequest
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserInDB
 from app.schemas.warehouse import (
     StorehouseCreate,
@@ -38,6 +38,7 @@ __all__ = [
     "Token",
     "TokenData",
     "LoginRequest",
+    "RefreshRequest",
     # User
     "UserCreate",
     "UserUpdate",
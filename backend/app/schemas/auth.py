@@ -24,11 +24,19 @@ class LoginRequest(BaseModel):
     password: str
 
 
+class RefreshRequest(BaseModel):
+    """Refresh token exchange payload."""
+
+    refresh_token: str
+
+
 class LoginResponse(BaseModel):
     """Login response with user info."""
 
     token: str
     expire_time: str
+    refresh_token: Optional[str] = None
+    device_id: Optional[str] = None
     roles: List[str]
     permissions: List[str]
     user: dict
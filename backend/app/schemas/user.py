@@ -68,6 +68,12 @@ class UserInDB(UserBase):
         from_attributes = True
 
 
+class RoleMenuUpdate(BaseModel):
+    """Role menu assignment schema."""
+
+    menu_ids: List[int] = []
+
+
 class ChangePassword(BaseModel):
     """Change password schema."""
 
@@ -7,6 +7,8 @@ from app.services.inbound_service import InboundService
 from app.services.request_service import RequestService
 from app.services.bulletin_service import BulletinService
 from app.services.dashboard_service import DashboardService
+from app.services.token_service import TokenService
+from app.services.menu_service import MenuService
 
 __all__ = [
     "UserService",
@@ -16,4 +18,6 @@ __all__ = [
     "RequestService",
     "BulletinService",
     "DashboardService",
+    "TokenService",
+    "MenuService",
 ]
@@ -7,8 +7,8 @@ from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 
+from app.core.reference_cache import CONSUMABLE_TYPES, reference_names
 from app.models.stock import StockInfo, StockPut, StockOut
-from app.models.warehouse import ConsumableType
 
 
 class DashboardService:
@@ -118,32 +118,42 @@ class DashboardService:
         """Get inbound statistics grouped by consumable type."""
         results = (
             db.query(
-                ConsumableType.name,
+                StockInfo.type_id,
                 func.sum(StockInfo.amount).label("amount"),
             )
-            .join(ConsumableType, StockInfo.type_id == ConsumableType.id)
             .filter(StockInfo.is_in == 1)
-            .group_by(ConsumableType.name)
+            .group_by(StockInfo.type_id)
             .all()
         )
 
-        return [{"name": r.name, "value": r.amount or 0} for r in results]
+        return DashboardService._sum_by_type_name(db, results)
 
     @staticmethod
     def get_outbound_by_type_stats(db: Session) -> List[Dict[str, Any]]:
         """Get outbound statistics grouped by consumable type."""
         results = (
             db.query(
-                ConsumableType.name,
+                StockInfo.type_id,
                 func.sum(StockInfo.amount).label("amount"),
             )
-            .join(ConsumableType, StockInfo.type_id == ConsumableType.id)
             .filter(StockInfo.is_in == 2)
-            .group_by(ConsumableType.name)
+            .group_by(StockInfo.type_id)
             .all()
         )
 
-        return [{"name": r.name, "value": r.amount or 0} for r in results]
+        return DashboardService._sum_by_type_name(db, results)
+
+    @staticmethod
+    def _sum_by_type_name(db: Session, results) -> List[Dict[str, Any]]:
+        """Turn (type_id, amount) rows into chart entries named by consumable type."""
+        type_names = reference_names.names(db, CONSUMABLE_TYPES)
+        totals: Dict[str, Any] = {}
+        for r in results:
+            name = type_names.get(r.type_id)
+            # Rows without an existing type are left out, as the former join did
+            if name is not None:
+                totals[name] = totals.get(name, 0) + (r.amount or 0)
+        return [{"name": name, "value": amount} for name, amount in totals.items()]
 
     @staticmethod
     def get_low_stock_items(db: Session, threshold: int = 10) -> List[Dict[str, Any]]:
@@ -7,6 +7,8 @@ import time
 
 from sqlalchemy.orm import Session
 
+from app.core.metrics import IMPORT_ROWS, INBOUND_LINES
+from app.core.tracing import span, traced
 from app.models.stock import StockInfo, StockPut, GoodsBelong
 from app.schemas.stock import InboundCreate, InboundItemCreate
 from app.services.stock_service import StockService
@@ -62,6 +64,7 @@ class InboundService:
         return inbounds, total
 
     @staticmethod
+    @traced
     def create_inbound(db: Session, data: InboundCreate) -> StockPut:
         """
         Create an inbound transaction.
@@ -135,7 +138,9 @@ class InboundService:
             else:
                 warehouse_stock.price = item.price
 
-        db.commit()
+        with span("commit", "db"):
+            db.commit()
+        INBOUND_LINES.inc(len(data.items))
         db.refresh(stock_put)
         return stock_put
 
@@ -158,28 +163,31 @@ class InboundService:
             items: List of item dicts with keys: name, type, type_id, amount, unit, price
             content: Optional notes
         """
-        inbound_items = []
-        for item in items:
-            inbound_items.append(
-                InboundItemCreate(
-                    name=item.get("name", ""),
-                    type=item.get("type"),
-                    type_id=item.get("type_id"),
-                    amount=int(item.get("amount", 0)),
-                    unit=item.get("unit"),
-                    price=Decimal(str(item.get("price", 0))),
+        with span("validate_items", rows=len(items)):
+            inbound_items = []
+            for item in items:
+                inbound_items.append(
+                    InboundItemCreate(
+                        name=item.get("name", ""),
+                        type=item.get("type"),
+                        type_id=item.get("type_id"),
+                        amount=int(item.get("amount", 0)),
+                        unit=item.get("unit"),
+                        price=Decimal(str(item.get("price", 0))),
+                    )
                 )
-            )
 
-        inbound_data = InboundCreate(
-            stock_id=stock_id,
-            custodian=custodian,
-            put_user=put_user,
-            content=content,
-            items=inbound_items,
-        )
+            inbound_data = InboundCreate(
+                stock_id=stock_id,
+                custodian=custodian,
+                put_user=put_user,
+                content=content,
+                items=inbound_items,
+            )
 
-        return InboundService.create_inbound(db, inbound_data)
+        stock_put = InboundService.create_inbound(db, inbound_data)
+        IMPORT_ROWS.inc(len(inbound_items))
+        return stock_put
 
     @staticmethod
     def delete_inbound(db: Session, inbound_id: int) -> bool:
@@ -215,13 +223,15 @@ class InboundService:
                 if warehouse_stock:
                     warehouse_stock.amount = max(0, warehouse_stock.amount - gb.amount)
 
-                # Delete the inbound stock info
-                db.delete(stock_info)
-
-            # Delete the goods belong record
+            # Delete the goods belong record before the rows it references
             db.delete(gb)
+            db.flush()
+            if stock_info and stock_info.is_in == 1:
+                # Delete the inbound stock info (never the warehouse stock itself)
+                db.delete(stock_info)
 
         # Delete the stock put record
+        db.flush()
         db.delete(stock_put)
         db.commit()
         return True
@@ -0,0 +1,42 @@
+"""Menu service for role → menu assignments."""
+
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.models.user import Menu, Role, RoleMenu
+from app.core.permissions import permission_engine
+
+
+class MenuService:
+    """Service class for menu and role-menu operations."""
+
+    @staticmethod
+    def get_all_menus(db: Session) -> List[Menu]:
+        """Get all menus ordered for display."""
+        return db.query(Menu).order_by(Menu.parent_id, Menu.order_num, Menu.menu_id).all()
+
+    @staticmethod
+    def get_role_menu_ids(db: Session, role_id: int) -> List[int]:
+        """Get the menu IDs assigned to a role."""
+        rows = db.query(RoleMenu.menu_id).filter(RoleMenu.role_id == role_id).all()
+        return [menu_id for (menu_id,) in rows]
+
+    @staticmethod
+    def set_role_menus(db: Session, role_id: int, menu_ids: List[int]) -> bool:
+        """
+        Replace the menus assigned to a role.
+
+        Recompiles the permission snapshot so checks see the change at once.
+        """
+        role = db.query(Role).filter(Role.role_id == role_id).first()
+        if not role:
+            return False
+
+        db.query(RoleMenu).filter(RoleMenu.role_id == role_id).delete()
+        for menu_id in set(menu_ids):
+            db.add(RoleMenu(role_id=role_id, menu_id=menu_id))
+        db.commit()
+
+        permission_engine.reload(db)
+        return True
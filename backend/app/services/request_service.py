@@ -7,13 +7,13 @@ import time
 
 from sqlalchemy.orm import Session
 
+from app.core.reference_cache import USERS, reference_names
 from app.models.request import (
     PurchaseRequest,
     PurchaseRequestItem,
     GoodsRequest,
     GoodsRequestItem,
 )
-from app.models.user import User
 from app.schemas.request import (
     PurchaseRequestCreate,
     PurchaseRequestUpdate,
@@ -33,8 +33,6 @@ class RequestService:
         if not request:
             return None
 
-        user = db.query(User).filter(User.user_id == request.user_id).first()
-
         items = (
             db.query(PurchaseRequestItem)
             .filter(PurchaseRequestItem.purchase_request_id == request.id)
@@ -45,7 +43,7 @@ class RequestService:
             "id": request.id,
             "num": request.num,
             "user_id": request.user_id,
-            "username": user.username if user else None,
+            "username": reference_names.name(db, USERS, request.user_id),
             "content": request.content,
             "status": request.status,
             "total_price": request.total_price,
@@ -76,14 +74,14 @@ class RequestService:
         total = query.count()
         requests = query.order_by(PurchaseRequest.create_date.desc()).offset(skip).limit(limit).all()
 
+        usernames = reference_names.names(db, USERS)
         result = []
         for req in requests:
-            user = db.query(User).filter(User.user_id == req.user_id).first()
             result.append({
                 "id": req.id,
                 "num": req.num,
                 "user_id": req.user_id,
-                "username": user.username if user else None,
+                "username": usernames.get(req.user_id),
                 "content": req.content,
                 "status": req.status,
                 "total_price": req.total_price,
@@ -181,8 +179,6 @@ class RequestService:
         if not request:
             return None
 
-        user = db.query(User).filter(User.user_id == request.user_id).first()
-
         items = (
             db.query(GoodsRequestItem)
             .filter(GoodsRequestItem.goods_request_id == request.id)
@@ -196,7 +192,7 @@ class RequestService:
             "num": request.num,
             "purchase_num": request.purchase_num,
             "user_id": request.user_id,
-            "username": user.username if user else None,
+            "username": reference_names.name(db, USERS, request.user_id),
             "content": request.content,
             "status": request.status,
             "status_text": status_map.get(request.status, "未知"),
@@ -229,15 +225,15 @@ class RequestService:
 
         status_map = {0: "已提交", 1: "正在审核", 2: "审核通过", 3: "已驳回"}
 
+        usernames = reference_names.names(db, USERS)
         result = []
         for req in requests:
-            user = db.query(User).filter(User.user_id == req.user_id).first()
             result.append({
                 "id": req.id,
                 "num": req.num,
                 "purchase_num": req.purchase_num,
                 "user_id": req.user_id,
-                "username": user.username if user else None,
+                "username": usernames.get(req.user_id),
                 "content": req.content,
                 "status": req.status,
                 "status_text": status_map.get(req.status, "未知"),
@@ -7,8 +7,9 @@ from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
+from app.core.reference_cache import CONSUMABLE_TYPES, WAREHOUSES, reference_names
+from app.core.tracing import traced
 from app.models.stock import StockInfo, GoodsBelong
-from app.models.warehouse import ConsumableType, Storehouse
 from app.schemas.stock import StockInfoCreate, StockInfoUpdate
 
 
@@ -49,6 +50,8 @@ class StockService:
         stocks = query.order_by(StockInfo.create_date.desc()).offset(skip).limit(limit).all()
 
         # Enrich with type and storehouse names
+        type_names = reference_names.names(db, CONSUMABLE_TYPES)
+        storehouse_names = reference_names.names(db, WAREHOUSES)
         result = []
         for stock in stocks:
             stock_dict = {
@@ -63,20 +66,10 @@ class StockService:
                 "is_in": stock.is_in,
                 "stock_id": stock.stock_id,
                 "create_date": stock.create_date,
-                "type_name": None,
-                "storehouse_name": None,
+                "type_name": type_names.get(stock.type_id),
+                "storehouse_name": storehouse_names.get(stock.stock_id),
             }
 
-            if stock.type_id:
-                ctype = db.query(ConsumableType).filter(ConsumableType.id == stock.type_id).first()
-                if ctype:
-                    stock_dict["type_name"] = ctype.name
-
-            if stock.stock_id:
-                storehouse = db.query(Storehouse).filter(Storehouse.id == stock.stock_id).first()
-                if storehouse:
-                    stock_dict["storehouse_name"] = storehouse.name
-
             result.append(stock_dict)
 
         return result, total
@@ -105,6 +98,8 @@ class StockService:
         total = query.count()
         stocks = query.order_by(StockInfo.create_date.desc()).offset(skip).limit(limit).all()
 
+        type_names = reference_names.names(db, CONSUMABLE_TYPES)
+        storehouse_names = reference_names.names(db, WAREHOUSES)
         result = []
         for stock in stocks:
             status_text = "入库" if stock.is_in == 1 else "出库"
@@ -119,20 +114,10 @@ class StockService:
                 "is_in": stock.is_in,
                 "status_text": status_text,
                 "create_date": stock.create_date,
-                "type_name": None,
-                "storehouse_name": None,
+                "type_name": type_names.get(stock.type_id),
+                "storehouse_name": storehouse_names.get(stock.stock_id),
             }
 
-            if stock.type_id:
-                ctype = db.query(ConsumableType).filter(ConsumableType.id == stock.type_id).first()
-                if ctype:
-                    stock_dict["type_name"] = ctype.name
-
-            if stock.stock_id:
-                storehouse = db.query(Storehouse).filter(Storehouse.id == stock.stock_id).first()
-                if storehouse:
-                    stock_dict["storehouse_name"] = storehouse.name
-
             result.append(stock_dict)
 
         return result, total
@@ -243,6 +228,7 @@ class StockService:
         return stock
 
     @staticmethod
+    @traced
     def find_or_create_warehouse_stock(
         db: Session,
         name: str,
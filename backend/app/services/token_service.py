@@ -0,0 +1,180 @@
+"""Token service for refresh token issuance, rotation and revocation."""
+
+import hashlib
+import hmac
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.config import settings
+from app.core.revocation import token_registry
+from app.models.user import RefreshToken, RevokedToken
+
+
+class TokenService:
+    """Service class for refresh token operations."""
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        """Hash an opaque refresh token for storage and lookup."""
+        return hmac.new(
+            settings.SECRET_KEY.encode(), token.encode(), hashlib.sha256
+        ).hexdigest()
+
+    @staticmethod
+    def issue_refresh_token(
+        db: Session,
+        user_id: int,
+        device_id: Optional[str] = None,
+        device_name: Optional[str] = None,
+    ) -> Tuple[str, RefreshToken]:
+        """
+        Issue a new refresh token for a user's device.
+
+        Logging in again on a known device replaces its earlier tokens.
+
+        Returns:
+            (plaintext token, stored token row); only the hash is persisted
+        """
+        if device_id:
+            TokenService._revoke(
+                db, RefreshToken.user_id == user_id, RefreshToken.device_id == device_id
+            )
+        token, row = TokenService._new_token(user_id, device_id, device_name)
+        db.add(row)
+        db.commit()
+        return token, row
+
+    @staticmethod
+    def get_valid_refresh_token(db: Session, token: str) -> Optional[RefreshToken]:
+        """
+        Look up a refresh token by hash and check that it can be used.
+
+        Presenting a token that was already rotated means it leaked or was
+        replayed, so every token of that device is revoked.
+        """
+        row = (
+            db.query(RefreshToken)
+            .options(joinedload(RefreshToken.user))
+            .filter(RefreshToken.token_hash == TokenService.hash_token(token))
+            .first()
+        )
+        if not row:
+            return None
+
+        if row.revoked_time is not None:
+            # Only rotation sets last_used_time: tokens revoked by logout or
+            # a newer login on the device are just invalid
+            if row.last_used_time is not None:
+                TokenService.revoke_device(db, row.user_id, row.device_id)
+            return None
+
+        if row.expire_time <= datetime.utcnow():
+            return None
+        if row.user is None or row.user.status == "0":
+            return None
+        return row
+
+    @staticmethod
+    def rotate_refresh_token(db: Session, row: RefreshToken) -> Optional[str]:
+        """
+        Revoke a valid refresh token and issue its replacement on the same device.
+
+        The revocation is a conditional update, so of two concurrent
+        refreshes with the same token only one wins. The other one is
+        treated as reuse: every token of the device is revoked and None
+        is returned.
+        """
+        user_id, device_id, device_name = row.user_id, row.device_id, row.device_name
+        now = datetime.utcnow()
+        revoked = (
+            db.query(RefreshToken)
+            .filter(RefreshToken.id == row.id, RefreshToken.revoked_time.is_(None))
+            .update(
+                {RefreshToken.revoked_time: now, RefreshToken.last_used_time: now},
+                synchronize_session=False,
+            )
+        )
+        if not revoked:
+            db.rollback()
+            TokenService.revoke_device(db, user_id, device_id)
+            return None
+
+        token, new_row = TokenService._new_token(user_id, device_id, device_name)
+        db.add(new_row)
+        db.commit()
+        return token
+
+    @staticmethod
+    def get_active_devices(db: Session, user_id: int) -> List[RefreshToken]:
+        """Get the active refresh token of each of a user's devices."""
+        return (
+            db.query(RefreshToken)
+            .filter(
+                RefreshToken.user_id == user_id,
+                RefreshToken.revoked_time.is_(None),
+                RefreshToken.expire_time > datetime.utcnow(),
+            )
+            .order_by(RefreshToken.create_time.desc())
+            .all()
+        )
+
+    @staticmethod
+    def revoke_device(db: Session, user_id: int, device_id: str) -> int:
+        """Revoke all refresh tokens of one device. Returns the number revoked."""
+        count = TokenService._revoke(
+            db, RefreshToken.user_id == user_id, RefreshToken.device_id == device_id
+        )
+        db.commit()
+        return count
+
+    @staticmethod
+    def revoke_user_tokens(db: Session, user_id: int) -> int:
+        """Revoke all refresh tokens of a user. Returns the number revoked."""
+        count = TokenService._revoke(db, RefreshToken.user_id == user_id)
+        db.commit()
+        return count
+
+    @staticmethod
+    def revoke_access_token(db: Session, payload: dict) -> None:
+        """Denylist a decoded access token until it expires, in every process."""
+        jti = payload.get("jti")
+        if not jti:
+            return
+        expires_at = float(payload.get("exp", 0))
+        now = datetime.utcnow()
+        # Denials are only needed until the token expires
+        db.query(RevokedToken).filter(RevokedToken.expire_time <= now).delete(
+            synchronize_session=False
+        )
+        db.merge(RevokedToken(jti=jti, expire_time=datetime.utcfromtimestamp(expires_at)))
+        db.commit()
+        token_registry.deny(jti, expires_at)
+
+    @staticmethod
+    def _revoke(db: Session, *criteria) -> int:
+        """Mark the matching unrevoked tokens revoked (not committed)."""
+        return (
+            db.query(RefreshToken)
+            .filter(*criteria, RefreshToken.revoked_time.is_(None))
+            .update({RefreshToken.revoked_time: datetime.utcnow()}, synchronize_session=False)
+        )
+
+    @staticmethod
+    def _new_token(
+        user_id: int, device_id: Optional[str], device_name: Optional[str]
+    ) -> Tuple[str, RefreshToken]:
+        token = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+        row = RefreshToken(
+            token_hash=TokenService.hash_token(token),
+            user_id=user_id,
+            device_id=device_id or uuid.uuid4().hex,
+            device_name=device_name[:255] if device_name else None,
+            create_time=now,
+            expire_time=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+        return token, row
@@ -7,7 +7,11 @@ from sqlalchemy.orm import Session
 
 from app.models.user import User, Role, UserRole
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import verify_password
+from app.core.reference_cache import USERS, reference_cache
+from app.core.revocation import token_registry
+from app.core.hashing import password_hasher
+from app.services.token_service import TokenService
 
 
 class UserService:
@@ -44,11 +48,16 @@ class UserService:
         return users, total
 
     @staticmethod
-    def create(db: Session, user_data: UserCreate) -> User:
-        """Create a new user."""
+    def create(db: Session, user_data: UserCreate, password_hash: str) -> User:
+        """
+        Create a new user.
+
+        Args:
+            password_hash: Hash of ``user_data.password`` from ``password_hasher``
+        """
         user = User(
             username=user_data.username.lower(),
-            password=get_password_hash(user_data.password),
+            password=password_hash,
             email=user_data.email,
             mobile=user_data.mobile,
             ssex=user_data.ssex,
@@ -61,6 +70,7 @@ class UserService:
         db.add(user)
         db.commit()
         db.refresh(user)
+        reference_cache.invalidate(USERS, user.user_id)
 
         # Assign roles
         if user_data.role_ids:
@@ -93,7 +103,15 @@ class UserService:
                 user_role = UserRole(user_id=user_id, role_id=role_id)
                 db.add(user_role)
 
+        # Status and roles are token claims, so outstanding tokens are stale
+        if "status" in update_data or role_ids is not None:
+            user.token_version = token_registry.bump(user_id)
+
         db.commit()
+
+        if update_data.get("status") == "0":
+            TokenService.revoke_user_tokens(db, user_id)
+
         db.refresh(user)
         return user
 
@@ -105,6 +123,9 @@ class UserService:
             return False
         db.delete(user)
         db.commit()
+        reference_cache.invalidate(USERS, user_id)
+        token_registry.bump(user_id)
+        TokenService.revoke_user_tokens(db, user_id)
         return True
 
     @staticmethod
@@ -117,6 +138,44 @@ class UserService:
             return None
         return user
 
+    @staticmethod
+    async def authenticate_async(db: Session, username: str, password: str) -> Optional[User]:
+        """
+        Authenticate a user without blocking the event loop.
+
+        Verification runs on the password hashing pool. Hashes stored at an
+        outdated bcrypt cost are transparently replaced.
+
+        Raises:
+            HashPoolSaturated: If the hashing pool is at capacity
+        """
+        user = UserService.get_by_username(db, username)
+        if not user:
+            return None
+
+        UserService._release_connection(db, user)
+        valid, new_hash = await password_hasher.verify_and_update(password, user.password)
+        if not valid:
+            return None
+
+        user = db.merge(user, load=False)
+        if new_hash:
+            user.password = new_hash
+            db.commit()
+        return user
+
+    @staticmethod
+    def _release_connection(db: Session, user: User) -> None:
+        """
+        Detach a loaded user and return the connection to the pool.
+
+        Called before awaiting the hashing pool: a session holding its
+        connection across a slow await lets a login burst exhaust the engine
+        pool, and the next checkout would then block the event loop.
+        """
+        db.expunge(user)
+        db.rollback()
+
     @staticmethod
     def get_user_roles(db: Session, user_id: int) -> List[str]:
         """Get user's role names."""
@@ -137,20 +196,28 @@ class UserService:
             db.commit()
 
     @staticmethod
-    def change_password(
+    async def change_password_async(
         db: Session, user_id: int, old_password: str, new_password: str
     ) -> bool:
-        """Change user's password."""
+        """
+        Change user's password without blocking the event loop.
+
+        Raises:
+            HashPoolSaturated: If the hashing pool is at capacity
+        """
         user = db.query(User).filter(User.user_id == user_id).first()
         if not user:
             return False
 
-        # Verify old password
-        if not verify_password(old_password, user.password):
+        UserService._release_connection(db, user)
+        if not await password_hasher.verify(old_password, user.password):
             return False
 
-        # Update password
-        user.password = get_password_hash(new_password)
+        new_hash = await password_hasher.hash(new_password)
+        user = db.merge(user, load=False)
+        user.password = new_hash
         user.modify_time = datetime.utcnow()
+        user.token_version = token_registry.bump(user_id)
         db.commit()
+        TokenService.revoke_user_tokens(db, user_id)
         return True
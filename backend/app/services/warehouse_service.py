@@ -6,6 +6,12 @@ import time
 
 from sqlalchemy.orm import Session
 
+from app.core.reference_cache import (
+    CONSUMABLE_TYPES,
+    UNITS,
+    WAREHOUSES,
+    reference_cache,
+)
 from app.models.warehouse import Storehouse, ConsumableType, Unit
 from app.schemas.warehouse import (
     StorehouseCreate,
@@ -48,6 +54,14 @@ class WarehouseService:
         """Get all storehouses (for dropdowns)."""
         return db.query(Storehouse).order_by(Storehouse.name).all()
 
+    @staticmethod
+    def get_storehouse_options(db: Session) -> List[dict]:
+        """Get the dropdown rows of all storehouses (cached by reference_cache)."""
+        return [
+            {"id": w.id, "code": w.code, "name": w.name}
+            for w in WarehouseService.get_all_storehouses(db)
+        ]
+
     @staticmethod
     def create_storehouse(db: Session, data: StorehouseCreate) -> Storehouse:
         """Create a new storehouse."""
@@ -64,6 +78,7 @@ class WarehouseService:
         db.add(storehouse)
         db.commit()
         db.refresh(storehouse)
+        reference_cache.invalidate(WAREHOUSES, storehouse.id)
         return storehouse
 
     @staticmethod
@@ -81,6 +96,7 @@ class WarehouseService:
 
         db.commit()
         db.refresh(storehouse)
+        reference_cache.invalidate(WAREHOUSES, storehouse.id)
         return storehouse
 
     @staticmethod
@@ -91,6 +107,7 @@ class WarehouseService:
             return False
         db.delete(storehouse)
         db.commit()
+        reference_cache.invalidate(WAREHOUSES, storehouse_id)
         return True
 
     # ConsumableType operations
@@ -121,6 +138,14 @@ class WarehouseService:
         """Get all consumable types (for dropdowns)."""
         return db.query(ConsumableType).order_by(ConsumableType.name).all()
 
+    @staticmethod
+    def get_consumable_type_options(db: Session) -> List[dict]:
+        """Get the dropdown rows of all consumable types (cached by reference_cache)."""
+        return [
+            {"id": t.id, "name": t.name, "code": t.code}
+            for t in WarehouseService.get_all_consumable_types(db)
+        ]
+
     @staticmethod
     def create_consumable_type(db: Session, data: ConsumableTypeCreate) -> ConsumableType:
         """Create a new consumable type."""
@@ -133,6 +158,7 @@ class WarehouseService:
         db.add(ctype)
         db.commit()
         db.refresh(ctype)
+        reference_cache.invalidate(CONSUMABLE_TYPES, ctype.id)
         return ctype
 
     @staticmethod
@@ -150,6 +176,7 @@ class WarehouseService:
 
         db.commit()
         db.refresh(ctype)
+        reference_cache.invalidate(CONSUMABLE_TYPES, ctype.id)
         return ctype
 
     @staticmethod
@@ -160,6 +187,7 @@ class WarehouseService:
             return False
         db.delete(ctype)
         db.commit()
+        reference_cache.invalidate(CONSUMABLE_TYPES, type_id)
         return True
 
     # Unit operations
@@ -190,6 +218,11 @@ class WarehouseService:
         """Get all units (for dropdowns)."""
         return db.query(Unit).order_by(Unit.name).all()
 
+    @staticmethod
+    def get_unit_options(db: Session) -> List[dict]:
+        """Get the dropdown rows of all units (cached by reference_cache)."""
+        return [{"id": u.id, "name": u.name} for u in WarehouseService.get_all_units(db)]
+
     @staticmethod
     def create_unit(db: Session, data: UnitCreate) -> Unit:
         """Create a new unit."""
@@ -201,6 +234,7 @@ class WarehouseService:
         db.add(unit)
         db.commit()
         db.refresh(unit)
+        reference_cache.invalidate(UNITS, unit.id)
         return unit
 
     @staticmethod
@@ -216,6 +250,7 @@ class WarehouseService:
 
         db.commit()
         db.refresh(unit)
+        reference_cache.invalidate(UNITS, unit.id)
         return unit
 
     @staticmethod
@@ -226,4 +261,5 @@ class WarehouseService:
             return False
         db.delete(unit)
         db.commit()
+        reference_cache.invalidate(UNITS, unit_id)
         return True
@@ -0,0 +1,72 @@
+"""Load test: request concurrency on the sync vs async database path.
+
+Runs ``concurrency`` clients that request ``/stock`` back to back for a
+fixed duration, once with the regular session and once with
+``DATABASE_ASYNC`` enabled, and reports throughput and latency for each
+concurrency level.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_async_db [seconds] [concurrency,...]
+"""
+
+import asyncio
+import sys
+import time
+
+from benchmarks.common import print_table, setup_environment, summarize
+
+
+async def run_clients(app, concurrency: int, seconds: float) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/api/v1/auth/login", data={"username": "admin", "password": "admin123"}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['data']['token']}"}
+
+        samples = []
+        deadline = time.perf_counter() + seconds
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                r = await client.get("/api/v1/stock", headers=headers)
+                r.raise_for_status()
+                samples.append((time.perf_counter() - t0) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(samples, elapsed)
+
+
+def main(seconds: float = 2.0, levels=(1, 8, 32)) -> None:
+    setup_environment()
+
+    from app.config import settings
+    from app.database import get_async_engine
+    from app.main import app
+
+    results = {}
+    for mode in (False, True):
+        settings.DATABASE_ASYNC = mode
+        for concurrency in levels:
+            name = f"{'async' if mode else 'sync'} x{concurrency}"
+            results[name] = asyncio.run(run_clients(app, concurrency, seconds))
+        if mode:
+            asyncio.run(get_async_engine().dispose())
+
+    print(f"GET /stock for {seconds}s per scenario")
+    print_table(results)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        float(args[0]) if len(args) > 0 else 2.0,
+        tuple(int(n) for n in args[1].split(",")) if len(args) > 1 else (1, 8, 32),
+    )
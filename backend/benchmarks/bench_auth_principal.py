@@ -0,0 +1,51 @@
+"""Benchmark ``GET /stock`` with and without the stateless auth principal.
+
+``/stock/summary`` is included as a cheap endpoint where the saved user lookup
+is a larger share of the request.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_auth_principal [iterations]
+"""
+
+import sys
+
+from benchmarks.common import login, measure, print_table, setup_environment
+
+
+def main(iterations: int = 500) -> None:
+    setup_environment()
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.config import settings
+    from app.database import engine
+    from app.main import app
+
+    queries = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(*args):
+        queries["count"] += 1
+
+    results = {}
+    with TestClient(app) as client:
+        headers = login(client)
+        for stateless in (False, True):
+            settings.AUTH_STATELESS = stateless
+            mode = "stateless" if stateless else "db lookup"
+            for path in ("/api/v1/stock", "/api/v1/stock/summary"):
+                queries["count"] = 0
+                client.get(path, headers=headers).raise_for_status()
+                per_request = queries["count"]
+
+                results[f"{path[7:]} {mode} ({per_request}q)"] = measure(
+                    lambda: client.get(path, headers=headers), iterations
+                )
+
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
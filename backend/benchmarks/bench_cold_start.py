@@ -0,0 +1,116 @@
+"""Cold start: import-time profile and time to the first healthy response.
+
+The first part runs ``python -X importtime -c "import app.main"`` and lists
+the packages that take longest to import, and checks that the modules only
+some endpoints need (openpyxl, jose, passlib) stay out of startup.
+
+The second part starts ``uvicorn app.main:app`` repeatedly and measures the
+time from process start until ``GET /health`` answers 200, with:
+
+* auto-create: ``DATABASE_AUTO_CREATE=true`` (``create_all`` at every boot)
+* alembic: ``DATABASE_AUTO_CREATE=false`` (migration revision check only)
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_cold_start [runs]
+"""
+
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.common import BACKEND_DIR, setup_environment
+
+LAZY_MODULES = ("openpyxl", "jose", "passlib")
+
+
+def import_profile(top: int = 15) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import sys, app.main; print(','.join(m for m in %r if m in sys.modules))" % (LAZY_MODULES,)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    by_package = defaultdict(int)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        by_package[name.strip().split(".")[0]] += int(self_us)
+        total += int(self_us)
+
+    print(f"import app.main: {total / 1000:.0f} ms of imports")
+    print(f"{'package':<28}{'ms':>8}{'share':>8}")
+    for package, micros in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<28}{micros / 1000:>8.1f}{micros / total:>8.1%}")
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    print(f"lazy modules loaded at startup: {', '.join(loaded) or 'none'}\n")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_healthy(env: dict, timeout: float = 60) -> float:
+    """Start a server and return the seconds until /health answered 200."""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with {process.returncode}")
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                connection.request("GET", "/health")
+                if connection.getresponse().status == 200:
+                    return time.perf_counter() - started
+            except OSError:
+                pass
+            time.sleep(0.005)
+        raise TimeoutError("server did not become healthy")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(runs: int = 5) -> None:
+    setup_environment()
+    env = dict(os.environ)
+    # Existing databases created by create_all are adopted by stamping them
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "stamp", "head"],
+        cwd=BACKEND_DIR, env=env, check=True, capture_output=True,
+    )
+
+    import_profile()
+
+    modes = {
+        "auto-create": {**env, "DATABASE_AUTO_CREATE": "true"},
+        "alembic": {**env, "DATABASE_AUTO_CREATE": "false"},
+    }
+    time_to_healthy(modes["alembic"])  # warm the OS file cache and bytecode
+    results = {name: [] for name in modes}
+    for _ in range(runs):
+        for name, mode_env in modes.items():
+            results[name].append(time_to_healthy(mode_env) * 1000)
+
+    print(f"{'time to first healthy response':<32}{'median ms':>10}{'min ms':>10}{'max ms':>10}")
+    for name, samples in results.items():
+        print(f"{name:<32}{statistics.median(samples):>10.0f}{min(samples):>10.0f}{max(samples):>10.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
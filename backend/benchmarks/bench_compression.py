@@ -0,0 +1,122 @@
+"""Response compression: bytes on the wire and CPU cost.
+
+For a few typical API responses (100-row list pages, the dashboard board),
+reports the uncompressed size, the compressed size and the CPU time per
+response for gzip and brotli at the levels worth considering, then the
+request latency through ``CompressionMiddleware`` with each Accept-Encoding.
+When a frontend build exists, also totals its assets raw and as the
+precompressed ``.gz``/``.br`` files.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_compression [iterations]
+"""
+
+import gzip
+import sys
+import time
+
+from benchmarks.common import (
+    BACKEND_DIR,
+    login,
+    make_import_workbook,
+    measure,
+    print_table,
+    setup_environment,
+)
+
+PATHS = [
+    "/api/v1/stock?size=100",
+    "/api/v1/stock/detail?size=100",
+    "/api/v1/inbound?size=100",
+    "/api/v1/dashboard/board",
+]
+
+
+def codecs() -> dict:
+    result = {
+        "gzip-1": lambda body: gzip.compress(body, compresslevel=1, mtime=0),
+        "gzip-6": lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+    }
+    try:
+        import brotli
+    except ImportError:
+        print("brotli is not installed: gzip only\n")
+        return result
+    result["br-1"] = lambda body: brotli.compress(body, quality=1)
+    result["br-4"] = lambda body: brotli.compress(body, quality=4)
+    result["br-11"] = lambda body: brotli.compress(body, quality=11)
+    return result
+
+
+def cpu_ms(fn, body: bytes, iterations: int) -> float:
+    started = time.process_time()
+    for _ in range(iterations):
+        fn(body)
+    return (time.process_time() - started) / iterations * 1000
+
+
+def report_assets() -> None:
+    assets = BACKEND_DIR.parent / "frontend" / "dist" / "assets"
+    if not assets.is_dir():
+        print("\nNo frontend build (frontend/dist/assets): asset sizes skipped")
+        return
+    totals = {"raw": 0, ".gz": 0, ".br": 0}
+    for path in assets.iterdir():
+        if path.suffix in (".gz", ".br"):
+            totals[path.suffix] += path.stat().st_size
+        else:
+            totals["raw"] += path.stat().st_size
+    print(f"\n{'frontend assets':<32}{'KiB':>10}")
+    for name, size in totals.items():
+        print(f"{name:<32}{size / 1024:>10.1f}")
+
+
+def main(iterations: int = 200) -> None:
+    setup_environment(
+        COMPRESSION_ENABLED="true", QUERY_STATS_ENABLED="false", TRACE_SAMPLE_RATE="0"
+    )
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        headers = login(client)
+        # Enough rows for full 100-row pages
+        response = client.post(
+            "/api/v1/inbound/import",
+            headers=headers,
+            files={"file": ("bench.xlsx", make_import_workbook(300))},
+            data={"stock_id": "1", "custodian": "bench", "put_user": "bench"},
+        )
+        response.raise_for_status()
+
+        available = codecs()
+        print(f"{'response / codec':<40}{'bytes':>10}{'ratio':>8}{'cpu ms':>10}")
+        for path in PATHS:
+            body = client.get(path, headers={**headers, "Accept-Encoding": "identity"}).content
+            print(f"{path:<40}{len(body):>10}{1:>8.2f}{0:>10.3f}")
+            for name, fn in available.items():
+                size = len(fn(body))
+                cost = cpu_ms(fn, body, max(5, iterations // 10))
+                print(f"{'  ' + name:<40}{size:>10}{size / len(body):>8.2f}{cost:>10.3f}")
+
+        print()
+        results = {}
+        for encoding in ("identity", "gzip", "br"):
+            request_headers = {**headers, "Accept-Encoding": encoding}
+            wire = sum(
+                int(client.get(path, headers=request_headers).headers["content-length"])
+                for path in PATHS
+            )
+            name = f"{encoding} ({wire / 1024:.1f} KiB)"
+            results[name] = measure(
+                lambda: [client.get(path, headers=request_headers) for path in PATHS], iterations
+            )
+        print_table(results)
+    report_assets()
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,103 @@
+"""Overhead of the continuous sampling profiler.
+
+Serves the same request mix with the profiler stopped and running, in
+alternating rounds so drift (caches warming, disk) hits both sides equally,
+and compares throughput. Also reports the CPU time the sampler thread itself
+used, as a share of the time it ran, which is the cost it imposes on a
+worker. The target is under 2% overhead.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_continuous_profiler [requests_per_round] [rounds] [hz]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from benchmarks.common import print_table, setup_environment, summarize
+
+PATHS = [
+    "/api/v1/stock",
+    "/api/v1/stock/summary",
+    "/api/v1/inbound",
+    "/api/v1/dashboard/board",
+    "/api/v1/warehouses/list",
+]
+
+
+async def run_round(client, headers: dict, requests: int) -> tuple:
+    samples = []
+    started = time.perf_counter()
+    for i in range(requests):
+        t0 = time.perf_counter()
+        response = await client.get(PATHS[i % len(PATHS)], headers=headers)
+        response.raise_for_status()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples, time.perf_counter() - started
+
+
+async def run(requests: int, rounds: int) -> None:
+    import httpx
+
+    from app.core.profiling import continuous_profiler
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.post(
+                "/api/v1/auth/login", data={"username": "admin", "password": "admin123"}
+            )
+            headers = {"Authorization": f"Bearer {response.json()['data']['token']}"}
+            await run_round(client, headers, requests)  # warm-up
+
+            sampling_mode = None
+            latencies = {"off": [], "on": []}
+            elapsed_total = {"off": 0.0, "on": 0.0}
+            round_rps = {"off": [], "on": []}
+            for index in range(rounds * 2):
+                mode = "on" if index % 2 else "off"
+                if mode == "on":
+                    continuous_profiler.start()
+                    sampling_mode = continuous_profiler.mode
+                samples, elapsed = await run_round(client, headers, requests)
+                if mode == "on":
+                    continuous_profiler.stop()
+                latencies[mode].extend(samples)
+                elapsed_total[mode] += elapsed
+                round_rps[mode].append(requests / elapsed)
+
+    rows = {f"profiler {mode}": summarize(latencies[mode], elapsed_total[mode]) for mode in ("off", "on")}
+    print_table(rows)
+    # Each "on" round against the "off" round just before it
+    overhead = statistics.median(
+        (off - on) / off * 100 for off, on in zip(round_rps["off"], round_rps["on"])
+    )
+    # Round-to-round spread with the profiler off: smaller differences are noise
+    noise = statistics.pstdev(round_rps["off"]) / statistics.fmean(round_rps["off"]) * 100
+    cpu_share = continuous_profiler.overhead() * 100
+    print(f"\nthroughput overhead (median of {rounds} paired rounds): {overhead:.2f}%")
+    print(f"round-to-round noise (profiler off): {noise:.2f}%")
+    print(f"sampler CPU time ({sampling_mode} mode): {cpu_share:.2f}% of run time")
+    windows = continuous_profiler.windows()
+    print(f"stack samples recorded: {sum(w['samples'] for w in windows)}")
+    # The sampler's CPU time is what it takes from the workers; throughput is
+    # only conclusive when the difference stands out from the noise
+    passed = cpu_share < 2 and (overhead < 2 or overhead < noise)
+    print("PASS" if passed else "FAIL", "(target < 2%)")
+
+
+def main(requests: int = 200, rounds: int = 15, hz: int = 100) -> None:
+    setup_environment(
+        CONTINUOUS_PROFILING_ENABLED="false",
+        CONTINUOUS_PROFILE_HZ=str(hz),
+        TRACE_SAMPLE_RATE="0",
+    )
+    asyncio.run(run(requests, rounds))
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    main(*args)
@@ -0,0 +1,94 @@
+"""Desktop first launch: time until the window would open.
+
+Runs the desktop start-up sequence (``desktop_app``: database initialization,
+then the server thread until it accepts connections) against an empty data
+directory, stopping where ``webview.create_window`` would be called. Each
+launch runs in its own process:
+
+* seed: ``create_all`` plus ``seed_data`` (bcrypt-hashing the seed users)
+* template: copy of the prebuilt database from ``build_db_template.py``
+
+A second launch on the same data directory is timed too.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_desktop_first_launch [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import BACKEND_DIR
+
+
+def launch(use_template: bool) -> dict:
+    """Run the desktop start-up sequence in this process and time its steps."""
+    started = time.perf_counter()
+    os.environ["DESKTOP_MODE"] = "true"
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    import desktop_app
+
+    initialized = time.perf_counter()
+    desktop_app.init_database_if_needed(use_template=use_template)
+    database_ready = time.perf_counter()
+
+    import threading
+
+    port = desktop_app.find_free_port()
+    threading.Thread(target=desktop_app.start_server, args=(port,), daemon=True).start()
+    if not desktop_app.wait_for_server(port):
+        raise RuntimeError("server did not start")
+    ready = time.perf_counter()
+    return {
+        "database_ms": (database_ready - initialized) * 1000,
+        "window_ms": (ready - started) * 1000,
+    }
+
+
+def run_child(mode: str, data_home: str) -> dict:
+    env = {**os.environ, "XDG_DATA_HOME": data_home, "APPDATA": data_home}
+    env.pop("DATABASE_URL", None)
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_desktop_first_launch", "--child", mode],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main(runs: int = 3) -> None:
+    if sys.platform == "darwin":
+        raise SystemExit("The data directory cannot be redirected on macOS")
+    from build_db_template import DEFAULT_OUTPUT
+
+    if not DEFAULT_OUTPUT.exists():
+        subprocess.run([sys.executable, "build_db_template.py"], cwd=BACKEND_DIR, check=True,
+                       capture_output=True)
+
+    results = {}
+    for mode in ("seed", "template"):
+        for launch_name in ("first", "second"):
+            results[f"{mode}, {launch_name} launch"] = []
+        for _ in range(runs):
+            data_home = tempfile.mkdtemp(prefix="inbound-desktop-")
+            results[f"{mode}, first launch"].append(run_child(mode, data_home))
+            results[f"{mode}, second launch"].append(run_child(mode, data_home))
+
+    print(f"{'scenario':<28}{'db init ms':>12}{'to window ms':>14}")
+    for name, samples in results.items():
+        database = statistics.median(s["database_ms"] for s in samples)
+        window = statistics.median(s["window_ms"] for s in samples)
+        print(f"{name:<28}{database:>12.0f}{window:>14.0f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "--child":
+        print(json.dumps(launch(args[1] == "template")))
+    else:
+        main(int(args[0]) if args else 3)
@@ -0,0 +1,116 @@
+"""Desktop transport: loopback HTTP server vs in-process ASGI bridge.
+
+Startup is the time from importing the app until it can serve a request:
+uvicorn in a thread polled with ``desktop_app.wait_for_server``, against
+``AsgiBridge.start`` (both in a fresh process). Per-call latency compares a
+keep-alive HTTP client on the loopback server with ``DesktopApi.asgi_request``,
+the method the window calls (including its text/base64 encoding). Each
+transport runs in its own process: the app's lifespan singletons (loop
+monitor, profiler) belong to a single event loop. The
+pywebview JS ↔ Python hop itself is not included: it needs a GUI.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_desktop_transport [iterations]
+"""
+
+import json
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.common import BACKEND_DIR, login, measure, print_table, setup_environment
+
+PATHS = ["/api/v1/auth/me", "/api/v1/stock", "/api/v1/dashboard/board"]
+
+
+def startup(mode: str) -> float:
+    """Seconds from importing the app until it is ready (run in a child process)."""
+    started = time.perf_counter()
+    sys.path.insert(0, str(BACKEND_DIR))
+    import desktop_app
+    from app.main import app
+
+    if mode == "bridge":
+        from desktop_bridge import AsgiBridge
+
+        AsgiBridge(app).start()
+    else:
+        port = desktop_app.find_free_port()
+        threading.Thread(target=desktop_app.start_server, args=(port,), daemon=True).start()
+        if not desktop_app.wait_for_server(port):
+            raise RuntimeError("server did not start")
+    return time.perf_counter() - started
+
+
+def latency(mode: str, iterations: int) -> dict:
+    """Per-path latency for one transport (run in a child process)."""
+    import httpx
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    import desktop_app
+    from app.main import app
+    from desktop_bridge import AsgiBridge, DesktopApi
+
+    results = {}
+    if mode == "tcp":
+        port = desktop_app.find_free_port()
+        threading.Thread(target=desktop_app.start_server, args=(port,), daemon=True).start()
+        desktop_app.wait_for_server(port)
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            headers = login(client)
+            for path in PATHS:
+                results[f"tcp {path}"] = measure(
+                    lambda: client.get(path, headers=headers).raise_for_status(), iterations
+                )
+        return results
+
+    bridge = AsgiBridge(app)
+    bridge.start()
+    api = DesktopApi(bridge)
+    response = api.asgi_request({
+        "method": "POST",
+        "url": "/api/v1/auth/login",
+        "headers": {"content-type": "application/x-www-form-urlencoded"},
+        "body": "username=admin&password=admin123",
+    })
+    headers = {"Authorization": f"Bearer {json.loads(response['body'])['data']['token']}"}
+    for path in PATHS:
+        request = {"method": "GET", "url": path, "headers": headers, "body": None, "base64": False}
+        results[f"bridge {path}"] = measure(lambda: api.asgi_request(request), iterations)
+    bridge.stop()
+    return results
+
+
+def run_child(*args: str) -> object:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_desktop_transport", *args],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main(iterations: int = 300) -> None:
+    # Children inherit DATABASE_URL, so they share the seeded database
+    setup_environment()
+
+    print(f"{'startup (to first request)':<32}{'median ms':>10}")
+    for mode in ("tcp", "bridge"):
+        samples = sorted(run_child("--startup", mode) * 1000 for _ in range(3))
+        print(f"{mode:<32}{samples[1]:>10.0f}")
+    print()
+    results = {}
+    for mode in ("tcp", "bridge"):
+        results.update(run_child("--latency", mode, str(iterations)))
+    print_table(results)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "--startup":
+        print(json.dumps(startup(args[1])))
+    elif args and args[0] == "--latency":
+        print(json.dumps(latency(args[1], int(args[2]))))
+    else:
+        main(int(args[0]) if args else 300)
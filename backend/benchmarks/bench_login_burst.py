@@ -0,0 +1,107 @@
+"""Load test: latency of other endpoints during a login burst.
+
+Fires logins at a fixed rate while a probe client requests
+``/stock/summary`` back to back, then reports the probe's latency. Runs
+twice: once with bcrypt verification inline on the event loop (the old
+behaviour) and once through the bounded hashing pool. Event-loop lag is
+sampled during each run (``app.core.loop_monitor``).
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_login_burst [logins_per_sec] [seconds] [bcrypt_rounds]
+"""
+
+import asyncio
+import sys
+import time
+
+from benchmarks.common import print_table, setup_environment, summarize
+
+
+async def run_burst(app, rate: int, seconds: float) -> dict:
+    import httpx
+
+    from app.core.loop_monitor import loop_monitor
+
+    loop_monitor.reset()
+    loop_monitor.start()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/api/v1/auth/login", data={"username": "admin", "password": "admin123"}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['data']['token']}"}
+
+        login_status: dict = {}
+        probe_samples = []
+        stop = asyncio.Event()
+
+        async def login_once():
+            r = await client.post(
+                "/api/v1/auth/login", data={"username": "lisi", "password": "123456"}
+            )
+            login_status[r.status_code] = login_status.get(r.status_code, 0) + 1
+
+        async def probe():
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                await client.get("/api/v1/stock/summary", headers=headers)
+                probe_samples.append((time.perf_counter() - t0) * 1000)
+                await asyncio.sleep(0)
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        logins = []
+        for i in range(int(rate * seconds)):
+            target = started + i / rate
+            delay = target - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            logins.append(asyncio.create_task(login_once()))
+        await asyncio.gather(*logins)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe_task
+    await loop_monitor.stop()
+
+    result = summarize(probe_samples, elapsed)
+    result["logins"] = login_status
+    result["loop"] = loop_monitor.stats()
+    return result
+
+
+def main(rate: int = 100, seconds: float = 1.0, rounds: int = 10) -> None:
+    setup_environment(BCRYPT_ROUNDS=str(rounds))
+
+    from app.core.hashing import password_hasher
+    from app.main import app
+    from app.services.user_service import UserService
+
+    pooled = UserService.authenticate_async
+
+    async def inline(db, username, password):
+        return UserService.authenticate(db, username, password)
+
+    results = {}
+    for name, impl in (("inline bcrypt", inline), ("hashing pool", pooled)):
+        UserService.authenticate_async = staticmethod(impl)
+        results[f"probe during burst ({name})"] = asyncio.run(run_burst(app, rate, seconds))
+
+    print(f"{rate} logins/s for {seconds}s, bcrypt rounds={rounds}")
+    print_table(results)
+    for name, r in results.items():
+        print(f"{name}: login status counts {r['logins']}")
+        print(
+            f"{name}: loop lag p50={r['loop']['lag_p50_ms']} ms "
+            f"p99={r['loop']['lag_p99_ms']} ms max={r['loop']['max_lag_ms']} ms"
+        )
+    print(f"pool stats: {password_hasher.stats()}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 100,
+        float(args[1]) if len(args) > 1 else 1.0,
+        int(args[2]) if len(args) > 2 else 10,
+    )
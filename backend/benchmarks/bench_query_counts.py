@@ -0,0 +1,54 @@
+"""Report queries per request for the main list and dashboard endpoints.
+
+Uses the per-request query stats (``app.core.query_stats``), so N+1
+regressions show up as a higher query count or a repeated statement.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_query_counts [iterations]
+"""
+
+import sys
+
+from benchmarks.common import login, setup_environment
+
+PATHS = [
+    "/api/v1/stock",
+    "/api/v1/stock/detail",
+    "/api/v1/stock/summary",
+    "/api/v1/inbound",
+    "/api/v1/purchase-requests",
+    "/api/v1/goods-requests",
+    "/api/v1/users",
+    "/api/v1/dashboard/board",
+    "/api/v1/warehouses/list",
+]
+
+
+def main(iterations: int = 20) -> None:
+    setup_environment()
+
+    from fastapi.testclient import TestClient
+
+    from app.core.query_stats import query_stats_registry
+    from app.main import app
+
+    with TestClient(app) as client:
+        headers = login(client)
+        query_stats_registry.reset()
+        for _ in range(iterations):
+            for path in PATHS:
+                client.get(path, headers=headers).raise_for_status()
+
+    print(f"{'route':<40}{'queries':>9}{'max':>6}{'db ms':>9}{'N+1':>6}")
+    for row in query_stats_registry.routes():
+        print(
+            f"{row['route']:<40}{row['avg_queries']:>9.1f}{row['max_queries']:>6}"
+            f"{row['avg_db_ms']:>9.2f}{'yes' if row['n_plus_one_requests'] else '':>6}"
+        )
+    for finding in query_stats_registry.findings():
+        print(f"N+1 in {finding['route']} (x{finding['max_repeats']}): {finding['statement'][:90]}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,141 @@
+"""Serialization cost of a 100-row list response.
+
+Times only the work between the service result and the response bytes, for a
+page shaped like ``GET /api/v1/stock``:
+
+* before: rows built with ``float(...)``/``strftime`` per field, then what
+  FastAPI does for a dict returned from a ``response_model=dict`` route
+  (validate and serialize the model field, ``json.dumps`` in JSONResponse)
+* after: rows keep their Decimal/datetime values and ``success()`` renders
+  the response with orjson (``app.core.serialization``)
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_serialization [rows] [iterations]
+"""
+
+import asyncio
+import datetime
+import json
+import sys
+import time
+from decimal import Decimal
+
+from benchmarks.common import BACKEND_DIR, print_table, summarize
+
+
+def make_rows(count: int) -> list:
+    created = datetime.datetime(2026, 1, 15, 9, 30, 12, 345678)
+    return [
+        {
+            "id": i,
+            "name": f"物品 {i}",
+            "type": "70g",
+            "type_id": i % 6 + 1,
+            "type_name": "办公用品",
+            "amount": i * 3,
+            "unit": "箱",
+            "price": Decimal("45.50") + i,
+            "stock_id": i % 5 + 1,
+            "storehouse_name": "南区仓库",
+            "create_date": created + datetime.timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def build_before(rows: list) -> dict:
+    records = []
+    for stock in rows:
+        records.append({
+            "id": stock["id"],
+            "name": stock["name"],
+            "type": stock["type"],
+            "type_id": stock["type_id"],
+            "type_name": stock["type_name"],
+            "amount": stock["amount"],
+            "unit": stock["unit"],
+            "price": float(stock["price"]) if stock["price"] else 0,
+            "stock_id": stock["stock_id"],
+            "storehouse_name": stock["storehouse_name"],
+            "create_date": (
+                stock["create_date"].strftime("%Y-%m-%d %H:%M:%S")
+                if stock["create_date"]
+                else None
+            ),
+        })
+    total = len(records)
+    return {
+        "code": 0,
+        "msg": "success",
+        "data": {
+            "records": records,
+            "total": total,
+            "size": total,
+            "current": 1,
+            "pages": 1,
+        },
+    }
+
+
+def build_after(rows: list) -> list:
+    return [
+        {
+            "id": stock["id"],
+            "name": stock["name"],
+            "type": stock["type"],
+            "type_id": stock["type_id"],
+            "type_name": stock["type_name"],
+            "amount": stock["amount"],
+            "unit": stock["unit"],
+            "price": stock["price"] or 0,
+            "stock_id": stock["stock_id"],
+            "storehouse_name": stock["storehouse_name"],
+            "create_date": stock["create_date"],
+        }
+        for stock in rows
+    ]
+
+
+def main(count: int = 100, iterations: int = 2000) -> None:
+    sys.path.insert(0, str(BACKEND_DIR))
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+
+    from app.core.serialization import paginated, success
+
+    rows = make_rows(count)
+    field = create_model_field("Response_bench", dict, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def before() -> bytes:
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=build_before(rows))
+        )
+        return JSONResponse(content).body
+
+    def after() -> bytes:
+        return success(paginated(build_after(rows), count, 1, count)).body
+
+    # Same document either way
+    assert json.loads(before()) == json.loads(after())
+
+    results = {}
+    for name, fn in (("before (strftime + json)", before), ("after (orjson)", after)):
+        for _ in range(50):
+            fn()
+        samples = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - t0) * 1000)
+        results[f"{name}, {count} rows"] = summarize(samples, time.perf_counter() - started)
+    loop.close()
+    print_table(results)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
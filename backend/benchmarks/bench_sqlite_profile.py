@@ -0,0 +1,121 @@
+"""Benchmark the tuned SQLite connection profile against SQLite defaults.
+
+Each mode runs in its own process (the engine and its connect hooks are
+created at import time):
+
+* import: ``POST /inbound/import`` with an Excel file of ``rows`` lines
+* list: ``GET /stock`` page browsing
+* mixed: reader and writer threads in parallel, counting
+  ``database is locked`` failures
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_sqlite_profile [rows] [iterations]
+"""
+
+import json
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.common import (
+    BACKEND_DIR,
+    login,
+    make_import_workbook,
+    measure,
+    print_table,
+    setup_environment,
+    summarize,
+)
+
+
+def run_mode(tuned: bool, rows: int, iterations: int) -> dict:
+    setup_environment(SQLITE_TUNED=str(tuned).lower())
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    workbook = make_import_workbook(rows)
+    form = {"stock_id": "1", "custodian": "bench", "put_user": "bench"}
+    results = {}
+
+    with TestClient(app) as client:
+        headers = login(client)
+
+        def import_once():
+            response = client.post(
+                "/api/v1/inbound/import",
+                headers=headers,
+                files={"file": ("bench.xlsx", workbook)},
+                data=form,
+            )
+            response.raise_for_status()
+
+        results["import"] = measure(import_once, max(3, iterations // 20), warmup=1)
+        results["list"] = measure(
+            lambda: client.get("/api/v1/stock?page=2&size=50", headers=headers), iterations
+        )
+
+        errors = {"count": 0}
+        samples = []
+        deadline = time.perf_counter() + 3
+
+        def reader():
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                client.get("/api/v1/stock/summary", headers=headers)
+                samples.append((time.perf_counter() - t0) * 1000)
+
+        def writer():
+            while time.perf_counter() < deadline:
+                try:
+                    import_once()
+                except Exception:
+                    errors["count"] += 1
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        threads += [threading.Thread(target=writer) for _ in range(2)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results["mixed reads"] = summarize(samples, time.perf_counter() - started)
+        results["mixed reads"]["write_errors"] = errors["count"]
+
+    return results
+
+
+def main(rows: int = 1000, iterations: int = 200) -> None:
+    results = {}
+    for tuned in (False, True):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_sqlite_profile", "--child",
+             str(tuned), str(rows), str(iterations)],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        mode = "tuned" if tuned else "defaults"
+        for name, r in json.loads(output.splitlines()[-1]).items():
+            results[f"{name} ({mode})"] = r
+
+    print(f"import of {rows} rows, {iterations} list requests")
+    print_table(results)
+    for name, r in results.items():
+        if "write_errors" in r:
+            print(f"{name}: failed writes {r['write_errors']}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "--child":
+        print(json.dumps(run_mode(args[1] == "True", int(args[2]), int(args[3]))))
+    else:
+        main(
+            int(args[0]) if len(args) > 0 else 1000,
+            int(args[1]) if len(args) > 1 else 200,
+        )
@@ -0,0 +1,100 @@
+"""Shared helpers for benchmark scripts.
+
+Benchmarks run in-process against a throwaway SQLite database seeded with
+``seed_data.py``. ``setup_environment`` must be called before anything from
+``app`` is imported, because settings and the engine are created at import time.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_environment(**env: str) -> Path:
+    """Point the app at a fresh temporary SQLite database and seed it."""
+    data_dir = Path(tempfile.mkdtemp(prefix="inbound-bench-"))
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{data_dir / 'bench.db'}")
+    os.environ.update(env)
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.chdir(BACKEND_DIR)
+
+    import seed_data
+
+    seed_data.seed_database()
+    return data_dir
+
+
+def login(client, username: str = "admin", password: str = "admin123") -> Dict[str, str]:
+    """Log in through the API and return the Authorization header."""
+    response = client.post(
+        "/api/v1/auth/login", data={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['data']['token']}"}
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 20) -> Dict[str, float]:
+    """Call ``fn`` repeatedly and return throughput and latency percentiles (ms)."""
+    for _ in range(warmup):
+        fn()
+
+    samples: List[float] = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+
+    return summarize(samples, elapsed)
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict[str, float]:
+    """Summarize latency samples (ms) collected over ``elapsed`` seconds."""
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    return {
+        "count": len(samples),
+        "rps": len(samples) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(samples) if samples else 0.0,
+        "p50_ms": pct(0.50) if samples else 0.0,
+        "p95_ms": pct(0.95) if samples else 0.0,
+        "p99_ms": pct(0.99) if samples else 0.0,
+    }
+
+
+def print_table(rows: Dict[str, Dict[str, float]]) -> None:
+    """Print benchmark results as an aligned table."""
+    print(f"{'scenario':<32}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in rows.items():
+        print(
+            f"{name:<32}{r['rps']:>10.1f}{r['p50_ms']:>10.2f}"
+            f"{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+        )
+
+
+def make_import_workbook(rows: int, prefix: str = "bench-item") -> bytes:
+    """Build an ``/inbound/import`` Excel file with ``rows`` item lines."""
+    from io import BytesIO
+
+    import openpyxl
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["name", "type", "type_id", "amount", "unit", "price"])
+    for i in range(rows):
+        # A bounded set of names so repeated imports update existing stock too
+        sheet.append([f"{prefix}-{i % 500}", "办公用品", 1, 1 + i % 7, "个", 2.5])
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,344 @@
+"""End-to-end HTTP load test.
+
+Starts the app as a real server (uvicorn, or gunicorn with ``--workers``)
+on a throwaway seeded SQLite database, runs each scenario with a fixed
+number of requests spread over ``--concurrency`` connections, and writes
+throughput and latency percentiles to a JSON file named after the commit.
+Everything runs locally; nothing is downloaded.
+
+Scenarios:
+
+* login: ``POST /auth/login`` (bcrypt verification included)
+* stock_browse: ``GET /stock`` cycling through pages and name/type/warehouse filters
+* dashboard: ``GET /dashboard/board``
+* inbound_10, inbound_100: ``POST /inbound`` with 10 and 100 item lines
+* excel_import: ``POST /inbound/import`` with a 100-row workbook
+* approval: ``POST /purchase-requests/{id}/approve`` (the requests are
+  created beforehand, untimed)
+
+Non-2xx responses are counted as errors per status code; their latency is
+still included.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.load_test [--scenarios login,dashboard] [--requests 200]
+        [--concurrency 8] [--workers 1] [--output FILE] [--compare BASELINE.json]
+        [--url http://host:port]
+
+``--url`` targets a server that is already running (and seeded) instead of
+starting one. ``--compare`` prints the change against an earlier results
+file, e.g. one written on the main branch.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.common import BACKEND_DIR, make_import_workbook, setup_environment, summarize
+
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+API = "/api/v1"
+
+# Cycled by stock_browse: (page, name, type_id, stock_id)
+STOCK_FILTERS = [
+    (1, None, None, None),
+    (2, None, None, None),
+    (1, "load", None, None),
+    (1, None, 1, None),
+    (1, None, None, 1),
+    (3, "load", 1, None),
+]
+
+
+@dataclass
+class Scenario:
+    """One request per call of ``request(client, i)``, after an untimed ``setup``."""
+
+    request: Callable[..., Awaitable]
+    setup: Optional[Callable[..., Awaitable]] = None
+
+
+def inbound_payload(lines: int, i: int) -> dict:
+    return {
+        "stock_id": 1 + i % 5,
+        "custodian": "load-test",
+        "put_user": "load-test",
+        "content": f"load test {i}",
+        "items": [
+            {
+                "name": f"load-item-{(i * lines + n) % 500}",
+                "type": "办公用品",
+                "type_id": 1,
+                "amount": 1 + n % 9,
+                "unit": "个",
+                "price": "2.50",
+            }
+            for n in range(lines)
+        ],
+    }
+
+
+class Scenarios:
+    """The scenario request functions and the data their setups prepare."""
+
+    def __init__(self, headers: Dict[str, str]):
+        self.headers = headers
+        self.workbook = make_import_workbook(100, prefix="load-import")
+        self.request_ids: List[int] = []
+
+    async def login(self, client, i: int):
+        return await client.post(
+            f"{API}/auth/login", data={"username": "admin", "password": "admin123"}
+        )
+
+    async def stock_browse(self, client, i: int):
+        page, name, type_id, stock_id = STOCK_FILTERS[i % len(STOCK_FILTERS)]
+        params = {"page": page, "size": 20}
+        for key, value in (("name", name), ("type_id", type_id), ("stock_id", stock_id)):
+            if value is not None:
+                params[key] = value
+        return await client.get(f"{API}/stock", params=params, headers=self.headers)
+
+    async def dashboard(self, client, i: int):
+        return await client.get(f"{API}/dashboard/board", headers=self.headers)
+
+    async def inbound_10(self, client, i: int):
+        return await client.post(f"{API}/inbound", json=inbound_payload(10, i), headers=self.headers)
+
+    async def inbound_100(self, client, i: int):
+        return await client.post(f"{API}/inbound", json=inbound_payload(100, i), headers=self.headers)
+
+    async def excel_import(self, client, i: int):
+        return await client.post(
+            f"{API}/inbound/import",
+            headers=self.headers,
+            files={"file": ("load.xlsx", self.workbook)},
+            data={"stock_id": "1", "custodian": "load-test", "put_user": "load-test"},
+        )
+
+    async def create_requests(self, client, count: int):
+        self.request_ids = []
+        for i in range(count):
+            response = await client.post(
+                f"{API}/purchase-requests",
+                headers=self.headers,
+                json={
+                    "content": f"load test {i}",
+                    "items": [{"name": "load-item", "type_id": 1, "amount": 2, "price": "9.90"}],
+                },
+            )
+            response.raise_for_status()
+            self.request_ids.append(response.json()["data"]["id"])
+            # Request numbers are millisecond timestamps
+            await asyncio.sleep(0.002)
+
+    async def approval(self, client, i: int):
+        request_id = self.request_ids[i % len(self.request_ids)]
+        return await client.post(
+            f"{API}/purchase-requests/{request_id}/approve", headers=self.headers
+        )
+
+    def all(self) -> Dict[str, Scenario]:
+        return {
+            "login": Scenario(self.login),
+            "stock_browse": Scenario(self.stock_browse),
+            "dashboard": Scenario(self.dashboard),
+            "inbound_10": Scenario(self.inbound_10),
+            "inbound_100": Scenario(self.inbound_100),
+            "excel_import": Scenario(self.excel_import),
+            "approval": Scenario(self.approval, setup=self.create_requests),
+        }
+
+
+async def run_scenario(client, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    """Send ``requests`` requests from ``concurrency`` concurrent connections."""
+    if scenario.setup is not None:
+        await scenario.setup(client, requests)
+    # Warm up (connections, caches) without recording
+    for i in range(min(concurrency, requests)):
+        await scenario.request(client, i)
+
+    counter = itertools.count()
+    samples: List[float] = []
+    statuses: Dict[str, int] = {}
+
+    async def worker():
+        while (i := next(counter)) < requests:
+            t0 = time.perf_counter()
+            try:
+                response = await scenario.request(client, i)
+                status = str(response.status_code)
+            except Exception as exc:
+                status = type(exc).__name__
+            samples.append((time.perf_counter() - t0) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = summarize(samples, time.perf_counter() - started)
+    result["errors"] = sum(n for status, n in statuses.items() if not status.startswith("2"))
+    result["statuses"] = statuses
+    return result
+
+
+async def run(base_url: str, names: List[str], requests: int, concurrency: int) -> dict:
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        response = await client.post(
+            f"{API}/auth/login", data={"username": "admin", "password": "admin123"}
+        )
+        response.raise_for_status()
+        scenarios = Scenarios({"Authorization": f"Bearer {response.json()['data']['token']}"})
+        # Enough stock rows for full, filterable pages
+        response = await client.post(
+            f"{API}/inbound/import",
+            headers=scenarios.headers,
+            files={"file": ("seed.xlsx", make_import_workbook(500, prefix="load-item"))},
+            data={"stock_id": "1", "custodian": "load-test", "put_user": "load-test"},
+        )
+        response.raise_for_status()
+
+        available = scenarios.all()
+        results = {}
+        for name in names:
+            results[name] = await run_scenario(client, available[name], requests, concurrency)
+            print_result(name, results[name])
+        return results
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    if workers > 1:
+        command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"]
+        env = {**os.environ, "PORT": str(port), "WEB_CONCURRENCY": str(workers)}
+    else:
+        command = [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--log-level", "warning", "--no-access-log",
+        ]
+        env = dict(os.environ)
+    return subprocess.Popen(
+        command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def wait_until_healthy(base_url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError("server did not become healthy")
+
+
+def git_revision() -> Dict[str, object]:
+    def git(*args: str) -> str:
+        result = subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True)
+        return result.stdout.strip()
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain"))}
+
+
+def print_result(name: str, r: dict) -> None:
+    print(
+        f"{name:<16}{r['rps']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+        f"{r['p99_ms']:>10.2f}{r['errors']:>8}"
+    )
+
+
+def compare(results: dict, baseline_path: Path) -> None:
+    """Print throughput and p95 changes against an earlier results file."""
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nvs {baseline_path.name} ({baseline['meta']['commit'][:10]})")
+    print(f"{'scenario':<16}{'req/s':>10}{'change':>9}{'p95 ms':>10}{'change':>9}")
+    for name, r in results["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            print(f"{name:<16}{r['rps']:>10.1f}{'new':>9}{r['p95_ms']:>10.2f}")
+            continue
+        rps_change = (r["rps"] / before["rps"] - 1) if before["rps"] else 0.0
+        p95_change = (r["p95_ms"] / before["p95_ms"] - 1) if before["p95_ms"] else 0.0
+        print(f"{name:<16}{r['rps']:>10.1f}{rps_change:>+9.1%}{r['p95_ms']:>10.2f}{p95_change:>+9.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", default=",".join(Scenarios({}).all()))
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=1, help="server worker processes")
+    parser.add_argument("--url", help="use a running server instead of starting one")
+    parser.add_argument("--output", type=Path, help="results file (default: results/load-<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare with")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(Scenarios({}).all())
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        from benchmarks.bench_cold_start import free_port
+
+        # Logs and sampled traces would measure the disk, not the app
+        setup_environment(QUERY_STATS_ENABLED="false", TRACE_SAMPLE_RATE="0")
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        process = start_server(port, args.workers)
+    try:
+        if process is not None:
+            wait_until_healthy(base_url, process)
+        print(f"{'scenario':<16}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        scenario_results = asyncio.run(run(base_url, names, args.requests, args.concurrency))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    revision = git_revision()
+    results = {
+        "meta": {
+            **revision,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "server": args.url or ("gunicorn" if args.workers > 1 else "uvicorn"),
+            "workers": args.workers,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "scenarios": scenario_results,
+    }
+    output = args.output or RESULTS_DIR / (
+        f"load-{str(revision['commit'])[:10] or 'unknown'}{'-dirty' if revision['dirty'] else ''}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+    print(f"\nresults written to {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
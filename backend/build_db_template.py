@@ -0,0 +1,68 @@
+"""Build the prebuilt SQLite database shipped with the desktop app.
+
+The schema is created by the Alembic migrations (so the template carries its
+revision), then seeded, analyzed and vacuumed. On first launch the desktop
+app only has to copy the file instead of creating tables and bcrypt-hashing
+every seed user.
+
+Usage (from ``backend/``)::
+
+    python build_db_template.py [output]
+
+The default output is ``build/inbound_management.template.db``.
+"""
+
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+TEMPLATE_NAME = "inbound_management.template.db"
+DEFAULT_OUTPUT = BACKEND_DIR / "build" / TEMPLATE_NAME
+
+
+def build_template(output: Path = DEFAULT_OUTPUT) -> Path:
+    """Build the template at ``output`` (replaced atomically when done)."""
+    output = output.resolve()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    staging = output.with_name(output.name + ".building")
+    for path in (staging, Path(f"{staging}-wal"), Path(f"{staging}-shm")):
+        path.unlink(missing_ok=True)
+
+    # Settings and the engine are created at import time
+    os.environ["DATABASE_URL"] = f"sqlite:///{staging}"
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.chdir(BACKEND_DIR)
+
+    from alembic import command
+    from alembic.config import Config
+
+    import seed_data
+    from app.database import engine
+
+    command.upgrade(Config(str(BACKEND_DIR / "alembic.ini")), "head")
+    seed_data.seed_database()
+    with engine.connect() as conn:
+        # Planner statistics, so the first queries already use the indexes
+        conn.exec_driver_sql("ANALYZE")
+        conn.commit()
+    engine.dispose()
+
+    # One self-contained, compact file: rollback journal instead of WAL (the
+    # app switches it back on connect), free pages dropped
+    connection = sqlite3.connect(staging)
+    try:
+        connection.execute("PRAGMA journal_mode=DELETE")
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+    os.replace(staging, output)
+    return output
+
+
+if __name__ == "__main__":
+    path = build_template(Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_OUTPUT)
+    print(f"Database template written to {path} ({path.stat().st_size // 1024} KiB)")
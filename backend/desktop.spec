@@ -3,6 +3,7 @@
 
 import sys
 import os
+import subprocess
 from pathlib import Path
 
 block_cipher = None
@@ -49,6 +50,14 @@ frontend_dist = project_root / "frontend" / "dist"
 alembic_dir = backend_dir / "alembic"
 alembic_ini = backend_dir / "alembic.ini"
 seed_script = backend_dir / "seed_data.py"
+db_template = backend_dir / "build" / "inbound_management.template.db"
+
+# Prebuilt, seeded database copied on first launch (see build_db_template.py)
+subprocess.run(
+    [sys.executable, str(backend_dir / "build_db_template.py"), str(db_template)],
+    cwd=backend_dir,
+    check=True,
+)
 
 # Collect frontend dist as data files
 datas = []
@@ -60,6 +69,7 @@ if alembic_ini.is_file():
     datas.append((str(alembic_ini), "."))
 if seed_script.is_file():
     datas.append((str(seed_script), "."))
+datas.append((str(db_template), "."))
 
 # Hidden imports that PyInstaller can't detect via static analysis
 hiddenimports = [
@@ -94,6 +104,8 @@ hiddenimports = [
     "app.api.v1.units",
     "app.api.v1.users",
     "app.api.v1.warehouses",
+    "app.api.v1.menus",
+    "app.api.v1.system",
     "app.models",
     "app.models.user",
     "app.models.warehouse",
@@ -108,6 +120,8 @@ hiddenimports = [
     "app.services.stock_service",
     "app.services.user_service",
     "app.services.warehouse_service",
+    "app.services.token_service",
+    "app.services.menu_service",
     "app.schemas",
     "app.schemas.auth",
     "app.schemas.bulletin",
@@ -132,6 +146,10 @@ hiddenimports = [
     "jose.jwt",
     "jose.backends",
     "jose.backends.cryptography_backend",
+    # Alembic (pending migrations on launch; env.py is loaded from a data file)
+    "alembic.command",
+    "alembic.runtime.migration",
+    "logging.config",
 ]
 
 # Exclude modules not needed in desktop mode
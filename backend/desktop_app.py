@@ -4,6 +4,7 @@ Launches FastAPI in a background thread and opens a native window via pywebview.
 """
 
 import os
+import shutil
 import socket
 import sys
 import threading
@@ -17,30 +18,92 @@ def find_free_port() -> int:
         return s.getsockname()[1]
 
 
-def init_database_if_needed():
-    """Run seed_data if the database file doesn't exist yet (first launch)."""
+DB_TEMPLATE_NAME = "inbound_management.template.db"
+
+
+def _bundle_dir() -> str:
+    """Directory holding the bundled data files (_MEIPASS when frozen)."""
+    if getattr(sys, "frozen", False):
+        return sys._MEIPASS
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def frontend_index():
+    """Path of the built frontend's index.html, if present."""
+    if getattr(sys, "frozen", False):
+        path = os.path.join(sys._MEIPASS, "frontend", "dist", "index.html")
+    else:
+        path = os.path.join(os.path.dirname(_bundle_dir()), "frontend", "dist", "index.html")
+    return path if os.path.isfile(path) else None
+
+
+def find_db_template():
+    """Locate the prebuilt database (bundled, or built with build_db_template.py)."""
+    for candidate in (
+        os.path.join(_bundle_dir(), DB_TEMPLATE_NAME),
+        os.path.join(_bundle_dir(), "build", DB_TEMPLATE_NAME),
+    ):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def init_database_if_needed(use_template: bool = True):
+    """Create the database on first launch, then apply pending migrations."""
     from app.config import _get_desktop_data_dir
 
     db_path = _get_desktop_data_dir() / "inbound_management.db"
     if not db_path.exists():
         print("First launch detected — initializing database...")
-        from app.database import engine, Base
-        Base.metadata.create_all(bind=engine)
-
-        # seed_data.py is bundled as a data file, not a Python module.
-        # Use importlib.util to load it from _MEIPASS or the script directory.
-        import importlib.util
-        if getattr(sys, "frozen", False):
-            seed_path = os.path.join(sys._MEIPASS, "seed_data.py")
+        template = find_db_template() if use_template else None
+        if template:
+            # Copy under a temporary name and rename, so an interrupted copy
+            # never leaves a half-written database behind. (No hard link: the
+            # user database would share its blocks with the bundled template.)
+            staging = db_path.with_name(db_path.name + ".copying")
+            shutil.copyfile(template, staging)
+            os.replace(staging, db_path)
         else:
-            seed_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_data.py")
-
-        spec = importlib.util.spec_from_file_location("seed_data", seed_path)
-        seed_mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(seed_mod)
-        seed_mod.seed_database()
+            from app.database import engine, Base
+            Base.metadata.create_all(bind=engine)
+
+            # seed_data.py is bundled as a data file, not a Python module.
+            # Use importlib.util to load it from _MEIPASS or the script directory.
+            import importlib.util
+            seed_path = os.path.join(_bundle_dir(), "seed_data.py")
+
+            spec = importlib.util.spec_from_file_location("seed_data", seed_path)
+            seed_mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(seed_mod)
+            seed_mod.seed_database()
         print("Database initialized successfully.")
 
+    apply_pending_migrations()
+
+
+def apply_pending_migrations():
+    """Upgrade the database to the latest migration (a quick check when up to date)."""
+    from app.database import SchemaOutOfDate, check_schema_revision, engine
+
+    try:
+        check_schema_revision()
+        return
+    except SchemaOutOfDate:
+        pass
+
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import inspect
+
+    config = Config(os.path.join(_bundle_dir(), "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(_bundle_dir(), "alembic"))
+    tables = set(inspect(engine).get_table_names())
+    if "alembic_version" not in tables and "users" in tables:
+        # Created by create_all before migrations were used: adopt it as is
+        command.stamp(config, "head")
+    else:
+        command.upgrade(config, "head")
+
 
 def start_server(port: int):
     """Start uvicorn in the current thread (meant to run as daemon)."""
@@ -86,22 +149,41 @@ def main():
     from app.config import get_settings
     get_settings.cache_clear()
 
-    port = find_free_port()
-    url = f"http://127.0.0.1:{port}"
-
     # Initialize database on first run
     init_database_if_needed()
 
-    # Start FastAPI server in a daemon thread
-    server_thread = threading.Thread(target=start_server, args=(port,), daemon=True)
-    server_thread.start()
+    # API calls go straight to the app through pywebview's JS bridge; the
+    # loopback HTTP server is only a fallback (DESKTOP_TRANSPORT=tcp, or no
+    # built frontend to load from disk)
+    index = frontend_index()
+    bridge = None
+    js_api = None
+    if os.environ.get("DESKTOP_TRANSPORT", "bridge") == "bridge" and index:
+        from desktop_bridge import AsgiBridge, DesktopApi
+        from app.main import app as fastapi_app
+
+        bridge = AsgiBridge(fastapi_app)
+        bridge.start()
+        js_api = DesktopApi(bridge)
+        # pywebview serves the static files over its own loopback server (not
+        # file://, where the build's /assets/ URLs and history.replaceState
+        # break); the flag switches the API client
+        url = index + "?transport=bridge"
+        print("Application ready (in-process transport). Opening window...")
+    else:
+        port = find_free_port()
+        url = f"http://127.0.0.1:{port}"
 
-    print(f"Starting server on {url}...")
-    if not wait_for_server(port):
-        print("ERROR: Server failed to start within timeout.")
-        sys.exit(1)
+        # Start FastAPI server in a daemon thread
+        server_thread = threading.Thread(target=start_server, args=(port,), daemon=True)
+        server_thread.start()
 
-    print("Server ready. Opening window...")
+        print(f"Starting server on {url}...")
+        if not wait_for_server(port):
+            print("ERROR: Server failed to start within timeout.")
+            sys.exit(1)
+
+        print("Server ready. Opening window...")
 
     # Open native window
     import webview
@@ -112,9 +194,13 @@ def main():
         width=1280,
         height=800,
         min_size=(1024, 640),
+        js_api=js_api,
     )
     # webview.start() blocks until the window is closed
-    webview.start()
+    webview.start(http_server=bridge is not None)
+
+    if bridge is not None:
+        bridge.stop()
 
     # Window closed — the daemon thread will be killed automatically
     print("Window closed. Exiting.")
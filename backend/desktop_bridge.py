@@ -0,0 +1,162 @@
+"""In-process transport between the desktop window and the FastAPI app.
+
+The frontend's API client hands each request to ``window.pywebview.api.asgi_request``.
+pywebview runs that call on a worker thread, which submits it to the event loop
+owned by ``AsgiBridge`` and waits for the response: the request is an ASGI call
+on the app object, with no socket, HTTP parsing or port to wait for.
+
+Bodies cross the bridge as text, or base64 when binary (file uploads, Excel
+downloads).
+"""
+
+import asyncio
+import base64
+import threading
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+TEXT_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+class AsgiBridge:
+    """Runs an ASGI app on a private event loop and serves calls into it."""
+
+    def __init__(self, app):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="asgi-bridge", daemon=True)
+        self._lifespan = None
+
+    def start(self, timeout: float = 60) -> None:
+        """Start the loop and run the app's startup (lifespan) handlers."""
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._startup(), self.loop).result(timeout)
+
+    def stop(self, timeout: float = 10) -> None:
+        """Run the app's shutdown handlers and stop the loop."""
+        if self._lifespan is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(timeout)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+    async def _startup(self) -> None:
+        self._lifespan = self.app.router.lifespan_context(self.app)
+        await self._lifespan.__aenter__()
+
+    async def _shutdown(self) -> None:
+        lifespan, self._lifespan = self._lifespan, None
+        await lifespan.__aexit__(None, None, None)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        body: bytes = b"",
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """
+        Call the app from any thread and wait for the response.
+
+        Returns:
+            {"status": int, "headers": {name: value}, "body": bytes}
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._call(method, url, headers or {}, body), self.loop
+        )
+        return future.result(timeout)
+
+    async def _call(self, method: str, url: str, headers: dict, body: bytes) -> dict:
+        parts = urlsplit(url)
+        raw_headers = [
+            (name.lower().encode("latin-1"), str(value).encode("latin-1"))
+            for name, value in headers.items()
+        ]
+        if not any(name == b"host" for name, _ in raw_headers):
+            raw_headers.append((b"host", b"desktop"))
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": method.upper(),
+            "scheme": "http",
+            "path": unquote(parts.path or "/"),
+            "raw_path": (parts.path or "/").encode("latin-1"),
+            "query_string": parts.query.encode("latin-1"),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("desktop", 80),
+            "state": {},
+        }
+
+        response = {"status": 500, "headers": {}, "body": b""}
+        chunks = []
+        request_sent = False
+        finished = asyncio.Event()
+
+        async def receive() -> dict:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                for name, value in message.get("headers", []):
+                    name = name.decode("latin-1")
+                    value = value.decode("latin-1")
+                    existing = response["headers"].get(name)
+                    response["headers"][name] = f"{existing}, {value}" if existing else value
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    finished.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            finished.set()
+        response["body"] = b"".join(chunks)
+        return response
+
+
+class DesktopApi:
+    """
+    Object exposed to the window as ``window.pywebview.api``.
+
+    pywebview exposes every public method and attribute (recursively), so the
+    bridge stays private and ``asgi_request`` is the only entry point.
+    """
+
+    def __init__(self, bridge: AsgiBridge):
+        self._bridge = bridge
+
+    def asgi_request(self, request: dict) -> dict:
+        """
+        Serve one API request from the frontend.
+
+        Args:
+            request: {"method", "url", "headers", "body", "base64"}; the body
+                is text, or base64 when ``base64`` is true
+
+        Returns:
+            {"status", "headers", "body", "base64"} in the same encoding
+        """
+        body = request.get("body") or ""
+        raw_body = base64.b64decode(body) if request.get("base64") else body.encode("utf-8")
+        response = self._bridge.request(
+            request.get("method", "GET"), request["url"], request.get("headers") or {}, raw_body
+        )
+        content_type = response["headers"].get("content-type", "")
+        if content_type.startswith(TEXT_TYPES) or not response["body"]:
+            try:
+                text = response["body"].decode("utf-8")
+                return {**response, "body": text, "base64": False}
+            except UnicodeDecodeError:
+                pass
+        return {**response, "body": base64.b64encode(response["body"]).decode("ascii"), "base64": True}
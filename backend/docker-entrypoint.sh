@@ -0,0 +1,8 @@
+#!/bin/sh
+set -e
+
+# Migrate once, before gunicorn forks its workers (DATABASE_AUTO_CREATE is
+# off in the image, so workers only check the revision at startup)
+alembic upgrade head
+
+exec "$@"
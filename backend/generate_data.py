@@ -0,0 +1,430 @@
+"""Generate a large synthetic dataset for performance work.
+
+Builds years of inbound history, goods requests (with their outbound
+records) and purchase requests on top of the ``seed_data.py`` base data:
+
+- SKU popularity follows a Zipf distribution (``--hot-skew``): a few hot
+  items appear in most inbound and request lines
+- daily volume follows the seasons (a summer low, a year-end high),
+  weekends are quiet and month ends are busier
+- warehouses are skewed too: the first ones receive most goods
+- warehouse stock (``is_in=0``) is the running balance of what was
+  received and handed out, at a weighted average price
+
+Rows are generated in memory in id order and written in batches: a
+compiled Core ``insert()`` through ``executemany`` on SQLite, ``COPY``
+on PostgreSQL. Ten million ``stock_info`` + ``goods_belong`` rows
+(``--preset 10m``) take a few minutes on either. Stop the app while
+generating, or restart it afterwards: its caches do not see these writes.
+
+Usage (from ``backend/``)::
+
+    python generate_data.py [--preset small|10m] [--database-url URL]
+        [--warehouses N] [--skus N] [--years N] [--inbounds-per-day N]
+        [--lines-per-inbound N] [--requests-per-day N] [--seed N]
+"""
+
+import argparse
+import bisect
+import csv
+import io
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+PRESETS = {
+    "small": dict(
+        warehouses=5, skus=500, years=1.0, inbounds_per_day=20, lines_per_inbound=8,
+        requests_per_day=10,
+    ),
+    # ~5M inbound lines: 5M stock_info (is_in=1) + 5M goods_belong rows
+    "10m": dict(
+        warehouses=30, skus=20000, years=3.0, inbounds_per_day=460, lines_per_inbound=10,
+        requests_per_day=200,
+    ),
+}
+
+COLUMNS = {
+    "storehouses": ("id", "code", "name", "principal", "contact", "address", "content", "create_date"),
+    "stock_put": ("id", "num", "price", "custodian", "put_user", "content", "create_date"),
+    "stock_info": (
+        "id", "name", "type_id", "type", "amount", "unit", "content", "price", "create_date",
+        "is_in", "to_user_id", "parent_id", "stock_id",
+    ),
+    "goods_belong": (
+        "id", "stock_info_id", "stock_put_id", "stock_out_id", "amount", "price", "create_date",
+    ),
+    "purchase_requests": (
+        "id", "num", "user_id", "content", "status", "total_price", "create_date",
+        "approve_date", "approve_user_id",
+    ),
+    "purchase_request_items": (
+        "id", "purchase_request_id", "name", "type", "type_id", "amount", "unit", "price",
+    ),
+    "goods_requests": (
+        "id", "num", "purchase_num", "user_id", "content", "status", "create_date",
+        "approve_date", "approve_user_id",
+    ),
+    "goods_request_items": (
+        "id", "goods_request_id", "stock_info_id", "name", "type", "type_id", "amount",
+        "stock_amount", "unit", "price",
+    ),
+}
+
+# Item names and units by consumable type code (types are read from the database)
+ITEM_NAMES = {
+    "OFC": (["签字笔", "笔记本", "文件夹", "订书机", "便利贴", "A4纸", "硒鼓", "墨盒"], ["个", "包", "箱"]),
+    "ELE": (["鼠标", "键盘", "U盘", "网线", "显示器", "移动硬盘", "路由器"], ["个", "台", "套"]),
+    "CLN": (["抹布", "垃圾袋", "洗手液", "拖把", "纸巾", "清洁剂"], ["包", "瓶", "卷", "把"]),
+    "LBR": (["手套", "口罩", "安全帽", "护目镜", "工作服"], ["个", "套", "箱"]),
+    "FOD": (["矿泉水", "咖啡", "茶叶", "饼干", "牛奶"], ["瓶", "箱", "包"]),
+    "TOL": (["螺丝", "扳手", "电钻", "卷尺", "螺丝刀", "插排"], ["个", "把", "套"]),
+}
+SPECS = ["标准", "加厚", "大号", "小号", "黑色", "蓝色", "10只装", "50只装", "经济型", "专业型"]
+REGIONS = ["华北", "华东", "华南", "西南", "西北", "东北", "华中"]
+
+
+def timestamp(day: date, seconds: int) -> str:
+    """DateTime column value as stored by SQLAlchemy on SQLite (also valid COPY input)."""
+    return f"{day.isoformat()} {seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}.000000"
+
+
+def money(value: float) -> str:
+    return f"{value:.2f}"
+
+
+def seasonal_factor(day: date) -> float:
+    """Relative daily volume: seasons, weekends and month ends."""
+    season = 1 + 0.35 * math.cos(2 * math.pi * (day.timetuple().tm_yday - 350) / 365)
+    weekday = (1.0, 1.1, 1.1, 1.05, 1.0, 0.35, 0.2)[day.weekday()]
+    month_end = 1.4 if day.day >= 26 else 1.0
+    return season * weekday * month_end
+
+
+def zipf_cumulative(count: int, skew: float) -> List[float]:
+    """Cumulative weights of a Zipf distribution over ``count`` ranks."""
+    return list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, count + 1)))
+
+
+class BulkWriter:
+    """Buffers rows per table and writes them with the dialect's bulk path."""
+
+    def __init__(self, engine, batch_size: int):
+        from sqlalchemy import insert
+
+        from app.database import Base
+
+        self.engine = engine
+        self.batch_size = batch_size
+        self.postgres = engine.dialect.name == "postgresql"
+        self.buffers: Dict[str, List[tuple]] = defaultdict(list)
+        self.counts: Dict[str, int] = defaultdict(int)
+        # The statements are compiled once; rows go to the driver as plain tuples
+        self.statements = {
+            name: str(
+                insert(Base.metadata.tables[name]).compile(dialect=engine.dialect, column_keys=columns)
+            )
+            for name, columns in COLUMNS.items()
+        }
+
+    def add(self, table: str, row: tuple) -> None:
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every buffer, parents before children (``COLUMNS`` order)."""
+        for name in COLUMNS:
+            rows = self.buffers[name]
+            if not rows:
+                continue
+            if self.postgres:
+                self._copy(name, rows)
+            else:
+                with self.engine.begin() as conn:
+                    conn.exec_driver_sql(self.statements[name], rows)
+            self.counts[name] += len(rows)
+            self.buffers[name] = []
+
+    def total(self, table: str) -> int:
+        """Rows added to a table so far, written or not."""
+        return self.counts[table] + len(self.buffers[table])
+
+    def _copy(self, table: str, rows: Sequence[tuple]) -> None:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        raw = self.engine.raw_connection()
+        try:
+            with raw.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {table} ({', '.join(COLUMNS[table])}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            raw.commit()
+        finally:
+            raw.close()
+
+
+class Generator:
+    """Generates the dataset day by day, keeping warehouse balances as it goes."""
+
+    def __init__(self, engine, args):
+        self.engine = engine
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.writer = BulkWriter(engine, args.batch_size)
+        self.ids = {table: self._max_id(table) for table in COLUMNS}
+        # (sku, warehouse) -> [stock_info id, amount, price]
+        self.balances: Dict[Tuple[int, int], list] = {}
+        self.request_items: List[tuple] = []
+
+    def _max_id(self, table: str) -> itertools.count:
+        from sqlalchemy import text
+
+        with self.engine.connect() as conn:
+            current = conn.execute(text(f"SELECT MAX(id) FROM {table}")).scalar() or 0
+        return itertools.count(current + 1)
+
+    def next_id(self, table: str) -> int:
+        return next(self.ids[table])
+
+    def load_reference_data(self) -> None:
+        """Users, types and units from the database; warehouses topped up to ``--warehouses``."""
+        from sqlalchemy import text
+
+        with self.engine.connect() as conn:
+            self.user_ids = [r[0] for r in conn.execute(text("SELECT user_id FROM users"))]
+            types = conn.execute(text("SELECT id, name, code FROM consumable_types ORDER BY id")).all()
+            units = [r[0] for r in conn.execute(text("SELECT name FROM units ORDER BY id"))]
+            warehouse_ids = [r[0] for r in conn.execute(text("SELECT id FROM storehouses ORDER BY id"))]
+        if not self.user_ids or not types:
+            sys.exit("No users or consumable types: run seed_data.py first")
+
+        now = timestamp(date.today(), 0)
+        for n in range(len(warehouse_ids), self.args.warehouses):
+            warehouse_id = self.next_id("storehouses")
+            region = REGIONS[n % len(REGIONS)]
+            self.writer.add("storehouses", (
+                warehouse_id, f"GEN-WH-{warehouse_id:04d}", f"{region}{n + 1}号仓库", f"仓管{n + 1}",
+                f"1380000{n:04d}", f"{region}物流园{n + 1}号", "generated", now,
+            ))
+            warehouse_ids.append(warehouse_id)
+        self.writer.flush()
+        self.warehouse_ids = warehouse_ids[: self.args.warehouses]
+        self.warehouse_weights = zipf_cumulative(len(self.warehouse_ids), 0.8)
+
+        # SKUs: (name, type_id, spec, unit, base price); hot ranks spread over the catalog
+        self.skus = []
+        for n in range(self.args.skus):
+            type_id, type_name, code = types[n % len(types)]
+            names, type_units = ITEM_NAMES.get(code, ([type_name], units or ["个"]))
+            self.skus.append((
+                f"{names[n // len(types) % len(names)]}-{n + 1:05d}",
+                type_id,
+                self.random.choice(SPECS),
+                self.random.choice(type_units),
+                round(min(3000.0, math.exp(self.random.gauss(3.0, 1.2))), 2),
+            ))
+        self.random.shuffle(self.skus)
+        self.sku_weights = zipf_cumulative(len(self.skus), self.args.hot_skew)
+
+    def pick(self, cumulative: List[float], k: int) -> List[int]:
+        total = cumulative[-1]
+        return [bisect.bisect(cumulative, self.random.random() * total) for _ in range(k)]
+
+    def clock(self) -> int:
+        """Seconds into the day, during working hours."""
+        return int(self.random.triangular(8 * 3600, 18 * 3600, 10 * 3600))
+
+    def daily_count(self, mean: float, day: date) -> int:
+        return max(0, round(self.random.gauss(mean, mean * 0.15) * seasonal_factor(day)))
+
+    def inbound(self, day: date) -> None:
+        put_id = self.next_id("stock_put")
+        created = timestamp(day, self.clock())
+        warehouse_id = self.warehouse_ids[self.pick(self.warehouse_weights, 1)[0]]
+        count = max(1, round(self.random.triangular(1, 2 * self.args.lines_per_inbound)))
+        lines = []
+        for sku_index in self.pick(self.sku_weights, count):
+            amount = max(1, int(self.random.lognormvariate(2.3, 0.8)))
+            price = round(self.skus[sku_index][4] * self.random.uniform(0.95, 1.05), 2)
+            lines.append((sku_index, amount, price))
+        self.writer.add("stock_put", (
+            put_id, f"GEN-PUT-{put_id}", money(sum(a * p for _, a, p in lines)), "仓管员", "收货员",
+            None, created,
+        ))
+        for sku_index, amount, price in lines:
+            name, type_id, spec, unit, _ = self.skus[sku_index]
+            info_id = self.next_id("stock_info")
+            self.writer.add("stock_info", (
+                info_id, name, type_id, spec, amount, unit, None, money(price), created,
+                1, None, None, warehouse_id,
+            ))
+            self.writer.add("goods_belong", (
+                self.next_id("goods_belong"), info_id, put_id, None, amount,
+                money(price * amount), created,
+            ))
+            balance = self.balances.get((sku_index, warehouse_id))
+            if balance is None:
+                # The warehouse stock row's id is taken now, the row written at the end
+                balance = self.balances[(sku_index, warehouse_id)] = [self.next_id("stock_info"), 0, 0.0]
+            held = balance[1] * balance[2]
+            balance[1] += amount
+            balance[2] = (held + price * amount) / balance[1]
+
+    def goods_request(self, day: date, today: date) -> None:
+        request_id = self.next_id("goods_requests")
+        user_id = self.random.choice(self.user_ids)
+        age = (today - day).days
+        status = self.random.choices((2, 3, 1, 0), (80, 10, 5, 5) if age > 3 else (20, 5, 35, 40))[0]
+        approved = timestamp(day + timedelta(days=min(age, 1)), self.clock()) if status in (2, 3) else None
+        self.writer.add("goods_requests", (
+            request_id, f"GEN-REQ-{request_id}", None, user_id, "领用申请", status,
+            timestamp(day, self.clock()), approved, self.user_ids[0] if approved else None,
+        ))
+        for sku_index in self.pick(self.sku_weights, self.random.randint(1, 4)):
+            name, type_id, spec, unit, _ = self.skus[sku_index]
+            warehouse_id = self.warehouse_ids[self.pick(self.warehouse_weights, 1)[0]]
+            balance = self.balances.get((sku_index, warehouse_id))
+            if balance is None or balance[1] == 0:
+                continue
+            amount = min(balance[1], max(1, int(self.random.lognormvariate(1.2, 0.7))))
+            # Written after the warehouse stock rows they reference
+            self.request_items.append((
+                self.next_id("goods_request_items"), request_id, balance[0], name, spec, type_id,
+                amount, balance[1], unit, money(balance[2]),
+            ))
+            if status == 2:
+                # Approved: handed out of the warehouse
+                balance[1] -= amount
+                self.writer.add("stock_info", (
+                    self.next_id("stock_info"), name, type_id, spec, amount, unit,
+                    f"GEN-REQ-{request_id}", money(balance[2]), approved, 2, user_id, None,
+                    warehouse_id,
+                ))
+
+    def purchase_request(self, day: date, today: date) -> None:
+        request_id = self.next_id("purchase_requests")
+        age = (today - day).days
+        status = self.random.choices((3, 1, 2, 0), (60, 20, 10, 10) if age > 7 else (0, 30, 10, 60))[0]
+        approved = timestamp(day + timedelta(days=min(age, 2)), self.clock()) if status else None
+        items = [
+            (self.skus[sku_index], self.random.choice((10, 20, 50, 100)))
+            for sku_index in self.pick(self.sku_weights, self.random.randint(1, 6))
+        ]
+        self.writer.add("purchase_requests", (
+            request_id, f"GEN-RUR-{request_id}", self.random.choice(self.user_ids), "采购申请",
+            status, money(sum(sku[4] * amount for sku, amount in items)),
+            timestamp(day, self.clock()), approved, self.user_ids[0] if approved else None,
+        ))
+        for (name, type_id, spec, unit, price), amount in items:
+            self.writer.add("purchase_request_items", (
+                self.next_id("purchase_request_items"), request_id, name, spec, type_id, amount,
+                unit, money(price),
+            ))
+
+    def run(self, start: date, end: date) -> None:
+        days = (end - start).days + 1
+        started = time.perf_counter()
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            for _ in range(self.daily_count(self.args.inbounds_per_day, day)):
+                self.inbound(day)
+            for _ in range(self.daily_count(self.args.requests_per_day, day)):
+                self.goods_request(day, end)
+            for _ in range(self.daily_count(self.args.requests_per_day / 4, day)):
+                self.purchase_request(day, end)
+            if day.day == 1 or offset == days - 1:
+                print(
+                    f"{day.isoformat()}  stock_info {self.writer.total('stock_info'):>10,}"
+                    f"  goods_belong {self.writer.total('goods_belong'):>10,}"
+                    f"  {time.perf_counter() - started:7.1f}s",
+                    flush=True,
+                )
+
+        created = timestamp(end, 18 * 3600)
+        for (sku_index, warehouse_id), (info_id, amount, price) in self.balances.items():
+            name, type_id, spec, unit, _ = self.skus[sku_index]
+            self.writer.add("stock_info", (
+                info_id, name, type_id, spec, amount, unit, None, money(price), created,
+                0, None, None, warehouse_id,
+            ))
+        self.writer.flush()
+        for row in self.request_items:
+            self.writer.add("goods_request_items", row)
+        self.writer.flush()
+
+
+def finish(engine) -> None:
+    """Move PostgreSQL sequences past the generated ids and refresh planner statistics."""
+    from sqlalchemy import text
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            for table in COLUMNS:
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+                ))
+        conn.execute(text("ANALYZE"))
+
+
+def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL from the settings")
+    parser.add_argument("--warehouses", type=int)
+    parser.add_argument("--skus", type=int)
+    parser.add_argument("--years", type=float, help="years of history up to --end-date")
+    parser.add_argument("--inbounds-per-day", type=float, help="mean inbound transactions per day")
+    parser.add_argument("--lines-per-inbound", type=float, help="mean item lines per inbound")
+    parser.add_argument("--requests-per-day", type=float,
+                        help="mean goods requests per day (a quarter as many purchase requests)")
+    parser.add_argument("--hot-skew", type=float, default=1.1, help="Zipf exponent of SKU popularity")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args(argv)
+    for key, value in PRESETS[args.preset].items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
+    return args
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.database_url:
+        # Before importing app: settings and the engine are created at import time
+        os.environ["DATABASE_URL"] = args.database_url
+
+    import seed_data
+    from app.database import engine
+
+    seed_data.seed_database()
+
+    lines = args.years * 365 * args.inbounds_per_day * args.lines_per_inbound
+    print(
+        f"\nGenerating ~{lines:,.0f} inbound lines ({2 * lines:,.0f} stock_info + goods_belong rows), "
+        f"{args.skus:,} SKUs, {args.warehouses} warehouses, {args.years:g} years"
+    )
+    started = time.perf_counter()
+    generator = Generator(engine, args)
+    generator.load_reference_data()
+    generator.run(args.end_date - timedelta(days=round(args.years * 365) - 1), args.end_date)
+    finish(engine)
+
+    elapsed = time.perf_counter() - started
+    print(f"\nDone in {elapsed:.1f}s")
+    for table, count in generator.writer.counts.items():
+        print(f"  {table:<24}{count:>12,}")
+
+
+if __name__ == "__main__":
+    main()
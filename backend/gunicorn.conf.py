@@ -0,0 +1,59 @@
+"""Gunicorn configuration for multi-worker deployments.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Every worker is a uvicorn event loop with its own in-process caches, kept
+consistent by the invalidation bus (``INVALIDATION_BUS``, see
+``app.core.invalidation``). Settings come from the environment:
+
+- ``WEB_CONCURRENCY``: number of workers (default: one per CPU, at most 8)
+- ``PORT``: listen port (default 8000)
+- ``GUNICORN_TIMEOUT``: seconds before a silent worker is restarted
+
+Run migrations once before starting (``alembic upgrade head`` with
+``DATABASE_AUTO_CREATE=false``) rather than letting every worker create
+tables at the same time.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count(), 8)))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Not preloaded: each worker imports the app itself, so per-process state
+# (caches, bus identity, engine pools) is never shared through fork
+preload_app = False
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+# Without an explicit directory, give the Prometheus client a fresh one so
+# /metrics adds up all workers (see app.core.metrics)
+_metrics_dir = None
+
+
+def on_starting(server):
+    global _metrics_dir
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        _metrics_dir = tempfile.mkdtemp(prefix="inbound-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = _metrics_dir
+
+
+def child_exit(server, worker):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if _metrics_dir is not None:
+        shutil.rmtree(_metrics_dir, ignore_errors=True)
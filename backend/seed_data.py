@@ -5,7 +5,7 @@ from decimal import Decimal
 import random
 
 from app.database import SessionLocal, engine, Base
-from app.models.user import User, Role, UserRole
+from app.models.user import User, Role, UserRole, Menu, RoleMenu
 from app.models.warehouse import Storehouse, ConsumableType, Unit
 from app.models.stock import StockInfo, StockPut, GoodsBelong
 from app.models.request import PurchaseRequest, PurchaseRequestItem, GoodsRequest, GoodsRequestItem
@@ -65,6 +65,59 @@ def seed_database():
             db.commit()
             print("Users created: admin, zhangsan, lisi, wangwu (password: admin123/123456)")
 
+        # ========== 1b. Menus and Permissions ==========
+        existing_menu = db.query(Menu).first()
+        if not existing_menu:
+            # (name, path, icon, resource); each menu gets "<resource>:view" and
+            # a "<resource>:write" button
+            menu_specs = [
+                ("系统主页", "/dashboard", "HomeOutlined", "dashboard"),
+                ("库房信息", "/warehouses", "DatabaseOutlined", "warehouse"),
+                ("入库管理", "/inbound", "AppstoreOutlined", "inbound"),
+                ("库房物品", "/stock", "DatabaseOutlined", "stock"),
+                ("物品类型", "/consumable-types", "AppstoreOutlined", "type"),
+                ("计量单位", "/units", "AppstoreOutlined", "unit"),
+                ("采购申请", "/purchase-requests", "ShoppingCartOutlined", "purchase"),
+                ("物品审批", "/goods-requests", "ShoppingCartOutlined", "goods"),
+                ("公告管理", "/bulletins", "NotificationOutlined", "bulletin"),
+                ("用户管理", "/users", "UserOutlined", "user"),
+            ]
+            view_menus = {}
+            write_menus = {}
+            for order, (name, path, icon, resource) in enumerate(menu_specs, start=1):
+                menu = Menu(parent_id=0, menu_name=name, path=path, icon=icon,
+                            perms=f"{resource}:view", type="0", order_num=order)
+                db.add(menu)
+                db.flush()
+                button = Menu(parent_id=menu.menu_id, menu_name=f"{name}编辑",
+                              perms=f"{resource}:write", type="1", order_num=1)
+                db.add(button)
+                db.flush()
+                view_menus[resource] = menu.menu_id
+                write_menus[resource] = button.menu_id
+
+            # ADMIN is a superuser role (RBAC_SUPERUSER_ROLES) and needs no rows
+            role_grants = {
+                "MANAGER": (
+                    list(view_menus),
+                    [r for r in write_menus if r != "user"],
+                ),
+                "OPERATOR": (
+                    [r for r in view_menus if r != "user"],
+                    ["inbound", "stock", "purchase", "goods"],
+                ),
+            }
+            for role_name, (views, writes) in role_grants.items():
+                role = db.query(Role).filter(Role.role_name == role_name).first()
+                if not role:
+                    continue
+                for resource in views:
+                    db.add(RoleMenu(role_id=role.role_id, menu_id=view_menus[resource]))
+                for resource in writes:
+                    db.add(RoleMenu(role_id=role.role_id, menu_id=write_menus[resource]))
+            db.commit()
+            print(f"{len(menu_specs)} menus created with role permissions")
+
         # ========== 2. Warehouses ==========
         existing_warehouse = db.query(Storehouse).first()
         if not existing_warehouse:
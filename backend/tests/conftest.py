@@ -0,0 +1,44 @@
+"""Shared fixtures: the app on a throwaway SQLite database seeded with ``seed_data.py``.
+
+The environment is set before anything from ``app`` is imported, because
+settings and the engine are created at import time.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = Path(tempfile.mkdtemp(prefix="inbound-test-"))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{DATA_DIR / 'test.db'}"
+os.environ["INVALIDATION_BUS"] = "none"
+os.environ["TRACE_SAMPLE_RATE"] = "0"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture(scope="session")
+def client():
+    import seed_data
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    seed_data.seed_database()
+    with TestClient(app) as client:
+        yield client
+
+
+def login(client, username: str, password: str) -> dict:
+    """Log in through the API and return the login payload."""
+    response = client.post("/api/v1/auth/login", data={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def auth_headers(data: dict) -> dict:
+    return {"Authorization": f"Bearer {data['token']}"}
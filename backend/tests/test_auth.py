@@ -0,0 +1,101 @@
+"""Refresh token rotation and access token revocation tests."""
+
+from app.core.revocation import token_registry
+from tests.conftest import auth_headers, login
+
+
+def _login(client, device_id: str) -> dict:
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "zhangsan", "password": "123456", "device_id": device_id},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def _refresh(client, token: str):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+
+
+def test_refresh_rotates_and_detects_reuse(client):
+    first = _login(client, "rotation-device")["refresh_token"]
+    response = _refresh(client, first)
+    assert response.status_code == 200, response.text
+    second = response.json()["data"]["refresh_token"]
+
+    # Replaying the rotated token revokes the whole device
+    assert _refresh(client, first).status_code == 401
+    assert _refresh(client, second).status_code == 401
+
+
+def test_login_replaces_device_tokens(client):
+    old = _login(client, "relogin-device")["refresh_token"]
+    new = _login(client, "relogin-device")["refresh_token"]
+
+    assert _refresh(client, old).status_code == 401
+    assert _refresh(client, new).status_code == 200
+
+
+def test_concurrent_rotation_has_one_winner(client):
+    from app.database import SessionLocal
+    from app.services.token_service import TokenService
+
+    token = login(client, "lisi", "123456")["refresh_token"]
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        # Both requests validated the token before either rotated it
+        row_a = TokenService.get_valid_refresh_token(first, token)
+        row_b = TokenService.get_valid_refresh_token(second, token)
+        first.rollback()
+        second.rollback()
+
+        assert TokenService.rotate_refresh_token(first, row_a) is not None
+        assert TokenService.rotate_refresh_token(second, row_b) is None
+        # The loser counts as reuse: the winner's new token is revoked too
+        devices = TokenService.get_active_devices(first, row_a.user_id)
+        assert all(device.device_id != row_a.device_id for device in devices)
+    finally:
+        first.close()
+        second.close()
+
+
+def _restart():
+    """Forget the in-memory revocation state, like a new worker process."""
+    token_registry.clear()
+    token_registry.resync()
+
+
+def test_logout_survives_restart(client):
+    headers = auth_headers(login(client, "zhangsan", "123456"))
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+
+    _restart()
+    assert client.get("/api/v1/auth/sessions", headers=headers).status_code == 401
+
+
+def test_lock_out_survives_restart(client):
+    admin = auth_headers(login(client, "admin", "admin123"))
+    data = login(client, "lisi", "123456")
+    url = f"/api/v1/users/{data['user']['user_id']}"
+    try:
+        assert client.put(url, json={"status": "0"}, headers=admin).status_code == 200
+
+        _restart()
+        response = client.get("/api/v1/auth/sessions", headers=auth_headers(data))
+        assert response.status_code == 401
+    finally:
+        client.put(url, json={"status": "1"}, headers=admin)
+
+
+def test_deleted_user_token_rejected_after_restart(client):
+    admin = auth_headers(login(client, "admin", "admin123"))
+    response = client.post(
+        "/api/v1/users", json={"username": "sunqi", "password": "secret1"}, headers=admin
+    )
+    assert response.status_code == 200, response.text
+    headers = auth_headers(login(client, "sunqi", "secret1"))
+    user_id = response.json()["data"]["user_id"]
+    assert client.delete(f"/api/v1/users/{user_id}", headers=admin).status_code == 200
+
+    _restart()
+    assert client.get("/api/v1/auth/sessions", headers=headers).status_code == 401
@@ -0,0 +1,57 @@
+"""Response compression tests."""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, negotiate
+
+BOTH = ("br", "gzip")
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        ("gzip, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("*;q=0.3", "br"),
+        ("*, br;q=0", "gzip"),
+        ("identity", None),
+        ("gzip;q=abc, br;q=0.1", "br"),
+    ],
+)
+def test_negotiate_honors_q_values(accept, expected):
+    assert negotiate(accept, BOTH) == expected
+
+
+def _app(body: bytes) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/data")
+    def data():
+        return Response(body, media_type="application/json", headers={"etag": '"abc"'})
+
+    return TestClient(CompressionMiddleware(app, minimum_size=1024))
+
+
+def test_compressed_response_has_weak_etag():
+    body = b'{"rows": [' + b'{"name": "item"},' * 200 + b"{}]}"
+    response = _app(body).get("/data", headers={"accept-encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert "accept-encoding" in response.headers["vary"].lower()
+    # httpx decodes the body; the length is of the compressed bytes
+    assert response.content == body
+    assert int(response.headers["content-length"]) == len(gzip.compress(body, mtime=0, compresslevel=6))
+
+
+def test_small_response_is_not_compressed():
+    response = _app(b'{"ok": true}').get("/data", headers={"accept-encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"abc"'
@@ -0,0 +1,60 @@
+"""Deletes with foreign key enforcement on (SQLITE_FOREIGN_KEYS)."""
+
+from tests.conftest import auth_headers, login
+
+
+def _admin(client) -> dict:
+    return auth_headers(login(client, "admin", "admin123"))
+
+
+def _create_warehouse(client, headers, name: str) -> int:
+    response = client.post("/api/v1/warehouses", json={"name": name}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["data"]["id"]
+
+
+def _create_inbound(client, headers, warehouse_id: int) -> int:
+    response = client.post(
+        "/api/v1/inbound",
+        json={
+            "stock_id": warehouse_id,
+            "custodian": "admin",
+            "put_user": "admin",
+            "items": [{"name": "测试物品", "type_id": 1, "amount": 5, "unit": "个", "price": "2.50"}],
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["data"]["id"]
+
+
+def test_delete_inbound(client):
+    headers = _admin(client)
+    warehouse_id = _create_warehouse(client, headers, "删除测试仓库")
+    inbound_id = _create_inbound(client, headers, warehouse_id)
+
+    response = client.delete(f"/api/v1/inbound/{inbound_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    assert client.get(f"/api/v1/inbound/{inbound_id}", headers=headers).status_code == 404
+
+
+def test_delete_seeded_inbound(client):
+    response = client.delete("/api/v1/inbound/1", headers=_admin(client))
+    assert response.status_code == 200, response.text
+
+
+def test_delete_referenced_warehouse_conflicts(client):
+    headers = _admin(client)
+    warehouse_id = _create_warehouse(client, headers, "占用测试仓库")
+    _create_inbound(client, headers, warehouse_id)
+
+    response = client.delete(f"/api/v1/warehouses/{warehouse_id}", headers=headers)
+    assert response.status_code == 409
+    assert "detail" in response.json()
+
+
+def test_delete_unreferenced_warehouse(client):
+    headers = _admin(client)
+    warehouse_id = _create_warehouse(client, headers, "空闲测试仓库")
+    response = client.delete(f"/api/v1/warehouses/{warehouse_id}", headers=headers)
+    assert response.status_code == 200, response.text
@@ -0,0 +1,55 @@
+"""Invalidation bus tests."""
+
+import os
+import queue
+import subprocess
+import sys
+
+from app.config import settings
+from app.core.invalidation import InvalidationBus
+from tests.conftest import BACKEND_DIR
+
+# Another worker: answers every ping with a pong, then exits
+PEER = """
+import threading
+from app.core.invalidation import InvalidationBus
+
+bus = InvalidationBus()
+answered = threading.Event()
+
+def ping(data):
+    bus.publish("pong", n=data["n"] + 1)
+    answered.set()
+
+bus.subscribe("ping", ping)
+bus.start("local")
+print("ready", flush=True)
+answered.wait(10)
+bus.stop()
+"""
+
+
+def test_local_transport_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "INVALIDATION_BUS_DIR", str(tmp_path))
+    received = queue.Queue()
+    bus = InvalidationBus()
+    bus.subscribe("pong", received.put)
+    bus.subscribe("ping", received.put)
+    assert bus.start("local") == "local"
+
+    env = {**os.environ, "INVALIDATION_BUS_DIR": str(tmp_path)}
+    peer = subprocess.Popen(
+        [sys.executable, "-c", PEER], cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, text=True
+    )
+    try:
+        assert peer.stdout.readline().strip() == "ready"
+        bus.publish("ping", n=1)
+        # Only the peer's answer arrives: a process ignores its own messages
+        assert received.get(timeout=10) == {"n": 2}
+        assert peer.wait(timeout=10) == 0
+        assert received.empty()
+    finally:
+        peer.kill()
+        peer.stdout.close()
+        bus.stop()
+    assert list(tmp_path.glob("*.sock")) == []
@@ -0,0 +1,62 @@
+"""Event-loop monitor tests."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.loop_monitor import LoopMonitor, LoopMonitorMiddleware
+
+
+# Cold: the handler blocks before the sampler's first sleep
+@pytest.mark.parametrize("warm_up", [0, 0.02], ids=["cold", "warm"])
+def test_blocking_handler_is_attributed_to_its_route(warm_up):
+    monitor = LoopMonitor(interval_ms=5, threshold_ms=50)
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def blocking(item_id: int):
+        time.sleep(0.3)  # synchronous work on the event loop
+        return {}
+
+    async def run():
+        monitor.start(detect_blocking=True)
+        if warm_up:
+            await asyncio.sleep(warm_up)
+        transport = httpx.ASGITransport(app=LoopMonitorMiddleware(app, monitor))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            assert (await http.get("/items/1")).status_code == 200
+        # Let the sampler wake up and record the stall
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    asyncio.run(run())
+
+    [event] = monitor.events()
+    assert event["route"] == "GET /items/{item_id}"
+    assert event["blocked_ms"] >= 200
+    assert any("time.sleep(0.3)" in line for line in event["stack"])
+    stats = monitor.stats()
+    assert stats["routes"]["GET /items/{item_id}"]["count"] == 1
+    if warm_up:
+        # The sampler was asleep during the stall: it wakes up late
+        assert stats["stalls"] >= 1
+        assert stats["max_lag_ms"] >= 200
+
+
+def test_lag_is_sampled_without_the_detector():
+    monitor = LoopMonitor(interval_ms=5, threshold_ms=50)
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+    asyncio.run(run())
+
+    stats = monitor.stats()
+    assert stats["samples"] > 0
+    assert stats["detector"] is False
+    assert monitor.events() == []
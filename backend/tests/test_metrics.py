@@ -0,0 +1,51 @@
+"""Prometheus /metrics tests."""
+
+from prometheus_client.parser import text_string_to_metric_families
+
+from tests.conftest import auth_headers, login
+
+
+def _samples(client) -> dict:
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(response.text)
+        for sample in family.samples
+    }
+
+
+def _count(samples: dict, route: str, status: str) -> float:
+    labels = (("method", "GET"), ("route", route), ("status", status))
+    return samples.get(("http_request_duration_seconds_count", labels), 0)
+
+
+def test_request_latency_is_labelled_by_route_template(client):
+    headers = auth_headers(login(client, "admin", "admin123"))
+    before = _samples(client)
+    client.get("/api/v1/units/1", headers=headers)
+    client.get("/api/v1/units/2", headers=headers)
+    client.get("/wp-login.php")
+    after = _samples(client)
+
+    route = "/api/v1/units/{unit_id}"
+    assert _count(after, route, "200") - _count(before, route, "200") == 2
+    routes = {
+        dict(labels).get("route")
+        for name, labels in after
+        if name.startswith("http_request_duration_seconds")
+    }
+    # Unmatched paths share one label; /metrics itself is not recorded
+    assert "<unmatched>" in routes
+    assert "/metrics" not in routes
+
+
+def test_cache_lookups_are_counted(client):
+    headers = auth_headers(login(client, "admin", "admin123"))
+    client.get("/api/v1/units/list", headers=headers)
+    client.get("/api/v1/units/list", headers=headers)
+    samples = _samples(client)
+
+    hits = samples[("cache_requests_total", (("cache", "reference_units"), ("result", "hit")))]
+    assert hits >= 1
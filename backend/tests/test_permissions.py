@@ -0,0 +1,43 @@
+"""Permission engine tests."""
+
+from app.core.permissions import PermissionEngine, _mask
+
+
+def test_reload_discards_masks_of_the_old_snapshot(client):
+    from app.database import SessionLocal
+
+    engine = PermissionEngine()
+    with SessionLocal() as db:
+        engine.reload(db, broadcast=False)
+        old = engine._snapshot
+        engine.mask_for(["user"])
+
+        engine.reload(db, broadcast=False)
+        # A lookup that started on the old snapshot finishes after the reload
+        old.mask_cache.clear()
+        _mask(old, ["user"])
+
+    assert engine._snapshot is not old
+    assert engine._snapshot.mask_cache == {}
+    assert engine._snapshot.tree_cache == {}
+
+
+def test_overlapping_reloads_keep_the_later_snapshot(client):
+    from app.database import SessionLocal
+
+    engine = PermissionEngine()
+    with SessionLocal() as db:
+        # The first reload read its data before the second, but finishes last
+        first = engine._next_version()
+        second = engine._next_version()
+        assert engine._compile(db, second) == second
+        assert engine._compile(db, first) == second
+
+    assert engine.version == second
+
+
+def test_reload_requested_by_another_process_is_not_older(client):
+    engine = PermissionEngine()
+    remote = engine._next_version() + 60_000
+
+    assert engine.reload_from_primary(remote) >= remote
@@ -0,0 +1,106 @@
+"""Request and continuous profiler tests."""
+
+import os
+import sys
+import threading
+from collections import Counter
+
+from app.api.v1 import system
+from app.core.profiling import ContinuousProfiler, parse_collapsed, to_collapsed
+from tests.conftest import auth_headers, login
+
+PROFILE = {"X-Profile": "1"}
+# Long enough that every sample of a test falls into the same window
+WINDOW_SECONDS = 10**9
+
+
+def test_monitor_gets_a_downloadable_profile(client):
+    headers = auth_headers(login(client, "admin", "admin123"))
+    response = client.get("/api/v1/goods-requests", headers={**headers, **PROFILE})
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+
+    summaries = client.get("/api/v1/system/profiles", headers=headers).json()["data"]
+    [summary] = [p for p in summaries if p["id"] == profile_id]
+    assert summary["route"] == "GET /api/v1/goods-requests"
+    assert summary["status"] == 200
+
+    speedscope = client.get(f"/api/v1/system/profiles/{profile_id}", headers=headers).json()
+    assert speedscope["profiles"][0]["type"] == "sampled"
+    collapsed = client.get(
+        f"/api/v1/system/profiles/{profile_id}", params={"format": "collapsed"}, headers=headers
+    )
+    assert collapsed.status_code == 200
+    assert sum(parse_collapsed(collapsed.text).values()) == summary["samples"]
+
+
+def test_profile_header_is_ignored_for_other_users(client):
+    headers = auth_headers(login(client, "lisi", "123456"))
+    response = client.get("/api/v1/goods-requests", headers={**headers, **PROFILE})
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+
+def test_collapsed_stacks_round_trip():
+    stacks = Counter({("main (a.py:1)", "handler (b.py:2)"): 3, ("main (a.py:1)",): 1})
+    assert parse_collapsed(to_collapsed(stacks)) == stacks
+
+    # Labels cannot contain the frame separator
+    odd = Counter({("f;g (c.py:3)",): 2})
+    assert parse_collapsed(to_collapsed(odd)) == Counter({("f:g (c.py:3)",): 2})
+
+
+def _busy_frame():
+    return sys._getframe()
+
+
+def test_continuous_windows_merge_other_workers(tmp_path):
+    profiler = ContinuousProfiler(hz=100, windows=5, directory=str(tmp_path), window_seconds=WINDOW_SECONDS)
+    for _ in range(3):
+        profiler.sample({threading.get_ident(): _busy_frame()})
+
+    [window] = profiler.windows()
+    start = window["start"]
+    assert window["workers"] == [str(os.getpid())]
+    assert window["samples"] == 3
+    assert not window["complete"]
+
+    # Another worker's finished window of the same minute, as written to the shared directory
+    other = Counter({("thread:MainThread", "handler (other.py:1)"): 4})
+    (tmp_path / f"{start}-99999.collapsed").write_text(to_collapsed(other), encoding="utf-8")
+
+    [window] = profiler.windows()
+    assert window["workers"] == sorted([str(os.getpid()), "99999"])
+    assert window["samples"] == 7
+    merged = profiler.window(start)
+    assert merged[("thread:MainThread", "handler (other.py:1)")] == 4
+    assert any(stack[-1].startswith("_busy_frame ") for stack in merged)
+    assert profiler.window(start - WINDOW_SECONDS) is None
+
+    # Stopping finishes the window and writes this worker's file
+    profiler.start()
+    profiler.stop()
+    assert (tmp_path / f"{start}-{os.getpid()}.collapsed").is_file()
+    assert profiler.windows()[0]["complete"]
+
+
+def test_continuous_profile_download(client, monkeypatch, tmp_path):
+    profiler = ContinuousProfiler(hz=100, windows=5, directory=str(tmp_path), window_seconds=WINDOW_SECONDS)
+    profiler.sample({threading.get_ident(): _busy_frame()})
+    monkeypatch.setattr(system, "continuous_profiler", profiler)
+
+    headers = auth_headers(login(client, "admin", "admin123"))
+    data = client.get("/api/v1/system/continuous-profile", headers=headers).json()["data"]
+    assert data["hz"] == 100
+    start = data["windows"][0]["start"]
+
+    collapsed = client.get(
+        f"/api/v1/system/continuous-profile/{start}", params={"format": "collapsed"}, headers=headers
+    )
+    assert parse_collapsed(collapsed.text) == profiler.window(start)
+    missing = client.get(f"/api/v1/system/continuous-profile/{start + 1}", headers=headers)
+    assert missing.status_code == 404
+
+    lisi = auth_headers(login(client, "lisi", "123456"))
+    assert client.get("/api/v1/system/continuous-profile", headers=lisi).status_code == 403
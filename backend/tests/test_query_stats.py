@@ -0,0 +1,75 @@
+"""Query stats middleware tests."""
+
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.config import settings
+from app.core.query_stats import (
+    UNMATCHED,
+    QueryStatsMiddleware,
+    QueryStatsRegistry,
+    assert_max_queries,
+    query_stats_registry,
+)
+from app.core.reference_cache import USERS, reference_names
+from app.database import SessionLocal
+from app.services.request_service import RequestService
+from tests.conftest import auth_headers, login
+
+
+def test_unmatched_paths_share_one_entry(client):
+    query_stats_registry.reset()
+    for n in range(5):
+        client.get(f"/no-such-page-{n}")
+
+    routes = [row["route"] for row in query_stats_registry.routes()]
+    assert routes == [UNMATCHED]
+
+
+def test_server_timing_counts_queries(client):
+    headers = auth_headers(login(client, "admin", "admin123"))
+    response = client.get("/api/v1/goods-requests", headers=headers)
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    count = int(re.search(r'desc="(\d+) queries"', timing).group(1))
+    assert count >= 2
+    assert "app;dur=" in timing
+
+
+def test_repeated_statement_is_reported_as_n_plus_one(client):
+    registry = QueryStatsRegistry()
+    app = FastAPI()
+
+    @app.get("/loop")
+    def loop():
+        with SessionLocal() as db:
+            for user_id in range(1, settings.QUERY_N_PLUS_ONE_THRESHOLD + 1):
+                db.execute(text("SELECT username FROM users WHERE user_id = :id"), {"id": user_id})
+        return {}
+
+    with TestClient(QueryStatsMiddleware(app, registry)) as loop_client:
+        loop_client.get("/loop")
+
+    [finding] = registry.findings()
+    assert finding["route"] == "GET /loop"
+    assert finding["statement"] == "SELECT username FROM users WHERE user_id = ?"
+    assert finding["max_repeats"] == settings.QUERY_N_PLUS_ONE_THRESHOLD
+    assert registry.routes()[0]["n_plus_one_requests"] == 1
+
+
+def test_assert_max_queries(client):
+    with SessionLocal() as db:
+        # Build the username dictionary first: the list itself takes two queries
+        reference_names.names(db, USERS)
+        with assert_max_queries(2):
+            RequestService.get_goods_requests(db)
+
+        with pytest.raises(AssertionError, match="3 queries, expected at most 2"):
+            with assert_max_queries(2):
+                for _ in range(3):
+                    db.execute(text("SELECT 1"))
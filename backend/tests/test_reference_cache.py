@@ -0,0 +1,53 @@
+import asyncio
+import threading
+import time
+
+import httpx
+from sqlalchemy import event, func
+
+from app.config import settings
+from app.core import reference_cache as reference_module
+from app.core.reference_cache import USERS, reference_cache
+from app.database import get_async_engine
+from app.models.user import User
+from tests.conftest import auth_headers, login
+
+
+def _slow(value):
+    time.sleep(0.05)
+    return value
+
+
+def test_names_rebuild_with_concurrent_async_requests(client, monkeypatch):
+    headers = auth_headers(login(client, "admin", "admin123"))
+    monkeypatch.setattr(settings, "DATABASE_ASYNC", True)
+    # Keep the users query in flight long enough for the other requests to need the names
+    monkeypatch.setitem(reference_module._NAME_COLUMNS, USERS, (User.user_id, func.slow(User.username)))
+    async_engine = get_async_engine()
+
+    def register_slow(dbapi_connection, connection_record):
+        dbapi_connection.create_function("slow", 1, _slow)
+
+    from app.main import app
+
+    async def fetch_all():
+        await async_engine.dispose()
+        event.listen(async_engine.sync_engine, "connect", register_slow)
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                reference_cache.invalidate(USERS)
+                requests = [http.get("/api/v1/goods-requests", headers=headers) for _ in range(8)]
+                return await asyncio.gather(*requests)
+        finally:
+            event.remove(async_engine.sync_engine, "connect", register_slow)
+            # Pooled connections belong to this event loop
+            await async_engine.dispose()
+
+    results = []
+    # A deadlock blocks the event loop itself, so wait for it from outside
+    worker = threading.Thread(target=lambda: results.append(asyncio.run(fetch_all())), daemon=True)
+    worker.start()
+    worker.join(timeout=20)
+    assert not worker.is_alive(), "requests deadlocked"
+    assert [r.status_code for r in results[0]] == [200] * 8
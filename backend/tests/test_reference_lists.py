@@ -0,0 +1,55 @@
+"""Cached reference list tests (ETag revalidation and since_version deltas)."""
+
+from tests.conftest import auth_headers, login
+
+URL = "/api/v1/units/list"
+
+
+def test_unchanged_list_revalidates_with_304(client):
+    headers = auth_headers(login(client, "admin", "admin123"))
+    first = client.get(URL, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = client.get(URL, headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    # The weak form sent back by clients that got a compressed response matches too
+    weak = client.get(URL, headers={**headers, "If-None-Match": f"W/{etag}"})
+    assert weak.status_code == 304
+
+
+def test_write_changes_etag_and_delta(client):
+    headers = auth_headers(login(client, "admin", "admin123"))
+    before = client.get(URL, headers=headers)
+    version = int(before.headers["x-data-version"])
+
+    created = client.post("/api/v1/units", json={"name": "测试单位"}, headers=headers)
+    assert created.status_code == 200, created.text
+    unit_id = created.json()["data"]["id"]
+
+    after = client.get(URL, headers={**headers, "If-None-Match": before.headers["etag"]})
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+
+    delta = client.get(URL, params={"since_version": version}, headers=headers).json()["data"]
+    assert delta["full"] is False
+    assert [row["id"] for row in delta["upserts"]] == [unit_id]
+    assert delta["deletes"] == []
+
+    assert client.delete(f"/api/v1/units/{unit_id}", headers=headers).status_code == 200
+    delta = client.get(
+        URL, params={"since_version": delta["version"]}, headers=headers
+    ).json()["data"]
+    assert delta["full"] is False
+    assert delta["upserts"] == []
+    assert delta["deletes"] == [unit_id]
+
+
+def test_version_older_than_the_change_log_gets_the_full_list(client):
+    headers = auth_headers(login(client, "admin", "admin123"))
+    full = client.get(URL, headers=headers).json()["data"]
+
+    delta = client.get(URL, params={"since_version": 0}, headers=headers).json()["data"]
+    assert delta["full"] is True
+    assert delta["upserts"] == full
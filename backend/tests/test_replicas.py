@@ -0,0 +1,93 @@
+"""Read replica routing tests, with a copy of the test database as the replica."""
+
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import text, update
+
+from app import database
+from app.config import settings
+from app.database import ReplicaRouter, SessionLocal, current_user_id
+from app.models.user import User
+
+EMAIL = text("SELECT email FROM users WHERE user_id = 1")
+
+
+def _router(monkeypatch, url: str) -> ReplicaRouter:
+    router = ReplicaRouter([url], sticky_seconds=60, check_interval=60)
+    monkeypatch.setattr(database, "replica_router", router)
+    return router
+
+
+@pytest.fixture
+def replica(client, tmp_path, monkeypatch):
+    """A replica that differs from the primary in one value."""
+    path = tmp_path / "replica.db"
+    primary = sqlite3.connect(settings.DATABASE_URL.removeprefix("sqlite:///"))
+    copy = sqlite3.connect(path)
+    primary.backup(copy)
+    copy.execute("UPDATE users SET email = 'replica' WHERE user_id = 1")
+    copy.commit()
+    copy.close()
+    primary.close()
+    router = _router(monkeypatch, f"sqlite:///{path}")
+    yield router
+    router.stop()
+
+
+def _read(session_info: dict):
+    with SessionLocal(info=session_info) as db:
+        return db.execute(EMAIL).scalar()
+
+
+def test_read_only_sessions_use_the_replica(replica):
+    assert _read({"read_only": True}) == "replica"
+    assert _read({}) != "replica"
+    assert replica.stats()["replicas"][0]["reads"] == 1
+
+
+def test_writer_reads_the_primary_after_commit(replica):
+    token = current_user_id.set(2)
+    try:
+        with SessionLocal() as db:
+            db.execute(update(User).where(User.user_id == 2).values(mobile=User.mobile))
+            db.commit()
+        assert _read({"read_only": True}) != "replica"
+    finally:
+        current_user_id.reset(token)
+
+    # Other users still read from the replica
+    assert _read({"read_only": True}) == "replica"
+
+
+def test_unhealthy_replica_falls_back_to_the_primary(client, tmp_path, monkeypatch):
+    router = _router(monkeypatch, f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+
+    assert router.check_health() == [False]
+    assert _read({"read_only": True}) != "replica"
+    assert router.stats()["primary_reads"] == 1
+
+
+def test_async_replica_errors_mark_it_unhealthy(client, tmp_path, monkeypatch):
+    router = _router(monkeypatch, f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+
+    async def read():
+        info = {"read_only": True, "async": True}
+        async with database.get_async_sessionmaker()(info=info) as session:
+            await session.execute(EMAIL)
+
+    with pytest.raises(Exception):
+        asyncio.run(read())
+    assert router.stats()["replicas"][0]["healthy"] is False
+
+
+def test_name_dictionaries_are_built_from_the_primary(replica):
+    from app.core.reference_cache import USERS, ReferenceNames, reference_cache
+
+    path = replica.urls[0].removeprefix("sqlite:///")
+    with sqlite3.connect(path) as copy:
+        copy.execute("UPDATE users SET username = 'lagging' WHERE user_id = 1")
+    names = ReferenceNames(reference_cache)
+    with SessionLocal(info={"read_only": True}) as db:
+        assert names.name(db, USERS, 1) == "admin"
@@ -0,0 +1,53 @@
+"""Slow-query log tests."""
+
+import time
+
+from sqlalchemy import text
+
+from app.core.slow_queries import SlowQueryLog, slow_query_log
+from app.database import SessionLocal, engine
+from app.services.warehouse_service import WarehouseService
+
+STATEMENT = "SELECT username FROM users WHERE user_id = ?"
+
+
+def _wait_for_plans(log: SlowQueryLog, timeout: float = 5) -> list:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        entries = log.entries()
+        if all(entry["explain"]["status"] != "pending" for entry in entries):
+            return entries
+        time.sleep(0.01)
+    raise AssertionError("EXPLAIN did not finish")
+
+
+def test_ring_buffer_keeps_the_newest_entries(client):
+    log = SlowQueryLog(threshold_ms=100, size=3)
+    with engine.connect() as conn:
+        for user_id in range(5):
+            log.record(conn, STATEMENT, (user_id,), False, 0.1 + user_id / 1000)
+    entries = _wait_for_plans(log)
+    log.shutdown()
+
+    assert [entry["duration_ms"] for entry in entries] == [104.0, 103.0, 102.0]
+    # Values are never kept, only their types
+    assert entries[0]["parameters"] == ["int"]
+    # One plan per fingerprint, shared by every entry
+    assert entries[0]["explain"]["status"] == "done"
+    assert entries[0]["explain"] is entries[2]["explain"]
+
+
+def test_slow_statements_are_attributed_to_the_service(client, monkeypatch):
+    monkeypatch.setattr(slow_query_log, "threshold", 1e-9)
+    monkeypatch.setattr(slow_query_log, "explain", False)
+    slow_query_log.clear()
+    try:
+        with SessionLocal() as db:
+            WarehouseService.get_unit_options(db)
+            db.execute(text("SELECT 1"))
+        callers = [entry["caller"] for entry in slow_query_log.entries()]
+    finally:
+        slow_query_log.clear()
+
+    # The innermost service frame issued the query
+    assert callers == [None, "warehouse_service:WarehouseService.get_all_units"]
@@ -0,0 +1,68 @@
+"""Frontend build serving tests."""
+
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.compression import IMMUTABLE
+from app.core.static_site import StaticSite
+
+SCRIPT = b"console.log('inbound');\n" * 100
+VARIANTS = {"br": b"brotli bytes", "gzip": gzip.compress(SCRIPT), None: SCRIPT}
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "index.html").write_bytes(b"<!doctype html><div id=root></div>")
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (assets / "index-AbCd1234.js").write_bytes(SCRIPT)
+    (assets / "index-AbCd1234.js.gz").write_bytes(VARIANTS["gzip"])
+    (assets / "index-AbCd1234.js.br").write_bytes(VARIANTS["br"])
+    return StaticSite(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "accept, encoding",
+    [("gzip, br", "br"), ("gzip", "gzip"), ("br;q=0, gzip", "gzip"), ("", None)],
+)
+def test_precompressed_variant_selection(site, accept, encoding):
+    with TestClient(site).stream(
+        "GET", "/assets/index-AbCd1234.js", headers={"accept-encoding": accept}
+    ) as response:
+        body = b"".join(response.iter_raw())
+
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert body == VARIANTS[encoding]
+
+
+def test_missing_asset_is_404_but_routes_get_index(site):
+    client = TestClient(site)
+
+    assert client.get("/assets/index-gone0000.js").status_code == 404
+    route = client.get("/stock/list")
+    assert route.status_code == 200
+    assert route.content.startswith(b"<!doctype html>")
+    assert route.headers["cache-control"] == "no-cache"
+
+
+def test_revalidation_with_etag(site):
+    client = TestClient(site)
+    etag = client.get("/").headers["etag"]
+
+    assert client.get("/", headers={"if-none-match": etag}).status_code == 304
+
+
+def test_large_files_are_streamed_from_disk(tmp_path):
+    (tmp_path / "index.html").write_bytes(b"<!doctype html>")
+    (tmp_path / "big.txt").write_bytes(b"x" * 4096)
+    site = StaticSite(tmp_path, memory_max_size=1024)
+
+    assert site.files["big.txt"].body is None
+    response = TestClient(site).get("/big.txt")
+    assert response.content == b"x" * 4096
+    assert response.headers["etag"] == site.files["big.txt"].etag
@@ -0,0 +1,41 @@
+"""Trace store tests."""
+
+import json
+import uuid
+
+from app.core.tracing import Trace, TraceStore, trace_store
+from tests.conftest import auth_headers, login
+
+
+def test_traces_are_mirrored_to_jsonl(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    store = TraceStore(size=2, jsonl_path=str(path))
+    for n in range(3):
+        trace = Trace(f"trace{n}", max_spans=10)
+        trace.start_span("GET /x", "route", None, {})
+        store.add(trace)
+    store.stop()
+
+    # The file keeps every trace; memory only the newest ``size``
+    ids = [json.loads(line)["trace_id"] for line in path.read_text().splitlines()]
+    assert ids == ["trace0", "trace1", "trace2"]
+    assert [t["trace_id"] for t in store.list()] == ["trace2", "trace1"]
+
+
+def _forced_trace(client, headers: dict):
+    trace_id = uuid.uuid4().hex
+    response = client.get(
+        "/api/v1/goods-requests",
+        headers={**headers, "X-Trace-Id": trace_id, "X-Trace-Sample": "1"},
+    )
+    assert response.status_code == 200
+    return trace_store.get(trace_id)
+
+
+def test_trace_sample_header_is_honored_for_monitors(client):
+    trace = _forced_trace(client, auth_headers(login(client, "admin", "admin123")))
+    assert trace is not None
+
+
+def test_trace_sample_header_is_ignored_for_other_users(client):
+    assert _forced_trace(client, auth_headers(login(client, "lisi", "123456"))) is None
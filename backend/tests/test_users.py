@@ -0,0 +1,39 @@
+"""User endpoint tests."""
+
+from tests.conftest import auth_headers, login
+
+
+def test_change_password(client):
+    data = login(client, "wangwu", "123456")
+    url = f"/api/v1/users/{data['user']['user_id']}/password"
+
+    response = client.put(
+        url, json={"old_password": "123456", "new_password": "654321"}, headers=auth_headers(data)
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["code"] == 0
+
+    login(client, "wangwu", "654321")
+    old = client.post("/api/v1/auth/login", data={"username": "wangwu", "password": "123456"})
+    assert old.status_code == 401
+
+
+def test_change_password_wrong_old_password(client):
+    data = login(client, "lisi", "123456")
+    response = client.put(
+        f"/api/v1/users/{data['user']['user_id']}/password",
+        json={"old_password": "wrong", "new_password": "654321"},
+        headers=auth_headers(data),
+    )
+    assert response.status_code == 400
+
+
+def test_create_user_can_log_in(client):
+    headers = auth_headers(login(client, "admin", "admin123"))
+    response = client.post(
+        "/api/v1/users", json={"username": "zhaoliu", "password": "secret1"}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+
+    data = login(client, "zhaoliu", "secret1")
+    assert data["user"]["user_id"] == response.json()["data"]["user_id"]
@@ -3,11 +3,14 @@ import { apiClient, ApiResponse } from './client'
 export interface LoginParams {
   username: string
   password: string
+  device_id?: string | null
 }
 
 export interface LoginData {
   token: string
   expire_time: string
+  refresh_token: string
+  device_id: string
   roles: string[]
   permissions: string[]
   user: {
@@ -20,6 +23,14 @@ export interface LoginData {
   }
 }
 
+export interface RefreshData {
+  token: string
+  expire_time: string
+  refresh_token: string
+  device_id: string
+  roles: string[]
+}
+
 export interface UserInfo {
   user_id: number
   username: string
@@ -37,6 +48,9 @@ export const authApi = {
     const formData = new URLSearchParams()
     formData.append('username', params.username)
     formData.append('password', params.password)
+    if (params.device_id) {
+      formData.append('device_id', params.device_id)
+    }
 
     const response = await apiClient.post<ApiResponse<LoginData>>('/auth/login', formData, {
       headers: {
@@ -46,6 +60,13 @@ export const authApi = {
     return response.data
   },
 
+  refresh: async (refreshToken: string): Promise<ApiResponse<RefreshData>> => {
+    const response = await apiClient.post<ApiResponse<RefreshData>>('/auth/refresh', {
+      refresh_token: refreshToken,
+    })
+    return response.data
+  },
+
   logout: async (): Promise<ApiResponse<null>> => {
     const response = await apiClient.post<ApiResponse<null>>('/auth/logout')
     return response.data
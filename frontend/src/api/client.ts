@@ -1,5 +1,6 @@
 import axios, { AxiosError, InternalAxiosRequestConfig } from 'axios'
 import { useAuthStore } from '@/store/authStore'
+import { desktopBridgeAdapter, isDesktopBridge } from './desktopBridge'
 
 const API_BASE_URL = '/api/v1'
 
@@ -11,6 +12,12 @@ export const apiClient = axios.create({
   },
 })
 
+// Desktop app: no HTTP server, requests go to the in-process app
+if (isDesktopBridge) {
+  axios.defaults.adapter = desktopBridgeAdapter
+  apiClient.defaults.adapter = desktopBridgeAdapter
+}
+
 // Request interceptor to add auth token
 apiClient.interceptors.request.use(
   (config: InternalAxiosRequestConfig) => {
@@ -25,15 +32,61 @@ apiClient.interceptors.request.use(
   }
 )
 
+// Single in-flight refresh shared by all requests that hit a 401
+let refreshPromise: Promise<string | null> | null = null
+
+const refreshAccessToken = (): Promise<string | null> => {
+  const { refreshToken, setTokens } = useAuthStore.getState()
+  if (!refreshToken) {
+    return Promise.resolve(null)
+  }
+  if (!refreshPromise) {
+    refreshPromise = axios
+      .post(`${API_BASE_URL}/auth/refresh`, { refresh_token: refreshToken })
+      .then((response) => {
+        const { token, refresh_token } = response.data.data
+        setTokens(token, refresh_token)
+        return token as string
+      })
+      .catch(() => null)
+      .finally(() => {
+        refreshPromise = null
+      })
+  }
+  return refreshPromise
+}
+
+type RetriableConfig = InternalAxiosRequestConfig & { _retried?: boolean }
+
 // Response interceptor to handle errors
 apiClient.interceptors.response.use(
   (response) => {
     return response
   },
-  (error: AxiosError<{ detail?: string; msg?: string }>) => {
+  async (error: AxiosError<{ detail?: string; msg?: string }>) => {
+    const config = error.config as RetriableConfig | undefined
+    if (
+      error.response?.status === 401 &&
+      config &&
+      !config._retried &&
+      !config.url?.startsWith('/auth/')
+    ) {
+      config._retried = true
+      const token = await refreshAccessToken()
+      if (token) {
+        config.headers.Authorization = `Bearer ${token}`
+        return apiClient(config)
+      }
+    }
     if (error.response?.status === 401) {
       useAuthStore.getState().logout()
-      window.location.href = '/login'
+      if (isDesktopBridge) {
+        // The desktop page is served as static files: route client-side
+        window.history.pushState(null, '', '/login')
+        window.dispatchEvent(new PopStateEvent('popstate'))
+      } else {
+        window.location.href = '/login'
+      }
     }
     const message = error.response?.data?.detail || error.response?.data?.msg || 'Request failed'
     return Promise.reject(new Error(message))
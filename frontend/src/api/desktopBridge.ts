@@ -0,0 +1,139 @@
+import { AxiosAdapter, AxiosError, AxiosHeaders, AxiosResponse } from 'axios'
+
+// The desktop app loads the page with ?transport=bridge when API calls should
+// go through pywebview's JS bridge straight to the in-process FastAPI app
+const BRIDGE_FLAG = 'desktop-transport'
+
+if (new URLSearchParams(window.location.search).get('transport') === 'bridge') {
+  sessionStorage.setItem(BRIDGE_FLAG, 'bridge')
+  // pywebview opens /index.html; start the router from its index route
+  window.history.replaceState(null, '', '/')
+}
+
+export const isDesktopBridge = sessionStorage.getItem(BRIDGE_FLAG) === 'bridge'
+
+interface BridgeRequest {
+  method: string
+  url: string
+  headers: Record<string, string>
+  body: string | null
+  base64: boolean
+}
+
+interface BridgeResponse {
+  status: number
+  headers: Record<string, string>
+  body: string
+  base64: boolean
+}
+
+interface DesktopApi {
+  asgi_request(request: BridgeRequest): Promise<BridgeResponse>
+}
+
+declare global {
+  interface Window {
+    pywebview?: { api: Partial<DesktopApi> }
+  }
+}
+
+let apiReady: Promise<DesktopApi> | null = null
+
+// window.pywebview.api is filled in after the page starts loading
+const desktopApi = (): Promise<DesktopApi> => {
+  if (!apiReady) {
+    apiReady = new Promise((resolve) => {
+      const resolveIfReady = () => {
+        const api = window.pywebview?.api
+        if (api?.asgi_request) {
+          resolve(api as DesktopApi)
+          return true
+        }
+        return false
+      }
+      if (!resolveIfReady()) {
+        window.addEventListener('pywebviewready', resolveIfReady, { once: true })
+      }
+    })
+  }
+  return apiReady
+}
+
+const toBase64 = (buffer: ArrayBuffer): string => {
+  const bytes = new Uint8Array(buffer)
+  let binary = ''
+  for (let i = 0; i < bytes.length; i += 0x8000) {
+    binary += String.fromCharCode(...bytes.subarray(i, i + 0x8000))
+  }
+  return btoa(binary)
+}
+
+const fromBase64 = (text: string): Uint8Array =>
+  Uint8Array.from(atob(text), (char) => char.charCodeAt(0))
+
+// Axios adapter sending requests through the bridge instead of XMLHttpRequest
+export const desktopBridgeAdapter: AxiosAdapter = async (config) => {
+  const api = await desktopApi()
+  const headers = AxiosHeaders.from(config.headers)
+  let body: string | null = null
+  let base64 = false
+
+  if (config.data instanceof FormData) {
+    // Let the browser build the multipart body and its boundary
+    const encoded = new Response(config.data)
+    headers.set('Content-Type', encoded.headers.get('Content-Type'))
+    body = toBase64(await encoded.arrayBuffer())
+    base64 = true
+  } else if (config.data != null) {
+    body = typeof config.data === 'string' ? config.data : JSON.stringify(config.data)
+  }
+
+  const url = new URL(
+    `${config.baseURL ?? ''}${config.url ?? ''}`.replace(/\/{2,}/g, '/'),
+    window.location.origin
+  )
+  const params = config.params as Record<string, unknown> | undefined
+  Object.entries(params ?? {}).forEach(([key, value]) => {
+    if (value !== undefined && value !== null) {
+      url.searchParams.append(key, String(value))
+    }
+  })
+
+  const result = await api.asgi_request({
+    method: (config.method ?? 'get').toUpperCase(),
+    url: `${url.pathname}${url.search}`,
+    headers: Object.fromEntries(
+      Object.entries(headers.toJSON()).map(([name, value]) => [name, String(value)])
+    ),
+    body,
+    base64,
+  })
+
+  let data: unknown = result.body
+  if (config.responseType === 'blob' || config.responseType === 'arraybuffer') {
+    const bytes = result.base64 ? fromBase64(result.body) : new TextEncoder().encode(result.body)
+    data =
+      config.responseType === 'blob'
+        ? new Blob([bytes], { type: result.headers['content-type'] })
+        : bytes.buffer
+  }
+
+  const response: AxiosResponse = {
+    data,
+    status: result.status,
+    statusText: '',
+    headers: AxiosHeaders.from(result.headers),
+    config,
+    request: null,
+  }
+  if (!config.validateStatus || config.validateStatus(result.status)) {
+    return response
+  }
+  throw new AxiosError(
+    `Request failed with status code ${result.status}`,
+    result.status >= 500 ? AxiosError.ERR_BAD_RESPONSE : AxiosError.ERR_BAD_REQUEST,
+    config,
+    null,
+    response
+  )
+}
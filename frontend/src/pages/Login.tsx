@@ -8,15 +8,15 @@ import { useAuthStore } from '@/store/authStore'
 export default function Login() {
   const [loading, setLoading] = useState(false)
   const navigate = useNavigate()
-  const { setAuth } = useAuthStore()
+  const { setAuth, deviceId } = useAuthStore()
 
   const handleLogin = async (values: LoginParams) => {
     setLoading(true)
     try {
-      const response = await authApi.login(values)
+      const response = await authApi.login({ ...values, device_id: deviceId })
       if (response.code === 0 && response.data) {
-        const { token, user, roles } = response.data
-        setAuth(token, user, roles)
+        const { token, user, roles, refresh_token, device_id } = response.data
+        setAuth(token, user, roles, refresh_token, device_id)
         message.success('登录成功')
         navigate('/dashboard')
       } else {
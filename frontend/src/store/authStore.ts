@@ -12,10 +12,19 @@ interface User {
 
 interface AuthState {
   token: string | null
+  refreshToken: string | null
+  deviceId: string | null
   user: User | null
   roles: string[]
   isAuthenticated: boolean
-  setAuth: (token: string, user: User, roles: string[]) => void
+  setAuth: (
+    token: string,
+    user: User,
+    roles: string[],
+    refreshToken?: string | null,
+    deviceId?: string | null
+  ) => void
+  setTokens: (token: string, refreshToken: string) => void
   logout: () => void
 }
 
@@ -23,21 +32,29 @@ export const useAuthStore = create<AuthState>()(
   persist(
     (set) => ({
       token: null,
+      refreshToken: null,
+      deviceId: null,
       user: null,
       roles: [],
       isAuthenticated: false,
 
-      setAuth: (token, user, roles) =>
-        set({
+      setAuth: (token, user, roles, refreshToken = null, deviceId = null) =>
+        set((state) => ({
           token,
+          refreshToken,
+          deviceId: deviceId ?? state.deviceId,
           user,
           roles,
           isAuthenticated: true,
-        }),
+        })),
+
+      setTokens: (token, refreshToken) => set({ token, refreshToken }),
 
+      // deviceId is kept so the next login reuses the same device session
       logout: () =>
         set({
           token: null,
+          refreshToken: null,
           user: null,
           roles: [],
           isAuthenticated: false,
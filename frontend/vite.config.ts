@@ -1,10 +1,50 @@
-import { defineConfig } from 'vite'
+import { defineConfig, Plugin } from 'vite'
 import react from '@vitejs/plugin-react'
+import fs from 'fs'
 import path from 'path'
+import zlib from 'zlib'
+
+const COMPRESSIBLE = /\.(js|mjs|css|html|svg|json|txt|map)$/
+const MIN_SIZE = 1024
+
+// Writes .br and .gz next to each compressible asset so the backend (and
+// nginx gzip_static) can send them as-is instead of compressing per request
+const precompressAssets = (): Plugin => {
+  let outDir = 'dist'
+  return {
+    name: 'precompress-assets',
+    apply: 'build',
+    configResolved(config) {
+      outDir = path.resolve(config.root, config.build.outDir)
+    },
+    closeBundle() {
+      const walk = (dir: string): string[] =>
+        fs.readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+          const full = path.join(dir, entry.name)
+          return entry.isDirectory() ? walk(full) : [full]
+        })
+      for (const file of walk(outDir)) {
+        if (!COMPRESSIBLE.test(file)) continue
+        const source = fs.readFileSync(file)
+        if (source.length < MIN_SIZE) continue
+        const brotli = zlib.brotliCompressSync(source, {
+          params: {
+            [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+            [zlib.constants.BROTLI_PARAM_SIZE_HINT]: source.length,
+          },
+        })
+        const gzip = zlib.gzipSync(source, { level: zlib.constants.Z_BEST_COMPRESSION })
+        // Skip variants that would not save anything
+        if (brotli.length < source.length) fs.writeFileSync(`${file}.br`, brotli)
+        if (gzip.length < source.length) fs.writeFileSync(`${file}.gz`, gzip)
+      }
+    },
+  }
+}
 
 // https://vitejs.dev/config/
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), precompressAssets()],
   resolve: {
     alias: {
       '@': path.resolve(__dirname, './src'),